@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Branch, UserProfile, Subject, Post, PostVote, Company, InterviewExperience, ExperienceVote
+from .models import (
+    Branch, UserProfile, Subject, Post, PostVote, Company, InterviewExperience, ExperienceVote, Task, CompanyStats,
+    Question, CompanyQuestion
+)
 
 # Custom admin configuration for Branch
 @admin.register(Branch)
@@ -50,9 +53,9 @@ class UserProfileAdmin(admin.ModelAdmin):
 class SubjectAdmin(admin.ModelAdmin):
     list_display = ('name', 'branch', 'is_common', 'posts_count', 'created_at')
     list_filter = ('branch', 'is_common', 'created_at')
-    search_fields = ('name', 'description', 'branch')
+    search_fields = ('name', 'description', 'branch__name')
     readonly_fields = ('created_at', 'posts_count')
-    ordering = ('branch', 'name')
+    ordering = ('branch__name', 'name')
     
     fieldsets = (
         ('Subject Information', {
@@ -78,10 +81,10 @@ class SubjectAdmin(admin.ModelAdmin):
 # Custom admin configuration for Post
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('topic', 'subject', 'posted_by', 'upvotes', 'downvotes', 'net_votes', 'created_at')
+    list_display = ('topic', 'subject', 'posted_by', 'upvotes', 'downvotes', 'net_votes', 'view_count', 'created_at')
     list_filter = ('subject__branch', 'subject', 'created_at')
     search_fields = ('topic', 'focus_points', 'posted_by__full_name')
-    readonly_fields = ('upvotes', 'downvotes', 'net_votes', 'created_at', 'updated_at')
+    readonly_fields = ('upvotes', 'downvotes', 'net_votes', 'view_count', 'created_at', 'updated_at')
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -92,7 +95,7 @@ class PostAdmin(admin.ModelAdmin):
             'fields': ('notes_link', 'video_link', 'focus_points')
         }),
         ('Engagement', {
-            'fields': ('upvotes', 'downvotes', 'net_votes'),
+            'fields': ('upvotes', 'downvotes', 'net_votes', 'view_count'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -130,10 +133,11 @@ class CompanyAdmin(admin.ModelAdmin):
 # Custom admin configuration for InterviewExperience
 @admin.register(InterviewExperience)
 class InterviewExperienceAdmin(admin.ModelAdmin):
-    list_display = ('company', 'position', 'result', 'difficulty_level', 'posted_by', 'upvotes', 'created_at')
+    list_display = ('company', 'position', 'result', 'difficulty_level', 'posted_by', 'upvotes', 'view_count',
+                    'created_at')
     list_filter = ('result', 'difficulty_level', 'company', 'created_at')
     search_fields = ('company__name', 'position', 'rounds', 'posted_by__full_name')
-    readonly_fields = ('upvotes', 'created_at', 'updated_at')
+    readonly_fields = ('upvotes', 'view_count', 'created_at', 'updated_at')
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -147,7 +151,7 @@ class InterviewExperienceAdmin(admin.ModelAdmin):
             'fields': ('tips',)
         }),
         ('Engagement', {
-            'fields': ('upvotes',),
+            'fields': ('upvotes', 'view_count'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -174,6 +178,38 @@ class ExperienceVoteAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
     ordering = ('-created_at',)
 
+# Custom admin configuration for Task
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'dedupe_key', 'updated_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'dedupe_key', 'last_error')
+    readonly_fields = ('created_at', 'updated_at')
+    ordering = ('-created_at',)
+
+# Read-only admin for the precomputed company statistics
+@admin.register(CompanyStats)
+class CompanyStatsAdmin(admin.ModelAdmin):
+    list_display = ('company', 'experience_count', 'selected_count', 'rejected_count', 'pending_count', 'updated_at')
+    search_fields = ('company__name',)
+    readonly_fields = ('company', 'experience_count', 'selected_count', 'rejected_count', 'pending_count',
+                       'difficulty_total', 'recent_positions', 'updated_at')
+    ordering = ('company__name',)
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = ('text', 'normalized_hash', 'created_at')
+    search_fields = ('text',)
+    readonly_fields = ('normalized_hash', 'created_at')
+    ordering = ('-created_at',)
+
+@admin.register(CompanyQuestion)
+class CompanyQuestionAdmin(admin.ModelAdmin):
+    list_display = ('question', 'company', 'times_asked', 'last_asked')
+    search_fields = ('question__text', 'company__name')
+    readonly_fields = ('company', 'question', 'times_asked', 'last_asked')
+    ordering = ('company__name', '-times_asked')
+
 # Inline admin for votes (optional - shows votes within posts/experiences)
 class PostVoteInline(admin.TabularInline):
     model = PostVote
@@ -0,0 +1,121 @@
+"""
+Async read endpoints for the hottest paths, served by the ASGI application.
+
+These keep many slow (remote database) requests in flight in a single
+process. They return the public summary representation; clients
+personalize with /api/votes/mine/.
+
+Like the sync list endpoints' ?public=1 reads they are served from the
+public list cache (api.cache) and counted by the API throttle
+(api.throttling) unless the cache already holds their payload. Both have
+blocking APIs, so each lookup, and the queries on a miss, run in one worker
+thread.
+"""
+
+import math
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, HttpResponseNotAllowed
+from rest_framework.exceptions import Throttled
+
+from .cache import (
+    has_public_payload, patch_public_headers, public_cache_timeout, public_payload, public_stale_timeout
+)
+from .identity import posted_by_filter
+from .models import UserProfile, Post, Company, InterviewExperience
+from .ranking import order_queryset, parse_ordering
+from .serializers import PostSerializer, InterviewExperienceSerializer
+from .throttling import ScopedSlidingWindowThrottle
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+def _page_bounds(request):
+    """Return (offset, limit) from the query string, clamped to MAX_LIMIT"""
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except ValueError:
+        limit, offset = DEFAULT_LIMIT, 0
+    return offset, limit
+
+
+def _public_summaries(serializer_class, queryset, offset, limit):
+    """
+    Render a page of the queryset in the serializer's public summary
+    representation, the payload the sync list endpoints return for
+    ?public=1, pending vote and view counts included.
+    """
+    fields = serializer_class.Meta.summary_fields
+    omit = list(getattr(serializer_class.Meta, 'personal_fields', []))
+    queryset = serializer_class.optimize_queryset(queryset, fields, omit)[offset:offset + limit]
+    return serializer_class(list(queryset), many=True, fields=fields, omit=omit).data
+
+
+class _PublicReadView:
+    """What the throttle sees of these endpoints: anonymous reads"""
+    throttle_scope = 'read'
+
+
+@sync_to_async
+def _serve_public(request, scope, build_data):
+    if not has_public_payload(request, scope):
+        throttle = ScopedSlidingWindowThrottle()
+        if not throttle.allow_request(request, _PublicReadView()):
+            wait = throttle.wait()
+            response = JsonResponse({'detail': str(Throttled(wait).detail)}, status=429)
+            if wait is not None:
+                response['Retry-After'] = str(math.ceil(wait))
+            return response
+    data, outcome = public_payload(request, scope, build_data)
+    response = JsonResponse(data, safe=False)
+    response['X-Cache'] = outcome
+    return patch_public_headers(response, public_cache_timeout(), public_stale_timeout())
+
+
+async def async_health_check(request):
+    """Async health check endpoint"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    try:
+        return JsonResponse({
+            'status': 'healthy',
+            'database': 'connected',
+            'users': await UserProfile.objects.acount(),
+            'companies': await Company.objects.acount(),
+        })
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'error': str(e)}, status=500)
+
+
+async def async_post_list(request):
+    """Async post list, filterable by ?subject= and ?user= (database id or Supabase UID), ordered by ?ordering="""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    queryset = Post.objects.filter(duplicate_of__isnull=True)
+    subject_id = request.GET.get('subject')
+    user_id = request.GET.get('user')
+    if subject_id:
+        queryset = queryset.filter(subject_id=subject_id)
+    if user_id:
+        queryset = queryset.filter(posted_by_filter(user_id))
+
+    offset, limit = _page_bounds(request)
+    ordered = order_queryset(queryset, parse_ordering(request))
+    return await _serve_public(request, 'posts', lambda: _public_summaries(PostSerializer, ordered, offset, limit))
+
+
+async def async_company_experiences(request, pk):
+    """Async list of interview experiences for a company"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not await Company.objects.filter(pk=pk).aexists():
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+
+    offset, limit = _page_bounds(request)
+    experiences = order_queryset(InterviewExperience.objects.filter(company_id=pk, duplicate_of__isnull=True),
+                                 parse_ordering(request))
+    return await _serve_public(request, 'experiences', lambda: _public_summaries(
+        InterviewExperienceSerializer, experiences, offset, limit))
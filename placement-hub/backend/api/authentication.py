@@ -7,6 +7,7 @@ from rest_framework.exceptions import AuthenticationFailed
 import jwt
 import requests
 from django.conf import settings
+from .identity import remember, resolve_profile
 from .models import UserProfile
 
 
@@ -32,6 +33,8 @@ class SupabaseAuthentication(BaseAuthentication):
             
             # Get or create user profile
             user_profile = self.get_or_create_user_profile(decoded_token)
+            # Without the JWT secret the token's claims are taken on trust
+            user_profile.identity_verified = bool(settings.SUPABASE_JWT_SECRET)
             
             return (user_profile, token)
             
@@ -43,11 +46,19 @@ class SupabaseAuthentication(BaseAuthentication):
         Verify JWT token with Supabase
         """
         try:
-            # For debugging: decode without verification to see the token structure
-            decoded_token = jwt.decode(
-                token, 
-                options={"verify_signature": False}
-            )
+            if settings.SUPABASE_JWT_SECRET:
+                decoded_token = jwt.decode(
+                    token,
+                    settings.SUPABASE_JWT_SECRET,
+                    algorithms=["HS256"],
+                    audience="authenticated",
+                )
+            else:
+                # For debugging: decode without verification to see the token structure
+                decoded_token = jwt.decode(
+                    token, 
+                    options={"verify_signature": False}
+                )
             print(f"DEBUG: Decoded token: {decoded_token}")
             
             # Check if token has required fields
@@ -75,17 +86,18 @@ class SupabaseAuthentication(BaseAuthentication):
         if not email.endswith('@cet.ac.in'):
             raise AuthenticationFailed('Only @cet.ac.in emails are allowed')
         
-        try:
-            user_profile = UserProfile.objects.get(supabase_uid=supabase_uid)
-        except UserProfile.DoesNotExist:
+        # Cached UID -> id mapping turns this into a primary key lookup
+        user_profile = resolve_profile(supabase_uid, allow_id=False)
+        if user_profile is None:
             # Create new user profile
             user_profile = UserProfile.objects.create(
                 supabase_uid=supabase_uid,
                 email=email,
                 full_name=decoded_token.get('user_metadata', {}).get('full_name', ''),
-                branch='',  # Will be updated by user
+                branch=None,  # Will be updated by user
                 year=1  # Default value
             )
+            remember(user_profile)
         
         # Add supabase_uid to user object for easy access
         user_profile.supabase_uid = supabase_uid
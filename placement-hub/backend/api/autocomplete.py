@@ -0,0 +1,194 @@
+"""
+Typeahead over company names, subject names and interview positions.
+
+Each process keeps one small index per kind: the distinct names ranked by
+popularity (experiences per company, posts per subject, experiences per
+position) and a sorted list of search keys, the normalized name plus its
+tail from every later word. A prefix is then two bisects, and the best
+matches are the highest ranked entries inside that range; no query runs.
+
+An index is built with one query the first time it is needed and rebuilt
+when its generation changes (signals in api.signals bump it whenever names
+appear, change or disappear) or after AUTOCOMPLETE_MAX_AGE seconds, so
+popularity stays reasonably current. Kinds with more than
+AUTOCOMPLETE_MAX_ENTRIES names aren't held in memory and are answered with
+an istartswith query instead, which PostgreSQL serves from the
+UPPER(column) text_pattern_ops indexes (migration 0020).
+"""
+
+import re
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from .cache import SingleFlight
+from .models import Company, Subject, InterviewExperience
+
+
+COMPANY, SUBJECT, POSITION = 'company', 'subject', 'position'
+KINDS = (COMPANY, SUBJECT, POSITION)
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Longest query considered; names are short and longer input can't match better
+MAX_QUERY_LENGTH = 100
+
+GENERATION_PREFIX = 'autocomplete:gen'
+
+_WORD = re.compile(r'\w+')
+_KEY_END = '\U0010ffff'
+
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+def generation(kind):
+    # Random tokens rather than counters, so a cleared cache can't bring back an old value
+    return cache.get_or_set(f'{GENERATION_PREFIX}:{kind}', lambda: uuid.uuid4().hex, None)
+
+
+def bump_generation(kind):
+    """Mark every process's index for `kind` as stale"""
+    cache.set(f'{GENERATION_PREFIX}:{kind}', uuid.uuid4().hex, None)
+
+
+class PrefixIndex:
+    """Sorted search keys over entries that are already in rank order"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        keys = []
+        for rank, entry in enumerate(entries):
+            name = normalize(entry['name'])
+            for match in _WORD.finditer(name):
+                keys.append((name[match.start():], rank))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.ranks = [rank for _, rank in keys]
+
+    def search(self, prefix, limit, predicate=None):
+        prefix = normalize(prefix)
+        if prefix:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix + _KEY_END, lo)
+            ranks = sorted(set(self.ranks[lo:hi]))
+        else:
+            ranks = range(len(self.entries))
+        results = []
+        for rank in ranks:
+            entry = self.entries[rank]
+            if predicate is None or predicate(entry):
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def _ranked(entries):
+    return sorted(entries, key=lambda entry: (-entry['count'], normalize(entry['name'])))
+
+
+def company_entries(max_entries):
+    rows = (Company.objects.annotate(count=F('stats__experience_count'))
+            .values_list('id', 'name', 'count')[:max_entries + 1])
+    return [{'id': company_id, 'name': name, 'count': count or 0} for company_id, name, count in rows]
+
+
+def subject_entries(max_entries):
+    rows = (Subject.objects.annotate(count=Count('posts'))
+            .values_list('id', 'name', 'branch_id', 'is_common', 'count')[:max_entries + 1])
+    return [{'id': subject_id, 'name': name, 'branch': branch_id, 'is_common': is_common, 'count': count}
+            for subject_id, name, branch_id, is_common, count in rows]
+
+
+def position_entries(max_entries):
+    rows = (InterviewExperience.objects.filter(duplicate_of__isnull=True)
+            .values_list('position').annotate(count=Count('id')).order_by())
+    # Spellings differing only in case or spacing are one position, shown as its most used spelling
+    counts, spellings = Counter(), defaultdict(Counter)
+    for position, count in rows.iterator():
+        key = normalize(position)
+        if key:
+            counts[key] += count
+            spellings[key][position.strip()] += count
+        if len(counts) > max_entries:
+            break
+    return [{'name': spellings[key].most_common(1)[0][0], 'count': count} for key, count in counts.items()]
+
+
+BUILDERS = {COMPANY: company_entries, SUBJECT: subject_entries, POSITION: position_entries}
+
+
+def max_entries():
+    return getattr(settings, 'AUTOCOMPLETE_MAX_ENTRIES', 20000)
+
+
+def build_index(kind):
+    """The kind's index, or None when it has too many names to keep in memory"""
+    limit = max_entries()
+    entries = BUILDERS[kind](limit)
+    if len(entries) > limit:
+        return None
+    return PrefixIndex(_ranked(entries))
+
+
+_indexes = {}  # kind -> (generation, built at, index or None)
+_rebuilds = SingleFlight()
+
+
+def get_index(kind):
+    current_generation = generation(kind)
+    held = _indexes.get(kind)
+    max_age = getattr(settings, 'AUTOCOMPLETE_MAX_AGE', 300)
+    if held is not None and held[0] == current_generation and time.monotonic() - held[1] < max_age:
+        return held[2]
+
+    def rebuild():
+        index = build_index(kind)
+        _indexes[kind] = (current_generation, time.monotonic(), index)
+        return index
+
+    # Concurrent requests in this process share one rebuild
+    index, _ = _rebuilds.do(kind, rebuild)
+    return index
+
+
+def clear_indexes():
+    _indexes.clear()
+
+
+def _database_search(kind, prefix, limit, branch_id):
+    """Whole-name prefix matches straight from the database"""
+    prefix = ' '.join(prefix.split())
+    if kind == COMPANY:
+        rows = (Company.objects.filter(name__istartswith=prefix).annotate(count=F('stats__experience_count'))
+                .order_by(F('count').desc(nulls_last=True), 'name').values_list('id', 'name', 'count')[:limit])
+        return [{'id': company_id, 'name': name, 'count': count or 0} for company_id, name, count in rows]
+    if kind == SUBJECT:
+        subjects = Subject.objects.filter(name__istartswith=prefix)
+        if branch_id is not None:
+            subjects = subjects.filter(Q(branch_id=branch_id) | Q(is_common=True))
+        rows = (subjects.annotate(count=Count('posts')).order_by('-count', 'name')
+                .values_list('id', 'name', 'branch_id', 'is_common', 'count')[:limit])
+        return [{'id': subject_id, 'name': name, 'branch': branch, 'is_common': is_common, 'count': count}
+                for subject_id, name, branch, is_common, count in rows]
+    rows = (InterviewExperience.objects.filter(duplicate_of__isnull=True, position__istartswith=prefix)
+            .values_list('position').annotate(count=Count('id')).order_by('-count', 'position')[:limit])
+    return [{'name': position, 'count': count} for position, count in rows]
+
+
+def suggest(kind, prefix, limit=DEFAULT_LIMIT, branch_id=None):
+    """Up to `limit` entries of `kind` with a name (or a word in it) starting with `prefix`, most popular first"""
+    prefix = (prefix or '')[:MAX_QUERY_LENGTH]
+    index = get_index(kind)
+    if index is None:
+        return _database_search(kind, prefix, limit, branch_id)
+    if kind == SUBJECT and branch_id is not None:
+        return index.search(prefix, limit, lambda entry: entry['is_common'] or entry['branch'] == branch_id)
+    return index.search(prefix, limit)
@@ -0,0 +1,185 @@
+"""
+Shared cache for public (non-personalized) list payloads.
+
+Requests made with ?public=1 get a payload without per-user fields, so the
+same body can be cached once per query and served to every user (and by a
+CDN). Clients personalize it on top with /api/votes/mine/.
+
+Entries stay fresh for PUBLIC_LIST_CACHE_TIMEOUT seconds and may then be
+served stale for PUBLIC_LIST_STALE_TIMEOUT more while a single request
+rebuilds them. Concurrent misses for the same key within a process are
+coalesced so only one of them runs the queries.
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework.response import Response
+
+
+PUBLIC_PARAM = 'public'
+KEY_PREFIX = 'public_list'
+
+
+def is_public_request(request):
+    """True when the client asked for the shared, non-personalized representation"""
+    query_params = getattr(request, 'query_params', request.GET)
+    return query_params.get(PUBLIC_PARAM, '').lower() in ('1', 'true', 'yes')
+
+
+# Upper bound on one rebuild; a crashed rebuilder can't block refreshes longer than this
+REFRESH_LOCK_TIMEOUT = 30
+
+LOOKUP_OUTCOMES = ('hits', 'stale', 'coalesced', 'misses')
+
+
+def public_cache_timeout():
+    return getattr(settings, 'PUBLIC_LIST_CACHE_TIMEOUT', 60)
+
+
+def public_stale_timeout():
+    return getattr(settings, 'PUBLIC_LIST_STALE_TIMEOUT', 300)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run a function once per key for callers that arrive while it is running"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, func):
+        """Return (result, shared); shared is True when another caller's result was reused"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+
+single_flight = SingleFlight()
+
+
+def generation(scope):
+    """Current generation of a scope; bumping it invalidates every cached page at once"""
+    return cache.get_or_set(f'{KEY_PREFIX}:gen:{scope}', 1, None)
+
+
+def bump_generation(scope):
+    key = f'{KEY_PREFIX}:gen:{scope}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def payload_key(scope, request):
+    """Cache key for a request: scope generation plus path and normalized query string"""
+    query = sorted((key, value) for key, values in request.GET.lists() for value in values)
+    raw = f'{request.path}?{query}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'{KEY_PREFIX}:{scope}:{generation(scope)}:{digest}'
+
+
+def has_public_payload(request, scope):
+    """Whether the public list cache holds a payload for the request, fresh or stale"""
+    return cache.get(payload_key(scope, request)) is not None
+
+
+def record_lookup(outcome):
+    key = f'{KEY_PREFIX}:stats:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def cache_stats():
+    """Lookup counters for the public list cache; every outcome but a miss avoided the queries"""
+    counts = cache.get_many([f'{KEY_PREFIX}:stats:{outcome}' for outcome in LOOKUP_OUTCOMES])
+    stats = {outcome: counts.get(f'{KEY_PREFIX}:stats:{outcome}', 0) for outcome in LOOKUP_OUTCOMES}
+    total = sum(stats.values())
+    stats['hit_rate'] = round((total - stats['misses']) / total, 4) if total else None
+    return stats
+
+
+def patch_public_headers(response, timeout, stale_timeout=0):
+    """Mark a response as shareable by browsers and CDNs for `timeout` seconds"""
+    patch_cache_control(response, public=True, max_age=timeout, s_maxage=timeout)
+    if stale_timeout:
+        patch_cache_control(response, stale_while_revalidate=stale_timeout)
+    # The browsable API renders HTML for browsers from the same URL, so a shared
+    # cache must not hand one client's representation to another
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
+
+
+def _rebuild(key, build_data, timeout, stale_timeout):
+    try:
+        data = build_data()
+        entry = {'data': data, 'fresh_until': time.time() + timeout}
+        cache.set(key, entry, timeout + stale_timeout)
+    finally:
+        cache.delete(f'{key}:refresh')
+    return data
+
+
+def public_payload(request, scope, build_data):
+    """
+    Return (payload, X-Cache value) for the request from the public list
+    cache, building the payload with `build_data()` on a miss. Only
+    successful payloads are cached.
+
+    X-Cache reports HIT, STALE (served while another request refreshes),
+    COALESCED (waited on a concurrent identical request) or MISS.
+    """
+    key = payload_key(scope, request)
+    entry = cache.get(key)
+
+    if entry is not None and entry['fresh_until'] > time.time():
+        data, outcome = entry['data'], 'hits'
+    elif entry is not None and not cache.add(f'{key}:refresh', 1, REFRESH_LOCK_TIMEOUT):
+        # Someone else is already rebuilding this entry
+        data, outcome = entry['data'], 'stale'
+    else:
+        data, shared = single_flight.do(
+            key, lambda: _rebuild(key, build_data, public_cache_timeout(), public_stale_timeout()))
+        outcome = 'coalesced' if shared else 'misses'
+    record_lookup(outcome)
+    return data, {'hits': 'HIT', 'stale': 'STALE', 'coalesced': 'COALESCED', 'misses': 'MISS'}[outcome]
+
+
+def serve_public(request, scope, build_data):
+    """Respond with the cached public payload for the request (see public_payload)"""
+    data, outcome = public_payload(request, scope, build_data)
+    response = Response(data)
+    response['X-Cache'] = outcome
+    return patch_public_headers(response, public_cache_timeout(), public_stale_timeout())
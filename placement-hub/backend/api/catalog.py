@@ -0,0 +1,156 @@
+"""
+Static snapshot of the catalog: branches, subjects and companies.
+
+These change a few times a semester, yet every page load fetched them
+through the viewsets. publish_catalog() renders them the way the list
+endpoints do into a single JSON file named after a hash of its content
+(catalog.<hash>.json) in the ``catalog`` storage (STORAGES in
+hub.settings): a public Supabase Storage bucket in production, where every
+instance and client sees the same files, and STATIC_ROOT/catalog locally. A
+new version always gets a new name, so the file is cached forever by
+browsers and the CDN in front of the storage.
+
+Clients ask /api/catalog/ for the current version and URL, then load the
+file. The pointer is stored next to the files (latest.json) and cached for
+PUBLIC_LIST_CACHE_TIMEOUT seconds. Saving or deleting a branch, subject or
+company queues a coalesced `publish_catalog` task; `manage.py
+publish_catalog` publishes by hand (run it after bulk imports). The pointer
+lists the newest CATALOG_KEEP_VERSIONS files, which are kept so clients
+holding an older pointer still resolve; older ones are deleted.
+
+Without a catalog storage (on Vercel when SUPABASE_SERVICE_ROLE_KEY isn't
+set) nothing is published and /api/catalog/ answers 404.
+"""
+
+import hashlib
+import json
+import logging
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.utils import timezone
+
+from .cache import public_cache_timeout
+from .models import Branch, Subject, Company
+from .serializers import BranchSerializer, CatalogSubjectSerializer, CompanySerializer
+from .tasks import task, enqueue
+
+
+CATALOG_STORAGE = 'catalog'
+POINTER_FILE = 'latest.json'
+POINTER_CACHE_KEY = 'catalog:pointer'
+CATALOG_FILE = re.compile(r'^catalog\.[0-9a-f]{12}\.json$')
+# What clients get from /api/catalog/; the version list is for pruning
+PUBLIC_POINTER_FIELDS = ('version', 'url', 'published_at')
+
+
+logger = logging.getLogger(__name__)
+
+
+def catalog_enabled():
+    """Whether a catalog storage is configured (STORAGES in hub.settings)"""
+    return CATALOG_STORAGE in settings.STORAGES
+
+
+def catalog_storage():
+    return storages[CATALOG_STORAGE]
+
+
+def build_catalog():
+    """Catalog data, in the representation of the branch, subject and company lists"""
+    return {
+        'branches': BranchSerializer(Branch.objects.filter(is_active=True).order_by('name'), many=True).data,
+        'subjects': CatalogSubjectSerializer(
+            Subject.objects.select_related('branch').order_by('name', 'id'), many=True).data,
+        'companies': CompanySerializer(Company.objects.order_by('name'), many=True).data,
+    }
+
+
+def render_catalog(data):
+    # Sorted keys and no whitespace, so equal catalogs hash equally
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _json_file(content):
+    content = ContentFile(content)
+    content.content_type = 'application/json'
+    return content
+
+
+def _overwrite(storage, name, content):
+    # Object storage replaces in place; file system storage would pick another name instead
+    if storage.get_available_name(name) != name:
+        storage.delete(name)
+    storage.save(name, _json_file(content))
+
+
+def _load_pointer():
+    try:
+        with catalog_storage().open(POINTER_FILE) as pointer_file:
+            return json.loads(pointer_file.read())
+    except (OSError, ValueError):
+        return None
+
+
+def read_pointer():
+    """The current {version, url, published_at, versions}, or None if nothing was published"""
+    if not catalog_enabled():
+        return None
+    pointer = cache.get(POINTER_CACHE_KEY)
+    if pointer is None:
+        pointer = _load_pointer()
+        if pointer is None:
+            return None
+        # Briefly, as other processes may publish a newer version
+        cache.set(POINTER_CACHE_KEY, pointer, public_cache_timeout())
+    return pointer
+
+
+def public_pointer(pointer):
+    return {field: pointer[field] for field in PUBLIC_POINTER_FIELDS}
+
+
+def publish_catalog(keep=None):
+    """
+    Store the catalog file for the current data if it doesn't exist yet and
+    point clients at it. Returns (pointer, whether a new version was written).
+    """
+    content = render_catalog(build_catalog())
+    version = hashlib.sha256(content).hexdigest()[:12]
+    name = f'catalog.{version}.json'
+    storage = catalog_storage()
+
+    created = not storage.exists(name)
+    if created:
+        storage.save(name, _json_file(content))
+
+    pointer = _load_pointer()
+    if created or pointer is None or pointer.get('version') != version:
+        keep = max(keep if keep is not None else getattr(settings, 'CATALOG_KEEP_VERSIONS', 5), 1)
+        versions = [name] + [old for old in (pointer or {}).get('versions', []) if old != name]
+        pointer = {'version': version, 'url': storage.url(name), 'published_at': timezone.now().isoformat(),
+                   'versions': versions[:keep]}
+        _overwrite(storage, POINTER_FILE, json.dumps(pointer).encode('utf-8'))
+        for old in versions[keep:]:
+            if CATALOG_FILE.match(old):
+                storage.delete(old)
+    cache.set(POINTER_CACHE_KEY, pointer, public_cache_timeout())
+    return pointer, created
+
+
+@task('publish_catalog')
+def publish_catalog_task(payload):
+    # Queued before the storage was removed from the settings
+    if catalog_enabled():
+        publish_catalog()
+
+
+def schedule_catalog_publish():
+    """Queue a (coalesced) catalog publish, so a burst of admin edits writes one version"""
+    if not catalog_enabled():
+        logger.warning("No catalog storage configured (set SUPABASE_SERVICE_ROLE_KEY); catalog not published")
+        return None
+    return enqueue('publish_catalog', dedupe_key='catalog', delay=getattr(settings, 'CATALOG_PUBLISH_DELAY', 10))
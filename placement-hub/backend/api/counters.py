@@ -0,0 +1,44 @@
+"""
+Buffered counters (vote deltas, view counts) in the dedicated ``counters``
+cache.
+
+A buffered count exists nowhere else until it is flushed, so counters are
+kept out of the default cache, where cached pages and throttle buckets
+could push them out. Outside development the counters cache must be shared
+by every process and must not evict keys stored without an expiry (see
+COUNTER_CACHE_URL in hub.settings); SHARED_COUNTERS says whether it is.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+COUNTERS = 'counters'
+
+
+def counter_cache():
+    return caches[COUNTERS]
+
+
+def counters_shared():
+    return getattr(settings, 'SHARED_COUNTERS', False)
+
+
+def add(key, delta=1):
+    """Add `delta` to a counter, starting it at zero if it doesn't exist. Returns the new value."""
+    counters = counter_cache()
+    try:
+        return counters.incr(key, delta)
+    except ValueError:
+        # Not there yet (or expired since); only one concurrent caller creates it
+        if counters.add(key, delta, None):
+            return delta
+        return counters.incr(key, delta)
+
+
+def subtract(key, delta):
+    """Take `delta` off a counter. Returns what is left, 0 when the counter is gone."""
+    try:
+        return counter_cache().decr(key, delta)
+    except ValueError:
+        return 0
@@ -0,0 +1,279 @@
+"""
+Near-duplicate detection for posts and interview experiences.
+
+Each item gets a fingerprint:
+
+* the hashes of its normalized links (scheme, ``www.``, tracking parameters
+  and fragments dropped; YouTube and Google Drive links reduced to their
+  video/file id), which find items pointing at the same notes or video, and
+* a MinHash signature over word 3-shingles of its text, cut into LSH bands.
+  Two texts share at least one band with high probability once their
+  Jaccard similarity passes about 0.5.
+
+Candidates are confirmed by comparing the full signatures. A shared link
+alone isn't enough, as different posts often point at the same standard
+video or notes: those need LINKED_SIMILARITY_THRESHOLD, other candidates
+SIMILARITY_THRESHOLD.
+
+Link hashes and band keys are stored in FingerprintKey, so a check is one
+indexed lookup plus one read of the candidates' signatures instead of a
+table scan. Experiences are only compared within their company.
+
+Creating a duplicate through the API is rejected with 409 (see
+PostViewSet.perform_create and InterviewExperienceViewSet.perform_create).
+`manage.py flag_duplicates` rebuilds the index and marks historical
+duplicates through their duplicate_of field; flagged items are left out of
+lists and feeds.
+"""
+
+import hashlib
+import random
+import re
+import zlib
+from collections import namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .cache import bump_generation
+from .feed import republish
+from .models import Post, InterviewExperience, ContentFingerprint, FingerprintKey
+
+
+KIND_POST = 'post'
+KIND_EXPERIENCE = 'experience'
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+# Texts with fewer shingles than this are too short to call duplicates
+MIN_SHINGLES = 8
+# Share of equal signature positions (estimated Jaccard similarity) for a duplicate
+SIMILARITY_THRESHOLD = 0.85
+# ...and for one that links the same notes or video
+LINKED_SIMILARITY_THRESHOLD = 0.5
+
+# Fields each kind's fingerprint is built from
+TRACKED_FIELDS = {
+    KIND_POST: {'topic', 'focus_points', 'notes_link', 'video_link'},
+    KIND_EXPERIENCE: {'company', 'company_id', 'position', 'questions', 'tips'},
+}
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'si', 'feature', 'ref', 'usp', 'igshid'}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+
+_WORD = re.compile(r'\w+')
+_DRIVE_FILE = re.compile(r'/(?:file|document|presentation|spreadsheets)/d/([\w-]+)')
+
+Fingerprint = namedtuple('Fingerprint', ['url_keys', 'band_keys', 'signature'])
+
+
+class DuplicateContent(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'This looks like a duplicate of existing content.'
+    default_code = 'duplicate'
+
+    def __init__(self, duplicate_of):
+        super().__init__({'error': self.default_detail})
+        # Kept as a number for clients (detail values are otherwise coerced to strings)
+        self.detail['duplicate_of'] = duplicate_of
+
+
+def normalize_url(url):
+    """Canonical form of a link, so trivially different copies of it compare equal"""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host in ('youtube.com', 'm.youtube.com', 'youtu.be'):
+        video = dict(query).get('v') if host != 'youtu.be' else path.lstrip('/')
+        if video:
+            return f'youtube:{video}'
+    if host in ('drive.google.com', 'docs.google.com'):
+        match = _DRIVE_FILE.search(path)
+        file_id = match.group(1) if match else dict(query).get('id')
+        if file_id:
+            return f'gdrive:{file_id}'
+
+    query = sorted((key, value) for key, value in query
+                   if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_'))
+    return f'{host}{path}' + (f'?{urlencode(query)}' if query else '')
+
+
+def shingles(text):
+    words = _WORD.findall((text or '').lower())
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set):
+    """MinHash signature: the minimum of each hash permutation over the shingles"""
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    if not first or not second:
+        return 0.0
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:32]
+
+
+def fingerprint(text, links=(), scope=''):
+    url_keys = [f'u:{_digest(url)}' for url in {normalize_url(link) for link in links} if url]
+    shingle_set = shingles(text)
+    # Short texts are still compared with items sharing a link, but never banded
+    signature = minhash(shingle_set) if shingle_set else []
+    if len(shingle_set) < MIN_SHINGLES:
+        return Fingerprint(url_keys, [], signature)
+    band_keys = [
+        f'b{band}:' + _digest(f'{scope}:' + ','.join(
+            str(value) for value in signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+        for band in range(BANDS)
+    ]
+    return Fingerprint(url_keys, band_keys, signature)
+
+
+def post_fingerprint(topic, focus_points, notes_link=None, video_link=None):
+    return fingerprint(f'{topic}\n{focus_points or ""}', [notes_link, video_link])
+
+
+def experience_fingerprint(company_id, position, questions, tips):
+    return fingerprint(f'{position}\n{questions}\n{tips or ""}', scope=company_id)
+
+
+def fingerprint_of(kind, instance):
+    if kind == KIND_POST:
+        return post_fingerprint(instance.topic, instance.focus_points, instance.notes_link, instance.video_link)
+    return experience_fingerprint(instance.company_id, instance.position, instance.questions, instance.tips)
+
+
+def best_match(signature, linked, similar, signatures):
+    """
+    The candidate most similar to `signature` that passes its threshold, or
+    None. `linked` share a link with it, `similar` an LSH band; `signatures`
+    maps candidate ids to their signatures.
+    """
+    best = None
+    for object_id in linked | similar:
+        score = similarity(signature, signatures.get(object_id))
+        threshold = LINKED_SIMILARITY_THRESHOLD if object_id in linked else SIMILARITY_THRESHOLD
+        if score >= threshold and (best is None or (score, -object_id) > best):
+            best = (score, -object_id)
+    return None if best is None else -best[1]
+
+
+def find_duplicate(kind, print_, exclude_id=None):
+    """Id of an indexed item the fingerprint duplicates, or None"""
+    keys = print_.url_keys + print_.band_keys
+    if not print_.signature or not keys:
+        return None
+    hits = FingerprintKey.objects.filter(kind=kind, key__in=keys)
+    if exclude_id is not None:
+        hits = hits.exclude(object_id=exclude_id)
+    url_keys = set(print_.url_keys)
+    linked, similar = set(), set()
+    for object_id, key in hits.values_list('object_id', 'key'):
+        (linked if key in url_keys else similar).add(object_id)
+    if not linked and not similar:
+        return None
+    signatures = dict(ContentFingerprint.objects.filter(kind=kind, object_id__in=linked | similar).values_list(
+        'object_id', 'signature'))
+    return best_match(print_.signature, linked, similar, signatures)
+
+
+def check_duplicate(kind, print_):
+    """Raise DuplicateContent when the fingerprint matches indexed content"""
+    duplicate_of = find_duplicate(kind, print_)
+    if duplicate_of is not None:
+        raise DuplicateContent(duplicate_of)
+
+
+def _index_rows(kind, object_id, print_):
+    keys = [FingerprintKey(kind=kind, object_id=object_id, key=key)
+            for key in print_.url_keys + print_.band_keys]
+    return ContentFingerprint(kind=kind, object_id=object_id, signature=print_.signature), keys
+
+
+def index_content(kind, object_id, print_):
+    """Store (or replace) an item's fingerprint"""
+    fingerprint_row, keys = _index_rows(kind, object_id, print_)
+    with transaction.atomic():
+        forget_content(kind, object_id)
+        fingerprint_row.save()
+        FingerprintKey.objects.bulk_create(keys)
+
+
+def forget_content(kind, object_id):
+    FingerprintKey.objects.filter(kind=kind, object_id=object_id).delete()
+    ContentFingerprint.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+MODELS = {
+    KIND_POST: (Post, ['topic', 'focus_points', 'notes_link', 'video_link']),
+    KIND_EXPERIENCE: (InterviewExperience, ['company_id', 'position', 'questions', 'tips']),
+}
+
+
+def flag_duplicates(kind, batch_size=1000):
+    """
+    Rebuild the index for one kind and point every item that duplicates an
+    older one at it. Returns (items indexed, duplicates flagged).
+    """
+    model, fields = MODELS[kind]
+    first_by_band, linked_by_url, signatures, flagged = {}, {}, {}, {}
+    fingerprints, keys = [], []
+    with transaction.atomic():
+        FingerprintKey.objects.filter(kind=kind).delete()
+        ContentFingerprint.objects.filter(kind=kind).delete()
+        indexed = 0
+        for item in model.objects.order_by('id').only('id', *fields).iterator(chunk_size=batch_size):
+            print_ = fingerprint_of(kind, item)
+            indexed += 1
+            # Same rules as find_duplicate, against the older items seen so far
+            if print_.signature:
+                linked = {other for key in print_.url_keys for other in linked_by_url.get(key, ())}
+                similar = {first_by_band[key] for key in print_.band_keys if key in first_by_band}
+                original = best_match(print_.signature, linked, similar, signatures)
+                if original is not None:
+                    flagged[item.id] = original
+                signatures[item.id] = print_.signature
+            for key in print_.url_keys:
+                linked_by_url.setdefault(key, []).append(item.id)
+            for key in print_.band_keys:
+                first_by_band.setdefault(key, item.id)
+
+            fingerprint_row, key_rows = _index_rows(kind, item.id, print_)
+            fingerprints.append(fingerprint_row)
+            keys.extend(key_rows)
+            if len(fingerprints) >= batch_size:
+                ContentFingerprint.objects.bulk_create(fingerprints)
+                FingerprintKey.objects.bulk_create(keys, batch_size=batch_size)
+                fingerprints, keys = [], []
+        ContentFingerprint.objects.bulk_create(fingerprints)
+        FingerprintKey.objects.bulk_create(keys, batch_size=batch_size)
+
+        previously_flagged = set(model.objects.filter(duplicate_of__isnull=False).values_list('id', flat=True))
+        model.objects.filter(duplicate_of__isnull=False).update(duplicate_of=None)
+        rows = [model(id=item_id, duplicate_of_id=original) for item_id, original in flagged.items()]
+        model.objects.bulk_update(rows, ['duplicate_of'], batch_size=batch_size)
+        # Duplicates leave the home feeds and items no longer flagged return to them
+        republish(model, previously_flagged ^ set(flagged), batch_size=batch_size)
+    # bulk_update sends no signals, so invalidate the cached public lists here
+    bump_generation('posts' if kind == KIND_POST else 'experiences')
+    return indexed, len(flagged)
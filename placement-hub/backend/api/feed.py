@@ -0,0 +1,170 @@
+"""
+Personalized home feeds.
+
+A student's feed holds the posts of their branch's subjects, posts of common
+subjects and, from SENIOR_FROM_YEAR on (when internship and placement drives
+start), interview experiences. Feeds are precomputed on write, with every
+post or experience stored once in the one feed it belongs to:
+
+- ``branch:<id>``: posts of that branch's subjects
+- ``common``: posts of common subjects and of subjects without a branch
+- ``senior``: interview experiences
+
+A student reads the union of their feeds (see `feeds_for`), merged at read
+time. Each feed is a range scan of the (feed, -created_at, -id) index, so a
+page is at most one query per feed. Entries only change when an item is
+created, moves to another subject or is flagged as a duplicate; a new branch
+needs no entries of its own.
+
+Pages use keyset pagination: the cursor is the (created_at, id) of the last
+entry served, so deep pages cost the same as the first one and new items
+don't shift what the next page returns.
+
+`manage.py rebuild_feed` rebuilds every feed; run it after bulk imports.
+"""
+
+import base64
+import heapq
+import json
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import FeedEntry, Post, InterviewExperience
+
+
+SENIOR_FROM_YEAR = 3
+COMMON_FEED = 'common'
+SENIOR_FEED = 'senior'
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+def is_senior(year):
+    return year is not None and year >= SENIOR_FROM_YEAR
+
+
+def branch_feed(branch_id):
+    return f'branch:{branch_id}'
+
+
+def feeds_for(user_profile):
+    """Feeds whose union is the user's home feed"""
+    # Students without a branch only see common content
+    feeds = [COMMON_FEED]
+    if user_profile.branch_id is not None:
+        feeds.append(branch_feed(user_profile.branch_id))
+    if is_senior(user_profile.year):
+        feeds.append(SENIOR_FEED)
+    return feeds
+
+
+def post_feed(branch_id, is_common):
+    """The feed a post of a subject with the given branch belongs in"""
+    return COMMON_FEED if is_common or branch_id is None else branch_feed(branch_id)
+
+
+def _post_entries(posts):
+    return [FeedEntry(feed=post_feed(post.subject.branch_id, post.subject.is_common), post_id=post.id,
+                      created_at=post.created_at)
+            for post in posts]
+
+
+def _experience_entries(experiences):
+    return [FeedEntry(feed=SENIOR_FEED, experience_id=experience.id, created_at=experience.created_at)
+            for experience in experiences]
+
+
+def add_post(post):
+    """(Re)publish a post to its feed"""
+    post = Post.objects.select_related('subject').only(
+        'id', 'created_at', 'duplicate_of', 'subject__branch_id', 'subject__is_common').get(pk=post.pk)
+    with transaction.atomic():
+        FeedEntry.objects.filter(post_id=post.id).delete()
+        if post.duplicate_of_id is None:
+            FeedEntry.objects.bulk_create(_post_entries([post]))
+
+
+def add_experience(experience):
+    """(Re)publish an experience to the senior feed"""
+    with transaction.atomic():
+        FeedEntry.objects.filter(experience_id=experience.id).delete()
+        if experience.duplicate_of_id is None:
+            FeedEntry.objects.bulk_create(_experience_entries([experience]))
+
+
+def republish(model, ids, batch_size=1000):
+    """(Re)publish many posts or experiences (`model` is Post or InterviewExperience) at once"""
+    ids = sorted(ids)
+    if model is Post:
+        build, column = _post_entries, 'post_id'
+        fields = ('id', 'created_at', 'subject__branch_id', 'subject__is_common')
+    else:
+        build, column = _experience_entries, 'experience_id'
+        fields = ('id', 'created_at')
+    with transaction.atomic():
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            FeedEntry.objects.filter(**{f'{column}__in': chunk}).delete()
+            items = model.objects.filter(id__in=chunk, duplicate_of__isnull=True)
+            if model is Post:
+                items = items.select_related('subject')
+            FeedEntry.objects.bulk_create(build(items.only(*fields)))
+
+
+def rebuild_feeds(batch_size=1000):
+    """Rebuild every feed from scratch, returning the number of entries written"""
+    written = 0
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        posts = Post.objects.filter(duplicate_of__isnull=True).select_related('subject').only(
+            'id', 'created_at', 'subject__branch_id', 'subject__is_common').order_by('id')
+        experiences = InterviewExperience.objects.filter(duplicate_of__isnull=True).only(
+            'id', 'created_at').order_by('id')
+        for queryset, build in ((posts, _post_entries), (experiences, _experience_entries)):
+            batch = []
+            for item in queryset.iterator(chunk_size=batch_size):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    written += len(FeedEntry.objects.bulk_create(build(batch)))
+                    batch = []
+            written += len(FeedEntry.objects.bulk_create(build(batch)))
+    return written
+
+
+def encode_cursor(entry):
+    raw = json.dumps([entry.created_at.isoformat(), entry.id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """(created_at, id) from a cursor, or None if it is malformed"""
+    try:
+        created_at, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        created_at = parse_datetime(created_at)
+        return (created_at, int(entry_id)) if created_at else None
+    except (ValueError, TypeError, UnicodeError):
+        return None
+
+
+def feed_page(feeds, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of the union of `feeds` with its posts and experiences loaded,
+    in one query per feed. Returns (entries, next cursor or None).
+    """
+    candidates = []
+    for feed in feeds:
+        entries = FeedEntry.objects.filter(feed=feed)
+        if cursor is not None:
+            created_at, entry_id = cursor
+            entries = entries.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=entry_id))
+        candidates.extend(
+            entries.select_related('post__subject', 'post__posted_by', 'experience__company',
+                                   'experience__posted_by')
+            .order_by('-created_at', '-id')[:limit + 1]
+        )
+    entries = heapq.nlargest(limit + 1, candidates, key=lambda entry: (entry.created_at, entry.id))
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    return entries[:limit], next_cursor
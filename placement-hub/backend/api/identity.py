@@ -0,0 +1,114 @@
+"""
+Resolve user identifiers (Supabase UID or database id) to profiles.
+
+Clients refer to users by either form. A small per-process TTL cache maps
+Supabase UIDs to profile ids, so repeated lookups hit the primary key and
+filters on a user's content need no preliminary profile query. UIDs never
+change, so the only invalidation needed is on profile deletion; the TTL
+bounds how long other processes may keep a deleted user's entry.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import UserProfile
+
+
+class TTLCache:
+    """A small thread-safe mapping whose entries expire after `ttl` seconds"""
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.max_size and key not in self._data:
+                # Drop expired entries first, then the oldest insertions
+                now = time.monotonic()
+                for stale in [k for k, (_, expires) in self._data.items() if expires < now]:
+                    del self._data[stale]
+                while len(self._data) >= self.max_size:
+                    del self._data[next(iter(self._data))]
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+profile_ids = TTLCache(
+    ttl=getattr(settings, 'PROFILE_ID_CACHE_TTL', 300),
+    max_size=getattr(settings, 'PROFILE_ID_CACHE_SIZE', 10000),
+)
+
+
+def remember(profile):
+    profile_ids.set(profile.supabase_uid, profile.id)
+
+
+def forget(supabase_uid):
+    profile_ids.delete(supabase_uid)
+
+
+def resolve_profile(identifier, queryset=None, allow_id=True):
+    """
+    Return the profile whose Supabase UID, or failing that database id,
+    matches `identifier`, in a single query. None when nobody matches.
+    Pass allow_id=False to match Supabase UIDs only.
+    """
+    queryset = queryset if queryset is not None else UserProfile.objects.all()
+    identifier = str(identifier)
+
+    cached_id = profile_ids.get(identifier)
+    if cached_id is not None:
+        # Still a primary key lookup; the UID check guards against a deleted and reused id
+        profile = queryset.filter(pk=cached_id, supabase_uid=identifier).first()
+        if profile is not None:
+            return profile
+        forget(identifier)
+
+    lookup = Q(supabase_uid=identifier)
+    if allow_id and identifier.isdigit():
+        lookup |= Q(id=int(identifier))
+    candidates = list(queryset.filter(lookup)[:2])
+    profile = next((p for p in candidates if p.supabase_uid == identifier),
+                   candidates[0] if candidates else None)
+    if profile is not None:
+        remember(profile)
+    return profile
+
+
+def posted_by_filter(identifier, field='posted_by'):
+    """
+    Q object restricting content to a user's, without loading the profile:
+    a database id or cached UID filters on the foreign key directly, an
+    unknown UID joins the profile table.
+    """
+    identifier = str(identifier)
+    if identifier.isdigit():
+        return Q(**{f'{field}_id': int(identifier)})
+    cached_id = profile_ids.get(identifier)
+    if cached_id is not None:
+        return Q(**{f'{field}_id': cached_id})
+    return Q(**{f'{field}__supabase_uid': identifier})
@@ -0,0 +1,182 @@
+"""
+Benchmark every API router endpoint through the Django test client.
+
+Reports latency percentiles, queries per request and throughput, and can
+store the results as a baseline and flag regressions against it. Run it
+against a seeded database, e.g.:
+
+    DATABASE_URL=sqlite:///bench.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:///bench.sqlite3 python manage.py seed_data
+    DATABASE_URL=sqlite:///bench.sqlite3 python manage.py benchmark_api --save-baseline
+"""
+
+import contextlib
+import io
+import json
+import statistics
+import time
+from pathlib import Path
+
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import UserProfile
+from api.urls import router
+
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def bearer_token(user_profile):
+    """Build a token SupabaseAuthentication accepts for the given profile"""
+    # Signed with the project secret when the API verifies tokens
+    token = jwt.encode({'sub': user_profile.supabase_uid, 'email': user_profile.email, 'aud': 'authenticated'},
+                       settings.SUPABASE_JWT_SECRET or 'benchmark-key-never-verified-by-the-api', algorithm='HS256')
+    return f'Bearer {token}'
+
+
+def unthrottled():
+    """Lift the API throttle budgets so benchmark traffic isn't answered with 429s"""
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}})
+
+
+class Command(BaseCommand):
+    help = 'Benchmark API endpoints: latency percentiles, queries per request and throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30, help='Requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per endpoint')
+        parser.add_argument('--only', default='', help='Comma separated endpoint names to run')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON path')
+        parser.add_argument('--save-baseline', action='store_true', help='Store results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 latency growth over the baseline (0.25 = 25%%)')
+        parser.add_argument('--json', dest='json_path', default='', help='Also write results to this file')
+
+    def handle(self, *args, **options):
+        self.client = Client(HTTP_HOST='localhost')
+        user_profile = UserProfile.objects.order_by('id').first()
+        if user_profile is None:
+            raise CommandError('No data to benchmark, run `manage.py seed_data` first')
+        self.auth = {'HTTP_AUTHORIZATION': bearer_token(user_profile)}
+
+        only = {name.strip() for name in options['only'].split(',') if name.strip()}
+        scenarios = [s for s in self.build_scenarios(user_profile) if not only or s['name'] in only]
+
+        results = {}
+        with unthrottled():
+            for scenario in scenarios:
+                results[scenario['name']] = self.run_scenario(scenario, options['iterations'], options['warmup'])
+                self.report(scenario['name'], results[scenario['name']])
+
+        if options['json_path']:
+            Path(options['json_path']).write_text(json.dumps(results, indent=2))
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+        elif baseline_path.exists():
+            self.compare(results, json.loads(baseline_path.read_text()), options['tolerance'])
+
+    def build_scenarios(self, user_profile):
+        """One GET scenario per router list/detail route and GET extra action, plus votes"""
+        scenarios = []
+        for prefix, viewset, basename in router.registry:
+            model = viewset.queryset.model
+            lookup_field = getattr(viewset, 'lookup_field', 'pk')
+            sample = model.objects.order_by('id').first()
+            scenarios.append({'name': f'{basename}-list', 'method': 'get',
+                              'path': f'/api/{prefix}/'})
+            if sample is None:
+                continue
+            lookup = getattr(sample, lookup_field if lookup_field != 'pk' else 'pk')
+            detail = f'/api/{prefix}/{lookup}/'
+            scenarios.append({'name': f'{basename}-detail', 'method': 'get', 'path': detail})
+            for extra in viewset.get_extra_actions():
+                if not extra.detail:
+                    continue
+                name = f'{basename}-{extra.url_path}'
+                if 'get' in extra.mapping:
+                    scenarios.append({'name': name, 'method': 'get', 'path': f'{detail}{extra.url_path}/'})
+                elif extra.url_path == 'vote':
+                    scenarios.append({'name': name, 'method': 'post', 'path': f'{detail}vote/',
+                                      'payloads': self.vote_payloads(basename), 'auth': True})
+        return scenarios
+
+    def vote_payloads(self, basename):
+        """Alternate payloads so repeated votes exercise both the update and the toggle path"""
+        if basename == 'post':
+            return [{'vote': 1}, {'vote': -1}, {'vote': 0}]
+        return [{'is_upvote': True}, {'is_upvote': False}]
+
+    def run_scenario(self, scenario, iterations, warmup):
+        timings, query_counts = [], []
+        payloads = scenario.get('payloads') or [None]
+        extra = self.auth if scenario.get('auth') else {}
+        status_codes = set()
+
+        # Views still print debug output; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(warmup + iterations):
+                payload = payloads[i % len(payloads)]
+                kwargs = dict(extra)
+                if payload is not None:
+                    kwargs.update(data=json.dumps(payload), content_type='application/json')
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = getattr(self.client, scenario['method'])(scenario['path'], **kwargs)
+                    elapsed = time.perf_counter() - start
+                status_codes.add(response.status_code)
+                if i >= warmup:
+                    timings.append(elapsed * 1000)
+                    query_counts.append(len(queries.captured_queries))
+
+        total_seconds = sum(timings) / 1000
+        return {
+            'path': scenario['path'],
+            'method': scenario['method'].upper(),
+            'status': sorted(status_codes),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'queries': max(query_counts),
+            'rps': round(len(timings) / total_seconds, 1) if total_seconds else None,
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<32} {result['method']:<4} p50={result['p50_ms']:>8.2f}ms "
+            f"p95={result['p95_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+            f"queries={result['queries']:>4} rps={result['rps']} status={result['status']}"
+        )
+
+    def compare(self, results, baseline, tolerance):
+        regressions = []
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            if result['queries'] > previous['queries']:
+                regressions.append(f"{name}: queries {previous['queries']} -> {result['queries']}")
+            if result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms")
+
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(line))
+            raise CommandError(f'{len(regressions)} regression(s) against the baseline')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
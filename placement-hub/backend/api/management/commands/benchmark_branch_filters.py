@@ -0,0 +1,60 @@
+"""
+Time the branch filters and joins the API runs, on a seeded database.
+
+Each query is shown with its p50 latency and the database's plan, so the
+branch_id foreign key indexes can be seen in use, e.g.:
+
+    DATABASE_URL=sqlite:///bench.sqlite3 python manage.py benchmark_branch_filters --branch CSE
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+
+from api.models import Branch, Post, Subject, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Benchmark branch filters on subjects, posts and profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--branch', default='CSE', help='Branch name to filter on')
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--explain', action='store_true', help='Print query plans')
+
+    def handle(self, *args, **options):
+        branch = Branch.objects.filter(name=options['branch']).first()
+        if branch is None:
+            raise CommandError(f"No branch named {options['branch']}, run `manage.py seed_data` first")
+
+        queries = {
+            # SubjectViewSet.get_queryset with ?branch=
+            'subjects for branch': Subject.objects.select_related('branch').annotate(
+                annotated_posts_count=Count('posts')).filter(Q(branch__name=branch.name) | Q(is_common=True)),
+            # Dashboard subjects for the viewer's branch
+            'subjects for branch id': Subject.objects.filter(Q(branch_id=branch.id) | Q(is_common=True)),
+            # PostAdmin's subject__branch filter
+            'posts in branch (latest 50)': Post.objects.filter(
+                subject__branch=branch).order_by('-created_at')[:50],
+            'posts in branch (count)': Post.objects.filter(subject__branch=branch),
+            'profiles in branch (count)': UserProfile.objects.filter(branch=branch),
+        }
+
+        for label, queryset in queries.items():
+            if label.endswith('(count)'):
+                run = queryset.count
+            else:
+                def run(queryset=queryset):
+                    return list(queryset.all())
+            run()
+            timings = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(f'{label:<32} p50={statistics.median(timings):>9.3f}ms')
+            if options['explain']:
+                plan_queryset = queryset if not label.endswith('(count)') else queryset.values('id')
+                self.stdout.write(plan_queryset.explain())
@@ -0,0 +1,114 @@
+"""
+Compare WSGI and ASGI throughput for the async read paths under simulated
+database latency, all inside a single process.
+
+Every SQL statement is delayed by --latency-ms to mimic the remote Supabase
+round-trip. The WSGI side runs requests on --wsgi-threads worker threads
+(1 = a classic sync worker); the ASGI side keeps --concurrency requests in
+flight on one event loop.
+"""
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from api.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Benchmark WSGI vs ASGI concurrency for read endpoints under simulated DB latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--latency-ms', type=float, default=50.0, help='Delay added to every query')
+        parser.add_argument('--requests', type=int, default=100, help='Requests per endpoint and server')
+        parser.add_argument('--concurrency', type=int, default=25, help='In-flight requests for ASGI')
+        parser.add_argument('--wsgi-threads', type=int, default=1, help='Worker threads for WSGI')
+
+    def handle(self, *args, **options):
+        company = Company.objects.order_by('id').first()
+        if company is None:
+            raise CommandError('No data to benchmark, run `manage.py seed_data` first')
+
+        self.install_latency(options['latency_ms'] / 1000)
+        paths = ['/api/async/health/', '/api/async/posts/?limit=20',
+                 f'/api/async/companies/{company.id}/experiences/?limit=20']
+
+        self.stdout.write(f"{'endpoint':<48} {'server':<6} {'wall s':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        for path in paths:
+            wsgi = self.run_wsgi(path, options['requests'], options['wsgi_threads'])
+            asgi = asyncio.run(self.run_asgi(path, options['requests'], options['concurrency']))
+            for server, (wall, latencies) in (('wsgi', wsgi), ('asgi', asgi)):
+                ordered = sorted(latencies)
+                self.stdout.write(
+                    f"{path:<48} {server:<6} {wall:>8.2f} {len(latencies) / wall:>8.1f} "
+                    f"{statistics.median(ordered):>9.1f} {ordered[int(len(ordered) * 0.95) - 1]:>9.1f}"
+                )
+
+    def install_latency(self, seconds):
+        """Delay every statement on every (per-thread) database connection"""
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def add_wrapper(sender, connection, **kwargs):
+            # Connections are reopened per request; add the delay only once
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        connection_created.connect(add_wrapper, weak=False)
+        connections.close_all()
+
+    def run_wsgi(self, path, total, threads):
+        handler = WSGIHandler()
+
+        def call(_):
+            route, _, query = path.partition('?')
+            environ = {'PATH_INFO': route, 'QUERY_STRING': query, 'HTTP_HOST': 'localhost',
+                       'REQUEST_METHOD': 'GET', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr}
+            setup_testing_defaults(environ)
+            start = time.perf_counter()
+            body = b''.join(handler(environ, lambda status, headers, exc_info=None: None))
+            assert body
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(call, range(total)))
+        return time.perf_counter() - start, latencies
+
+    async def run_asgi(self, path, total, concurrency):
+        handler = ASGIHandler()
+        semaphore = asyncio.Semaphore(concurrency)
+        route, _, query = path.partition('?')
+
+        async def call():
+            scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                     'method': 'GET', 'scheme': 'http', 'path': route, 'raw_path': route.encode(),
+                     'query_string': query.encode(), 'root_path': '',
+                     'headers': [(b'host', b'localhost')], 'server': ('localhost', 80),
+                     'client': ('127.0.0.1', 50000)}
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                pass
+
+            async with semaphore:
+                start = time.perf_counter()
+                await handler(scope, receive, send)
+                return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(call() for _ in range(total)))
+        return time.perf_counter() - start, list(latencies)
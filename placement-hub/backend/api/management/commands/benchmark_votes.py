@@ -0,0 +1,102 @@
+"""
+Measure vote throughput on a single hot post with and without
+VOTE_WRITE_BEHIND.
+
+--threads workers each cast --votes votes through the vote endpoint against
+the same post, so every immediate-mode vote competes for the same row. In
+write-behind mode the counters are buffered in the cache and flushed once at
+the end, and the flushed totals are checked against the immediate-mode
+result.
+
+    DATABASE_URL=sqlite:///bench.sqlite3 python manage.py benchmark_votes --threads 8
+"""
+
+import contextlib
+import io
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from api.models import Post, PostVote, Task, UserProfile
+from api.tasks import run_pending
+from api.votes import discard_buffered_votes
+
+from .benchmark_api import bearer_token, percentile, unthrottled
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent votes on one post, immediate vs write-behind counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent voters')
+        parser.add_argument('--votes', type=int, default=50, help='Votes cast per voter')
+
+    def handle(self, *args, **options):
+        post = Post.objects.order_by('id').first()
+        voters = list(UserProfile.objects.order_by('id')[:options['threads']])
+        if post is None or len(voters) < options['threads']:
+            raise CommandError('Not enough data to benchmark, run `manage.py seed_data` first')
+
+        self.stdout.write(f"{'mode':<13} {'votes':>6} {'wall s':>8} {'votes/s':>9} "
+                          f"{'p50 ms':>9} {'p95 ms':>9} {'up':>6} {'down':>6}")
+        for mode, write_behind in (('immediate', False), ('write-behind', True)):
+            with override_settings(VOTE_WRITE_BEHIND=write_behind), unthrottled():
+                self.reset(post, voters)
+                wall, latencies = self.run(post, voters, options['votes'])
+                if write_behind:
+                    Task.objects.filter(name='flush_post_votes').update(run_after=timezone.now())
+                    run_pending()
+            post.refresh_from_db()
+            self.check_counts(post)
+            self.stdout.write(
+                f"{mode:<13} {len(latencies):>6} {wall:>8.2f} {len(latencies) / wall:>9.1f} "
+                f"{statistics.median(latencies):>9.2f} {percentile(latencies, 95):>9.2f} "
+                f"{post.upvotes:>6} {post.downvotes:>6}"
+            )
+
+    def reset(self, post, voters):
+        PostVote.objects.filter(post=post, user__in=voters).delete()
+        Task.objects.filter(name='flush_post_votes').delete()
+        # Only this post's buffers; the counters cache may be the live shared one
+        discard_buffered_votes(post.id)
+        up = PostVote.objects.filter(post=post, vote=1).count()
+        down = PostVote.objects.filter(post=post, vote=-1).count()
+        Post.objects.filter(pk=post.pk).update(upvotes=up, downvotes=down)
+
+    def run(self, post, voters, votes_each):
+        path = f'/api/posts/{post.id}/vote/'
+
+        def cast(voter):
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=bearer_token(voter))
+            timings = []
+            try:
+                # Alternate up and down so every vote changes the counters
+                for i in range(votes_each):
+                    start = time.perf_counter()
+                    response = client.post(path, json.dumps({'vote': 1 if i % 2 == 0 else -1}),
+                                           content_type='application/json')
+                    timings.append((time.perf_counter() - start) * 1000)
+                    if response.status_code != 200:
+                        raise CommandError(f'Vote failed with {response.status_code}')
+            finally:
+                connection.close()
+            return timings
+
+        start = time.perf_counter()
+        # Authentication still prints debug output; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=len(voters)) as pool:
+            results = list(pool.map(cast, voters))
+        return time.perf_counter() - start, [t for timings in results for t in timings]
+
+    def check_counts(self, post):
+        up = PostVote.objects.filter(post=post, vote=1).count()
+        down = PostVote.objects.filter(post=post, vote=-1).count()
+        if (post.upvotes, post.downvotes) != (up, down):
+            self.stdout.write(self.style.ERROR(
+                f'Counters drifted: stored {post.upvotes}/{post.downvotes}, votes {up}/{down}'))
@@ -0,0 +1,64 @@
+"""
+Measure bytes-on-wire and CPU cost of response compression per payload size
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.middleware import brotli, compress_body
+
+
+def synthetic_posts(count):
+    """Build a list payload shaped like the /api/posts/ response"""
+    return [{
+        'id': i,
+        'subject': i % 40,
+        'subject_name': f'Subject {i % 40}',
+        'posted_by': i % 300,
+        'posted_by_name': f'Student {i % 300}',
+        'posted_by_uid': f'5b1c{i:08d}-aaaa-bbbb-cccc-0000{i % 300:08d}',
+        'post_type': ['question', 'notes', 'tip', 'resource'][i % 4],
+        'topic': f'Important topic number {i} for placements',
+        'notes_link': f'https://drive.google.com/file/d/{i:012d}/view',
+        'video_link': None,
+        'focus_points': 'Revise definitions, practice previous year questions, time complexity. ' * 3,
+        'upvotes': i % 17,
+        'downvotes': i % 5,
+        'net_score': i % 17 - i % 5,
+        'user_vote': None,
+        'created_at': '2025-08-21T15:08:00.000000Z',
+        'updated_at': '2025-08-21T15:08:00.000000Z',
+    } for i in range(count)]
+
+
+class Command(BaseCommand):
+    help = 'Report compressed size and CPU time for gzip/Brotli across payload sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1,10,100,1000,5000',
+                            help='Comma separated number of list items per payload')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Compressions per measurement')
+
+    def handle(self, *args, **options):
+        encodings = ['gzip'] + (['br'] if brotli is not None else [])
+        if brotli is None:
+            self.stdout.write('brotli not installed, reporting gzip only')
+
+        header = f"{'items':>7} {'raw bytes':>11} {'enc':>5} {'wire bytes':>11} {'ratio':>7} {'cpu ms':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for size in [int(s) for s in options['sizes'].split(',') if s.strip()]:
+            body = json.dumps(synthetic_posts(size)).encode()
+            for encoding in encodings:
+                start = time.process_time()
+                for _ in range(options['repeat']):
+                    compressed = compress_body(body, encoding)
+                cpu_ms = (time.process_time() - start) * 1000 / options['repeat']
+                self.stdout.write(
+                    f"{size:>7} {len(body):>11} {encoding:>5} {len(compressed):>11} "
+                    f"{len(compressed) / len(body):>7.3f} {cpu_ms:>9.3f}"
+                )
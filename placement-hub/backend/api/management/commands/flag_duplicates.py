@@ -0,0 +1,29 @@
+"""
+Rebuild the duplicate detection index and flag historical duplicates.
+Every post and interview experience that repeats an older one (same
+normalized link, or near-identical text) gets duplicate_of pointed at the
+original and is left out of lists. New content is checked when it is
+created; run this after bulk imports or when the detection rules change.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.duplicates import KIND_POST, KIND_EXPERIENCE, flag_duplicates
+
+
+class Command(BaseCommand):
+    help = 'Index fingerprints and flag duplicate posts and interview experiences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=[KIND_POST, KIND_EXPERIENCE], help='Process a single kind')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk write')
+
+    def handle(self, *args, **options):
+        kinds = [options['only']] if options['only'] else [KIND_POST, KIND_EXPERIENCE]
+        for kind in kinds:
+            start = time.perf_counter()
+            indexed, flagged = flag_duplicates(kind, batch_size=options['batch_size'])
+            self.stdout.write(f'{kind}: {indexed} indexed, {flagged} flagged as duplicates '
+                              f'in {time.perf_counter() - start:.2f}s')
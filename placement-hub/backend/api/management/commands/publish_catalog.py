@@ -0,0 +1,28 @@
+"""
+Publish the static catalog snapshot of branches, subjects and companies
+into the catalog storage (see api.catalog). Changes made through the models
+are republished by the `publish_catalog` task; run this after deploying a
+fresh storage and after bulk imports.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.catalog import catalog_enabled, publish_catalog
+
+
+class Command(BaseCommand):
+    help = 'Render the branch/subject/company catalog into a content-hashed JSON file in the catalog storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=None, help='Catalog versions to keep (CATALOG_KEEP_VERSIONS)')
+
+    def handle(self, *args, **options):
+        if not catalog_enabled():
+            raise CommandError('No catalog storage configured: set SUPABASE_SERVICE_ROLE_KEY')
+        start = time.perf_counter()
+        pointer, created = publish_catalog(keep=options['keep'])
+        state = 'published' if created else 'unchanged'
+        self.stdout.write(f"Catalog {pointer['version']} {state} at {pointer['url']} "
+                          f'in {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,23 @@
+"""
+Rebuild the precomputed home feeds from all posts and interview
+experiences. New content is fanned out to the feeds as it is created; run
+this after bulk imports or if the feeds are ever suspected to have drifted.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.feed import rebuild_feeds
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the branch, common and senior home feed entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Items fanned out per bulk insert')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = rebuild_feeds(batch_size=options['batch_size'])
+        self.stdout.write(f'Home feeds: {written} entries rebuilt in {time.perf_counter() - start:.2f}s')
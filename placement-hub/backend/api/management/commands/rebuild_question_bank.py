@@ -0,0 +1,24 @@
+"""
+Rebuild the company question bank from all interview experiences.
+Incremental updates keep it current; run this after bulk imports or when
+the question splitting/normalization rules change.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.questions import rebuild_question_bank
+
+
+class Command(BaseCommand):
+    help = 'Rebuild deduplicated interview questions and per-company frequencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Experiences indexed per transaction')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        questions, links, frequencies = rebuild_question_bank(batch_size=options['batch_size'])
+        self.stdout.write(f'Question bank: {questions} question(s), {links} link(s), '
+                          f'{frequencies} company frequency row(s) rebuilt in {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,25 @@
+"""
+Recompute the stored TF-IDF vectors, document frequencies and related posts
+of every post. New and edited posts are indexed incrementally by the task
+queue; run this periodically (e.g. nightly) to correct IDF drift and stale
+entries.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.related import RELATED_POSTS_PER_POST, rebuild_related_posts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild precomputed related posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=RELATED_POSTS_PER_POST, help='Related posts kept per post')
+        parser.add_argument('--batch-size', type=int, default=500, help='Posts written per transaction')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = rebuild_related_posts(k=options['k'], batch_size=options['batch_size'])
+        self.stdout.write(f'Related posts: {written} row(s) rebuilt in {time.perf_counter() - start:.2f}s')
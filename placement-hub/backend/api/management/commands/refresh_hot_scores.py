@@ -0,0 +1,27 @@
+"""
+Periodic batch job recomputing the stored hot scores of posts and
+interview experiences (see api.ranking). Run it from cron, e.g. every
+15 minutes, and after bulk imports such as `seed_data`.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.ranking import RANKED_MODELS, refresh_hot_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute hot ranking scores for posts and interview experiences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=sorted(RANKED_MODELS), help='Refresh a single kind')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk update')
+
+    def handle(self, *args, **options):
+        for name, model in RANKED_MODELS.items():
+            if options['only'] and options['only'] != name:
+                continue
+            start = time.perf_counter()
+            updated = refresh_hot_scores(model, batch_size=options['batch_size'])
+            self.stdout.write(f'{name}: {updated} score(s) updated in {time.perf_counter() - start:.2f}s')
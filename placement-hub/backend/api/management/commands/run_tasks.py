@@ -0,0 +1,43 @@
+"""
+Worker for the database-backed task queue in api.tasks
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from api.tasks import FINISHED_TASK_RETENTION_DAYS, run_pending, purge_finished
+
+
+class Command(BaseCommand):
+    help = 'Process queued background tasks (points awards, derived data refreshes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process due tasks once and exit')
+        parser.add_argument('--batch-size', type=int, default=100, help='Tasks claimed per iteration')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when idle')
+        parser.add_argument('--purge-days', type=int, default=FINISHED_TASK_RETENTION_DAYS, help='Delete done tasks older than this')
+
+    def handle(self, *args, **options):
+        purged = purge_finished(timezone.now() - timedelta(days=options['purge_days']))
+        if purged:
+            self.stdout.write(f'Purged {purged} finished task(s)')
+
+        while True:
+            close_old_connections()
+            processed = run_pending(limit=options['batch_size'])
+            if processed:
+                self.stdout.write(f'Processed {processed} task(s)')
+            if options['once']:
+                # Drain everything that is currently due
+                if processed < options['batch_size']:
+                    break
+                continue
+            if processed < options['batch_size']:
+                try:
+                    time.sleep(options['sleep'])
+                except KeyboardInterrupt:
+                    break
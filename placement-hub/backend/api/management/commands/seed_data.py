@@ -0,0 +1,199 @@
+"""
+Seed a realistic synthetic dataset for load testing and benchmarks
+"""
+
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import (
+    Branch, UserProfile, Subject, Post, PostVote, Company,
+    InterviewExperience, ExperienceVote
+)
+from api.ranking import hot_score
+from api.rounds import parse_rounds
+from api.catalog import schedule_catalog_publish
+from api.duplicates import KIND_EXPERIENCE, KIND_POST, flag_duplicates
+from api.feed import rebuild_feeds
+from api.questions import rebuild_question_bank
+from api.related import rebuild_related_posts
+from api.stats import rebuild_company_stats
+
+
+SEED_UID_PREFIX = 'seed-'
+ROUND_TITLES = ['Aptitude test', 'Group discussion', 'Coding round', 'Technical interview',
+                'Managerial round', 'HR interview']
+
+BRANCHES = ['CSE', 'ECE', 'EEE', 'ME', 'CE', 'IT', 'AEI', 'ARCH']
+COMMON_SUBJECTS = ['Aptitude', 'Coding', 'Verbal Ability', 'Logical Reasoning', 'HR Preparation']
+BRANCH_SUBJECTS = [
+    'Data Structures', 'Algorithms', 'Operating Systems', 'Computer Networks', 'DBMS',
+    'Digital Electronics', 'Signals and Systems', 'Control Systems', 'Thermodynamics',
+    'Fluid Mechanics', 'Structural Analysis', 'Machine Design',
+]
+POSITIONS = ['Software Engineer', 'SDE Intern', 'Data Analyst', 'Graduate Engineer Trainee',
+             'Systems Engineer', 'Design Engineer', 'Associate Consultant']
+TOPIC_WORDS = ['arrays', 'graphs', 'dynamic programming', 'recursion', 'scheduling', 'paging',
+               'normalization', 'joins', 'TCP', 'routing', 'flip flops', 'op-amps', 'PID',
+               'beams', 'trusses', 'entropy', 'percentages', 'probability', 'puzzles']
+
+
+class Command(BaseCommand):
+    help = 'Seed synthetic users, subjects, posts, experiences and votes using bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=3000)
+        parser.add_argument('--companies', type=int, default=150)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--experiences', type=int, default=5000)
+        parser.add_argument('--votes-per-post', type=float, default=3.0,
+                            help='Average number of votes per post')
+        parser.add_argument('--votes-per-experience', type=float, default=10.0,
+                            help='Average number of votes per experience')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for repeatable data')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete previously seeded users (and their content) first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        if options['clear']:
+            deleted, _ = UserProfile.objects.filter(supabase_uid__startswith=SEED_UID_PREFIX).delete()
+            self.stdout.write(f'Deleted {deleted} previously seeded rows')
+
+        branches = self.seed_branches()
+        subjects = self.seed_subjects(branches)
+        companies = self.seed_companies(options['companies'])
+        user_ids = self.seed_users(options['users'], branches)
+        self.seed_posts(options['posts'], subjects, user_ids, options['votes_per_post'])
+        self.seed_experiences(options['experiences'], companies, user_ids,
+                              options['votes_per_experience'])
+        # bulk_create skips the signals that maintain company stats, the question bank, duplicate
+        # fingerprints, the feeds, related posts and the catalog snapshot (published by the task
+        # queue rather than written from here)
+        rebuild_company_stats()
+        rebuild_question_bank()
+        for kind in (KIND_POST, KIND_EXPERIENCE):
+            flag_duplicates(kind)
+        rebuild_feeds()
+        rebuild_related_posts()
+        schedule_catalog_publish()
+        self.stdout.write(self.style.SUCCESS('Seeding complete'))
+
+    def bulk_create(self, model, objects):
+        """bulk_create in batches and return the ids of the new rows in insertion order"""
+        last_id = model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        with transaction.atomic():
+            for start in range(0, len(objects), self.batch_size):
+                model.objects.bulk_create(objects[start:start + self.batch_size])
+        return list(model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True))
+
+    def sample_voters(self, user_ids, average):
+        """Pick a skewed number of distinct voters: most rows get few votes, a few go viral"""
+        count = min(int(self.rng.expovariate(1 / average)) if average > 0 else 0, len(user_ids))
+        return self.rng.sample(user_ids, count)
+
+    def seed_branches(self):
+        existing = set(Branch.objects.values_list('name', flat=True))
+        Branch.objects.bulk_create([Branch(name=name) for name in BRANCHES if name not in existing])
+        return list(Branch.objects.filter(name__in=BRANCHES).values_list('id', flat=True))
+
+    def seed_subjects(self, branch_ids):
+        existing = set(Subject.objects.values_list('name', 'branch_id'))
+        subjects = [Subject(name=name, is_common=True) for name in COMMON_SUBJECTS
+                    if (name, None) not in existing]
+        subjects += [Subject(name=name, branch_id=branch_id) for branch_id in branch_ids
+                     for name in BRANCH_SUBJECTS if (name, branch_id) not in existing]
+        Subject.objects.bulk_create(subjects)
+        ids = list(Subject.objects.values_list('id', flat=True))
+        self.stdout.write(f'Subjects: {len(ids)}')
+        return ids
+
+    def seed_companies(self, count):
+        existing = set(Company.objects.values_list('name', flat=True))
+        tiers = ['tier1', 'tier2', 'tier3', 'startup', 'mnc']
+        companies = [Company(name=f'Company {i:04d}', tier=self.rng.choice(tiers),
+                             salary_range=f'{self.rng.randint(3, 12)}-{self.rng.randint(13, 40)} LPA')
+                     for i in range(count) if f'Company {i:04d}' not in existing]
+        Company.objects.bulk_create(companies)
+        ids = list(Company.objects.values_list('id', flat=True))
+        self.stdout.write(f'Companies: {len(ids)}')
+        return ids
+
+    def seed_users(self, count, branch_ids):
+        offset = UserProfile.objects.filter(supabase_uid__startswith=SEED_UID_PREFIX).count()
+        users = [UserProfile(
+            supabase_uid=f'{SEED_UID_PREFIX}{i:07d}',
+            email=f'seed{i}@cet.ac.in',
+            full_name=f'Seed Student {i}',
+            branch_id=self.rng.choice(branch_ids),
+            year=self.rng.randint(1, 5),
+        ) for i in range(offset, offset + count)]
+        ids = self.bulk_create(UserProfile, users)
+        self.stdout.write(f'Users: {len(ids)} created')
+        return ids
+
+    def seed_posts(self, count, subject_ids, user_ids, votes_per_post):
+        post_types = [choice for choice, _ in Post.POST_TYPE_CHOICES]
+        posts, votes = [], []
+        # bulk_create skips the pre_save signal, so hot scores are set here
+        now = timezone.now()
+        for i in range(count):
+            post_votes = [(user_id, 1 if self.rng.random() < 0.8 else -1)
+                          for user_id in self.sample_voters(user_ids, votes_per_post)]
+            net = sum(value for _, value in post_votes)
+            posts.append(Post(
+                subject_id=self.rng.choice(subject_ids),
+                posted_by_id=self.rng.choice(user_ids),
+                post_type=self.rng.choice(post_types),
+                topic=f'{self.rng.choice(TOPIC_WORDS).title()} notes #{i}',
+                notes_link=f'https://drive.google.com/file/d/seed{i}/view' if i % 2 else None,
+                focus_points=', '.join(self.rng.sample(TOPIC_WORDS, 4)),
+                upvotes=sum(1 for _, v in post_votes if v == 1),
+                downvotes=sum(1 for _, v in post_votes if v == -1),
+                hot_score=hot_score(net, now),
+            ))
+            votes.append(post_votes)
+
+        post_ids = self.bulk_create(Post, posts)
+        vote_rows = [PostVote(user_id=user_id, post_id=post_id, vote=value)
+                     for post_id, post_votes in zip(post_ids, votes)
+                     for user_id, value in post_votes]
+        self.bulk_create(PostVote, vote_rows)
+        self.stdout.write(f'Posts: {len(post_ids)} created with {len(vote_rows)} votes')
+
+    def seed_experiences(self, count, company_ids, user_ids, votes_per_experience):
+        experiences, votes = [], []
+        today = date.today()
+        now = timezone.now()
+        for i in range(count):
+            experience_votes = [(user_id, self.rng.random() < 0.9)
+                                for user_id in self.sample_voters(user_ids, votes_per_experience)]
+            upvotes = sum(1 for _, up in experience_votes if up)
+            experiences.append(InterviewExperience(
+                company_id=self.rng.choice(company_ids),
+                posted_by_id=self.rng.choice(user_ids),
+                position=self.rng.choice(POSITIONS),
+                interview_date=today - timedelta(days=self.rng.randint(0, 730)),
+                rounds=parse_rounds('\n'.join(
+                    title for title in ROUND_TITLES if self.rng.random() < 0.6) or 'HR interview'),
+                questions='\n'.join(f'Explain {word}?' for word in self.rng.sample(TOPIC_WORDS, 5)),
+                tips='Practice previous year questions.',
+                difficulty_level=self.rng.randint(1, 3),
+                result=self.rng.choice(['selected', 'rejected', 'pending']),
+                upvotes=upvotes,
+                hot_score=hot_score(upvotes, now),
+            ))
+            votes.append(experience_votes)
+
+        experience_ids = self.bulk_create(InterviewExperience, experiences)
+        vote_rows = [ExperienceVote(user_id=user_id, experience_id=experience_id, is_upvote=up)
+                     for experience_id, experience_votes in zip(experience_ids, votes)
+                     for user_id, up in experience_votes]
+        self.bulk_create(ExperienceVote, vote_rows)
+        self.stdout.write(f'Experiences: {len(experience_ids)} created with {len(vote_rows)} votes')
@@ -0,0 +1,47 @@
+"""
+Copy a local SQLite primary database onto its SQLite replicas.
+
+Real replicas are kept in sync by the database server; this stands in for
+replication when trying the read replica router (api.routers) locally with
+two SQLite files. Run it after migrating or seeding the primary, and again
+whenever the replicas should catch up: until then they serve stale data,
+which is exactly what the primary pinning after writes is for.
+"""
+
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+SQLITE_ENGINE = 'django.db.backends.sqlite3'
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary database onto every SQLite replica'
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if primary['ENGINE'] != SQLITE_ENGINE:
+            raise CommandError('The primary database is not SQLite; replication is up to the database server')
+        replicas = [alias for alias in settings.DATABASE_REPLICAS
+                    if settings.DATABASES[alias]['ENGINE'] == SQLITE_ENGINE]
+        if not replicas:
+            raise CommandError('No SQLite replicas configured (set DATABASE_REPLICA_URLS)')
+
+        source = sqlite3.connect(primary['NAME'])
+        try:
+            for alias in replicas:
+                start = time.perf_counter()
+                # Drop Django's open handle so the copy isn't fighting a lock
+                connections[alias].close()
+                target = sqlite3.connect(settings.DATABASES[alias]['NAME'])
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f'{alias}: copied from {primary["NAME"]} in {time.perf_counter() - start:.2f}s')
+        finally:
+            source.close()
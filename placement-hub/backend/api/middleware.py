@@ -0,0 +1,188 @@
+"""
+Custom middleware for the placement hub API
+"""
+
+import gzip
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import routers
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = re.compile(r'^(text/|application/(json|javascript|xml))')
+
+
+def compress_body(body, encoding):
+    """Compress raw bytes with the given content encoding ('br' or 'gzip')"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+    # mtime=0 keeps the output deterministic so identical bodies compress identically
+    return gzip.compress(body, compresslevel=getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), mtime=0)
+
+
+def parse_accept_encoding(header):
+    """Return a {coding: q} mapping from an Accept-Encoding header"""
+    codings = {}
+    for part in header.split(','):
+        pieces = part.strip().split(';')
+        coding = pieces[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header):
+    """Pick the best supported encoding for an Accept-Encoding header, or None"""
+    codings = parse_accept_encoding(header or '')
+    wildcard = codings.get('*', 0.0)
+    candidates = []
+    if brotli is not None:
+        candidates.append('br')
+    candidates.append('gzip')
+
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressedBodyCache:
+    """Small thread-safe LRU of compressed bodies keyed by content hash"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+compressed_body_cache = CompressedBodyCache(getattr(settings, 'COMPRESSION_CACHE_SIZE', 256))
+
+
+def is_cacheable_response(response):
+    """True when the response is marked as reusable, so its compressed body is worth keeping"""
+    if response.has_header('ETag'):
+        return True
+    cache_control = response.get('Cache-Control', '').lower()
+    if not cache_control or 'no-store' in cache_control or 'private' in cache_control:
+        return False
+    return 'public' in cache_control or 'max-age' in cache_control
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with Brotli (when installed) or gzip.
+
+    Responses smaller than COMPRESSION_MIN_SIZE, streaming responses, already
+    encoded responses and non-text content types are passed through untouched.
+    Compressed bodies of cacheable responses are kept in a small LRU so hot,
+    repeated payloads are only compressed once per process.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+            return response
+        if 'no-transform' in response.get('Cache-Control', '').lower():
+            return response
+
+        # Even uncompressed bodies vary by Accept-Encoding for shared caches
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        body = response.content
+        if len(body) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        cacheable = (
+            is_cacheable_response(response)
+            and len(body) <= getattr(settings, 'COMPRESSION_CACHE_MAX_BODY', 512 * 1024)
+        )
+        cache_key = None
+        compressed = None
+        if cacheable:
+            cache_key = (encoding, hashlib.sha1(body).hexdigest())
+            compressed = compressed_body_cache.get(cache_key)
+
+        if compressed is None:
+            compressed = compress_body(body, encoding)
+            if cache_key is not None:
+                compressed_body_cache.set(cache_key, compressed)
+
+        # Don't bother if compression didn't actually help
+        if len(compressed) >= len(body):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+
+        # The compressed representation is no longer byte-identical to the original
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Route the reads of safe API requests to a read replica (see api.routers),
+    and pin clients to the primary for a while after they write.
+    """
+
+    def process_request(self, request):
+        routers.use_read_alias(routers.choose_read_alias(request))
+
+    def process_response(self, request, response):
+        # Worker threads are reused, so never let the choice outlive the request
+        routers.use_read_alias(None)
+        if (routers.replica_aliases() and request.method not in routers.SAFE_METHODS
+                and response.status_code < 400):
+            routers.pin_to_primary(request)
+        return response
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:36
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+
+# Frozen copy of api.ranking.hot_score at the time of this migration
+HOT_SCORE_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def hot_score(net_score, created_at):
+    order = math.log10(max(abs(net_score), 1))
+    sign = 1 if net_score > 0 else -1 if net_score < 0 else 0
+    return round(sign * order + (created_at - HOT_SCORE_EPOCH).total_seconds() / 45000, 7)
+
+
+def backfill_hot_scores(apps, schema_editor):
+    for model_name, has_downvotes in (('Post', True), ('InterviewExperience', False)):
+        model = apps.get_model('api', model_name)
+        batch = []
+        for row in model.objects.order_by('id').iterator(chunk_size=1000):
+            row.hot_score = hot_score(row.upvotes - (row.downvotes if has_downvotes else 0), row.created_at)
+            batch.append(row)
+            if len(batch) == 1000:
+                model.objects.bulk_update(batch, ['hot_score'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewexperience',
+            name='hot_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='interviewexperience',
+            index=models.Index(fields=['-hot_score'], name='experience_hot_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewexperience',
+            index=models.Index(fields=['company', '-hot_score'], name='experience_company_hot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-hot_score'], name='post_hot_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['subject', '-hot_score'], name='post_subject_hot_score_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_company_stats(apps, schema_editor):
+    InterviewExperience = apps.get_model('api', 'InterviewExperience')
+    CompanyStats = apps.get_model('api', 'CompanyStats')
+    stats = {}
+    rows = InterviewExperience.objects.order_by('company_id', '-created_at', '-id').values_list(
+        'company_id', 'result', 'difficulty_level', 'position')
+    for company_id, result, difficulty, position in rows.iterator(chunk_size=2000):
+        row = stats.setdefault(company_id, CompanyStats(company_id=company_id, recent_positions=[]))
+        row.experience_count += 1
+        row.difficulty_total += difficulty
+        if result in ('selected', 'rejected', 'pending'):
+            setattr(row, f'{result}_count', getattr(row, f'{result}_count') + 1)
+        if len(row.recent_positions) < 5 and position not in row.recent_positions:
+            row.recent_positions.append(position)
+    CompanyStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_hot_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyStats',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.company')),
+                ('experience_count', models.IntegerField(default=0)),
+                ('selected_count', models.IntegerField(default=0)),
+                ('rejected_count', models.IntegerField(default=0)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('difficulty_total', models.IntegerField(default=0)),
+                ('recent_positions', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Company stats',
+            },
+        ),
+        migrations.RunPython(build_company_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,116 @@
+"""
+Step 1 of moving Subject.branch and UserProfile.branch from free text to
+foreign keys on Branch: add nullable branch_fk columns and backfill them.
+
+The migration is non-atomic and backfills in small primary key ranges, each
+committed on its own, so no table is locked for the whole copy. Branch
+names that don't exist yet are created as inactive branches for an admin
+to review; blank values become NULL.
+
+Branch names are matched ignoring case and surrounding spaces, so subjects
+that only differed in how their branch was spelled ("CSE" and "cse ") can
+end up with the same name and branch. 0012 makes (name, branch) unique, so
+each such group is merged into its oldest subject: posts are moved over and
+the other subjects are deleted. Merging can't be undone on reverse.
+"""
+
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+
+BATCH_SIZE = 1000
+
+MODELS = ('Subject', 'UserProfile')
+
+
+def branch_ids_by_name(apps):
+    Branch = apps.get_model('api', 'Branch')
+    names = set()
+    for model_name in MODELS:
+        model = apps.get_model('api', model_name)
+        names.update(name.strip() for name in
+                     model.objects.exclude(branch__isnull=True).values_list('branch', flat=True).distinct())
+    names.discard('')
+
+    by_name = {branch.name.lower(): branch.id for branch in Branch.objects.all()}
+    missing = sorted(name for name in names if name.lower() not in by_name)
+    for name in missing:
+        branch = Branch.objects.create(name=name, is_active=False,
+                                       description='Created from existing data during migration')
+        by_name[name.lower()] = branch.id
+    return by_name
+
+
+def backfill_branch_fk(apps, schema_editor):
+    by_name = branch_ids_by_name(apps)
+    for model_name in MODELS:
+        model = apps.get_model('api', model_name)
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                rows = list(model.objects.filter(id__gt=last_id, branch_fk__isnull=True)
+                            .exclude(branch__isnull=True).order_by('id')
+                            .values_list('id', 'branch')[:BATCH_SIZE])
+                if not rows:
+                    break
+                by_branch = {}
+                for row_id, name in rows:
+                    branch_id = by_name.get((name or '').strip().lower())
+                    if branch_id is not None:
+                        by_branch.setdefault(branch_id, []).append(row_id)
+                for branch_id, ids in by_branch.items():
+                    model.objects.filter(id__in=ids).update(branch_fk_id=branch_id)
+                last_id = rows[-1][0]
+
+
+def merge_duplicate_subjects(apps, schema_editor):
+    Subject = apps.get_model('api', 'Subject')
+    Post = apps.get_model('api', 'Post')
+    groups = (Subject.objects.exclude(branch_fk__isnull=True).values('name', 'branch_fk')
+              .annotate(count=models.Count('id'), keep=models.Min('id')).filter(count__gt=1))
+    for group in list(groups):
+        with transaction.atomic():
+            keep = Subject.objects.get(id=group['keep'])
+            merged = list(Subject.objects.filter(name=group['name'], branch_fk=group['branch_fk'])
+                          .exclude(id=keep.id).order_by('id'))
+            Post.objects.filter(subject__in=merged).update(subject=keep)
+            if not keep.description:
+                keep.description = next((subject.description for subject in merged if subject.description), '')
+            keep.is_common = keep.is_common or any(subject.is_common for subject in merged)
+            keep.save(update_fields=['description', 'is_common'])
+            Subject.objects.filter(id__in=[subject.id for subject in merged]).delete()
+        print(f"\n  Merged subjects {[subject.id for subject in merged]} into {keep.id} "
+              f"({keep.name!r}, branch {group['branch_fk']})", end='')
+
+
+def restore_branch_names(apps, schema_editor):
+    for model_name in MODELS:
+        model = apps.get_model('api', model_name)
+        for branch_id, name in apps.get_model('api', 'Branch').objects.values_list('id', 'name'):
+            model.objects.filter(branch_fk_id=branch_id).update(branch=name)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0010_company_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='branch_fk',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name='+', to='api.branch'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='branch_fk',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name='+', to='api.branch'),
+        ),
+        migrations.RunPython(backfill_branch_fk, restore_branch_names),
+        migrations.RunPython(merge_duplicate_subjects, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+"""
+Step 2: drop the free-text branch columns and rename branch_fk to branch,
+so the API and ORM keep using `branch` (now backed by the branch_id column).
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_branch_foreign_keys'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='subject',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='subject',
+            name='branch',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='branch',
+        ),
+        migrations.RenameField(
+            model_name='subject',
+            old_name='branch_fk',
+            new_name='branch',
+        ),
+        migrations.RenameField(
+            model_name='userprofile',
+            old_name='branch_fk',
+            new_name='branch',
+        ),
+        migrations.AlterField(
+            model_name='subject',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name='subjects', to='api.branch'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                                    related_name='students', to='api.branch'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subject',
+            unique_together={('name', 'branch')},
+        ),
+    ]
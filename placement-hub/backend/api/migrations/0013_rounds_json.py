@@ -0,0 +1,162 @@
+"""
+Step 1 of storing InterviewExperience.rounds as structured JSON: add a
+rounds_json column and parse the existing free text into it.
+
+Like 0011 this is non-atomic and works through 500-row primary key ranges,
+each committed separately, so the table is never locked for the whole copy.
+"""
+
+import json
+import re
+
+from django.core.exceptions import ValidationError
+from django.db import migrations, models, transaction
+
+
+BATCH_SIZE = 500
+
+
+# Frozen copy of api.rounds.parse_rounds and rounds_as_text at the time of this migration
+ROUND_TYPES = {
+    'coding': ['coding', 'programming', 'dsa', 'hackerrank', 'hackerearth', 'leetcode', 'codility'],
+    'aptitude': ['aptitude', 'online test', 'online assessment', 'oa', 'quant', 'quantitative',
+                 'reasoning', 'written test', 'mcq'],
+    'group_discussion': ['group discussion', 'gd'],
+    'technical': ['technical', 'tech', 'system design', 'core'],
+    'managerial': ['managerial', 'manager', 'director'],
+    'hr': ['hr', 'human resource', 'human resources'],
+}
+OTHER = 'other'
+
+MAX_ROUNDS = 20
+MAX_TITLE_LENGTH = 200
+MAX_DESCRIPTION_LENGTH = 2000
+
+_KEYWORDS = [(round_type, re.compile(r'\b(' + '|'.join(re.escape(k) for k in keywords) + r')\b', re.I))
+             for round_type, keywords in ROUND_TYPES.items()]
+_ROUND_MARKER = re.compile(r'(?=\bround\s*\d+\s*[:\-.)])', re.I)
+_BULLET = re.compile(r'^\s*(?:[-*•]+|\d+[.)])\s*')
+
+
+def classify_round(text):
+    for round_type, pattern in _KEYWORDS:
+        if pattern.search(text):
+            return round_type
+    return OTHER
+
+
+def _split(text):
+    parts = []
+    for line in text.splitlines():
+        for chunk in line.split(';'):
+            parts.extend(_ROUND_MARKER.split(chunk))
+    cleaned = []
+    for part in parts:
+        part = _BULLET.sub('', part).strip(' ,')
+        if part:
+            cleaned.append(part)
+    return cleaned
+
+
+def _round(title, description=''):
+    title = title.strip()[:MAX_TITLE_LENGTH]
+    return {
+        'type': classify_round(f'{title} {description}'),
+        'title': title,
+        'description': description.strip()[:MAX_DESCRIPTION_LENGTH],
+    }
+
+
+def parse_rounds(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                return normalize_rounds(json.loads(text))
+            except (ValueError, ValidationError):
+                pass
+        return [_round(part) for part in _split(text)][:MAX_ROUNDS]
+    return normalize_rounds(value)
+
+
+def normalize_rounds(rounds):
+    if not isinstance(rounds, list):
+        raise ValidationError('Rounds must be a list.')
+    if len(rounds) > MAX_ROUNDS:
+        raise ValidationError(f'At most {MAX_ROUNDS} rounds are allowed.')
+
+    normalized = []
+    for item in rounds:
+        if isinstance(item, str):
+            item = {'title': item}
+        if not isinstance(item, dict) or not str(item.get('title') or '').strip():
+            raise ValidationError('Every round needs a title.')
+        round_type = item.get('type') or classify_round(f"{item['title']} {item.get('description', '')}")
+        if round_type not in ROUND_TYPES and round_type != OTHER:
+            raise ValidationError(f'Unknown round type: {round_type}.')
+        normalized.append({
+            'type': round_type,
+            'title': str(item['title']).strip()[:MAX_TITLE_LENGTH],
+            'description': str(item.get('description') or '').strip()[:MAX_DESCRIPTION_LENGTH],
+        })
+    return normalized
+
+
+def rounds_as_text(rounds):
+    if isinstance(rounds, str):
+        return rounds
+    lines = []
+    for item in rounds or []:
+        line = item.get('title', '')
+        if item.get('description'):
+            line = f"{line}: {item['description']}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def parse_existing_rounds(apps, schema_editor):
+    InterviewExperience = apps.get_model('api', 'InterviewExperience')
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(InterviewExperience.objects.filter(id__gt=last_id).order_by('id')
+                         .only('id', 'rounds')[:BATCH_SIZE])
+            if not batch:
+                break
+            for experience in batch:
+                experience.rounds_json = parse_rounds(experience.rounds)
+            InterviewExperience.objects.bulk_update(batch, ['rounds_json'])
+            last_id = batch[-1].id
+
+
+def restore_rounds_text(apps, schema_editor):
+    InterviewExperience = apps.get_model('api', 'InterviewExperience')
+    batch = []
+    for experience in InterviewExperience.objects.only('id', 'rounds_json').iterator(chunk_size=BATCH_SIZE):
+        experience.rounds = rounds_as_text(experience.rounds_json)
+        batch.append(experience)
+        if len(batch) == BATCH_SIZE:
+            InterviewExperience.objects.bulk_update(batch, ['rounds'])
+            batch = []
+    if batch:
+        InterviewExperience.objects.bulk_update(batch, ['rounds'])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0012_branch_foreign_keys_swap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewexperience',
+            name='rounds_json',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(parse_existing_rounds, restore_rounds_text),
+    ]
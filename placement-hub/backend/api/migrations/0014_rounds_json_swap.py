@@ -0,0 +1,48 @@
+"""
+Step 2: replace the text column with the parsed JSON one and, on
+PostgreSQL, index it with GIN (jsonb_path_ops) for the has_round_type
+containment lookup. SQLite answers the same lookup with JSON1 functions.
+"""
+
+import api.rounds
+from django.db import migrations, models
+
+
+GIN_INDEX = 'experience_rounds_gin_idx'
+
+
+def create_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {GIN_INDEX} ON api_interviewexperience USING gin (rounds jsonb_path_ops)'
+        )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {GIN_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_rounds_json'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='interviewexperience',
+            name='rounds',
+        ),
+        migrations.RenameField(
+            model_name='interviewexperience',
+            old_name='rounds_json',
+            new_name='rounds',
+        ),
+        migrations.AlterField(
+            model_name='interviewexperience',
+            name='rounds',
+            field=models.JSONField(blank=True, default=list, validators=[api.rounds.validate_rounds]),
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
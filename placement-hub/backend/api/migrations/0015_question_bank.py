@@ -0,0 +1,126 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:48
+
+import hashlib
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Max
+
+
+# Frozen copy of api.questions.extract_questions at the time of this migration
+MIN_QUESTION_LENGTH = 4
+MAX_QUESTION_LENGTH = 1000
+MAX_QUESTIONS_PER_EXPERIENCE = 100
+
+_BULLET = re.compile(r'^\s*(?:[-*•]+|q(?:uestion)?\s*\d*\s*[:.)\-]|\(?\d+[.):](?=\s)|\(?[a-z]\))\s*', re.I)
+_AFTER_QUESTION_MARK = re.compile(r'(?<=\?)\s+(?=\S)')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_question(text):
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = _BULLET.sub('', text)
+    return _NON_WORD.sub(' ', text).replace('_', ' ').strip()
+
+
+def split_questions(text):
+    questions = []
+    for line in (text or '').splitlines():
+        for part in _AFTER_QUESTION_MARK.split(line):
+            part = _BULLET.sub('', part).strip()
+            if not part or (part.endswith(':') and '?' not in part):
+                continue
+            questions.append(part[:MAX_QUESTION_LENGTH])
+    return questions
+
+
+def extract_questions(text):
+    entries = {}
+    for question in split_questions(text):
+        normalized = normalize_question(question)
+        if len(normalized) < MIN_QUESTION_LENGTH:
+            continue
+        entries.setdefault(hashlib.sha1(normalized.encode('utf-8')).hexdigest(), question)
+        if len(entries) >= MAX_QUESTIONS_PER_EXPERIENCE:
+            break
+    return entries
+
+
+def build_question_bank(apps, schema_editor):
+    InterviewExperience = apps.get_model('api', 'InterviewExperience')
+    Question = apps.get_model('api', 'Question')
+    ExperienceQuestion = apps.get_model('api', 'ExperienceQuestion')
+    CompanyQuestion = apps.get_model('api', 'CompanyQuestion')
+    last_id = 0
+    while True:
+        batch = list(InterviewExperience.objects.filter(id__gt=last_id).order_by('id')
+                     .values_list('id', 'questions')[:500])
+        if not batch:
+            break
+        parsed = {experience_id: extract_questions(questions) for experience_id, questions in batch}
+        entries = {digest: text for found in parsed.values() for digest, text in found.items()}
+        Question.objects.bulk_create([Question(normalized_hash=digest, text=text) for digest, text in entries.items()],
+                                     ignore_conflicts=True)
+        ids = dict(Question.objects.filter(normalized_hash__in=list(entries)).values_list('normalized_hash', 'id'))
+        ExperienceQuestion.objects.bulk_create([
+            ExperienceQuestion(experience_id=experience_id, question_id=ids[digest], position=position)
+            for experience_id, found in parsed.items()
+            for position, digest in enumerate(found)
+        ])
+        last_id = batch[-1][0]
+
+    rows = ExperienceQuestion.objects.values('experience__company_id', 'question_id').annotate(
+        times_asked=Count('experience_id'), last_asked=Max('experience__interview_date')).order_by()
+    CompanyQuestion.objects.bulk_create([
+        CompanyQuestion(company_id=row['experience__company_id'], question_id=row['question_id'],
+                        times_asked=row['times_asked'], last_asked=row['last_asked'])
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_rounds_json_swap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Question',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('normalized_hash', models.CharField(max_length=40, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExperienceQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('experience', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_links', to='api.interviewexperience')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='experience_links', to='api.question')),
+            ],
+            options={
+                'unique_together': {('experience', 'question')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('times_asked', models.IntegerField(default=0)),
+                ('last_asked', models.DateField(blank=True, null=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_frequencies', to='api.company')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='company_frequencies', to='api.question')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', '-times_asked'], name='company_question_freq_idx')],
+                'unique_together': {('company', 'question')},
+            },
+        ),
+        migrations.RunPython(build_question_bank, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_related_posts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewexperience',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='api.interviewexperience'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='api.post'),
+        ),
+        migrations.CreateModel(
+            name='FingerprintKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.IntegerField()),
+                ('key', models.CharField(max_length=40)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'key'], name='fingerprint_key_idx'), models.Index(fields=['kind', 'object_id'], name='fingerprint_object_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Post'), ('experience', 'Interview experience')], max_length=20)),
+                ('object_id', models.IntegerField()),
+                ('signature', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
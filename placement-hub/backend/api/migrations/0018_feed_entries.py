@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_duplicate_detection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed', models.CharField(max_length=32)),
+                ('created_at', models.DateTimeField()),
+                ('experience', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.interviewexperience')),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.post')),
+            ],
+            options={
+                'verbose_name_plural': 'Feed entries',
+                'indexes': [models.Index(fields=['feed', '-created_at', '-id'], name='feed_entry_page_idx')],
+            },
+        ),
+    ]
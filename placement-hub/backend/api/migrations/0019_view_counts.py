@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_feed_entries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewexperience',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='interviewexperience',
+            index=models.Index(fields=['-view_count'], name='experience_view_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-view_count'], name='post_view_count_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+"""
+Prefix indexes for the autocomplete database fallback (api.autocomplete).
+
+istartswith compiles to UPPER(column::text) LIKE UPPER('prefix%') on
+PostgreSQL, which only an expression index with text_pattern_ops can serve
+(plain indexes don't support LIKE outside the C collation). SQLite has no
+equivalent and scans, which is fine for local development.
+"""
+
+from django.db import migrations
+
+
+PREFIX_INDEXES = [
+    ('company_name_prefix_idx', 'api_company', 'name'),
+    ('subject_name_prefix_idx', 'api_subject', 'name'),
+    ('experience_position_prefix_idx', 'api_interviewexperience', 'position'),
+]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, table, column in PREFIX_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON {table} (UPPER({column}::text) text_pattern_ops)'
+            )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, _, _ in PREFIX_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_view_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
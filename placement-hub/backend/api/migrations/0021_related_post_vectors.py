@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_autocomplete_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermFrequency',
+            fields=[
+                ('term', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('documents', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Term frequencies',
+            },
+        ),
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', '-weight'], name='post_term_weight_idx')],
+                'unique_together': {('post', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+"""
+Store every feed item once: posts in their branch's feed or the common
+feed, experiences in the senior feed (see api.feed). The old layout copied
+each item into every per-branch, per-year-group feed it belonged to.
+"""
+
+from django.db import migrations, transaction
+
+
+BATCH_SIZE = 1000
+
+# Frozen feed keys of both layouts at the time of this migration
+COMMON_FEED = 'common'
+SENIOR_FEED = 'senior'
+YEAR_GROUPS = ['junior', 'senior']
+
+
+def old_feed_key(branch_id, group):
+    return f"{branch_id if branch_id is not None else 'none'}:{group}"
+
+
+def _rebuild(apps, post_feeds, experience_feeds):
+    FeedEntry = apps.get_model('api', 'FeedEntry')
+    Post = apps.get_model('api', 'Post')
+    InterviewExperience = apps.get_model('api', 'InterviewExperience')
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        posts = (Post.objects.filter(duplicate_of__isnull=True).order_by('id')
+                 .values_list('id', 'created_at', 'subject__branch_id', 'subject__is_common'))
+        batch = []
+        for post_id, created_at, branch_id, is_common in posts.iterator(chunk_size=BATCH_SIZE):
+            batch.extend(FeedEntry(feed=feed, post_id=post_id, created_at=created_at)
+                         for feed in post_feeds(branch_id, is_common))
+            if len(batch) >= BATCH_SIZE:
+                FeedEntry.objects.bulk_create(batch)
+                batch = []
+        experiences = (InterviewExperience.objects.filter(duplicate_of__isnull=True).order_by('id')
+                       .values_list('id', 'created_at'))
+        for experience_id, created_at in experiences.iterator(chunk_size=BATCH_SIZE):
+            batch.extend(FeedEntry(feed=feed, experience_id=experience_id, created_at=created_at)
+                         for feed in experience_feeds)
+            if len(batch) >= BATCH_SIZE:
+                FeedEntry.objects.bulk_create(batch)
+                batch = []
+        FeedEntry.objects.bulk_create(batch)
+
+
+def share_feeds(apps, schema_editor):
+    def post_feeds(branch_id, is_common):
+        return [COMMON_FEED if is_common or branch_id is None else f'branch:{branch_id}']
+    _rebuild(apps, post_feeds, [SENIOR_FEED])
+
+
+def fan_out_feeds(apps, schema_editor):
+    branch_ids = list(apps.get_model('api', 'Branch').objects.values_list('id', flat=True)) + [None]
+
+    def post_feeds(branch_id, is_common):
+        targets = branch_ids if is_common or branch_id is None else [branch_id]
+        return [old_feed_key(target, group) for target in targets for group in YEAR_GROUPS]
+    _rebuild(apps, post_feeds, [old_feed_key(target, 'senior') for target in branch_ids])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_related_post_vectors'),
+    ]
+
+    operations = [
+        migrations.RunPython(share_feeds, fan_out_feeds),
+    ]
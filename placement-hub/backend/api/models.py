@@ -9,6 +9,9 @@
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .rounds import validate_rounds
 
 
 class UserProfile(models.Model):
@@ -16,7 +19,7 @@ class UserProfile(models.Model):
     supabase_uid = models.CharField(max_length=255, unique=True)
     email = models.EmailField(unique=True)
     full_name = models.CharField(max_length=100)
-    branch = models.CharField(max_length=100, blank=True, null=True)  # Keep as CharField for now
+    branch = models.ForeignKey('Branch', on_delete=models.SET_NULL, blank=True, null=True, related_name='students')
     year = models.IntegerField(choices=[(1, '1st Year'), (2, '2nd Year'), (3, '3rd Year'), (4, '4th Year'), (5, 'Passout')])
     bio = models.TextField(blank=True, null=True)
     skills = models.TextField(blank=True, null=True)
@@ -49,7 +52,7 @@ class Branch(models.Model):
 class Subject(models.Model):
     """Subjects for placement preparation"""
     name = models.CharField(max_length=100)
-    branch = models.CharField(max_length=100, blank=True, null=True)  # Keep as CharField for now
+    branch = models.ForeignKey(Branch, on_delete=models.SET_NULL, blank=True, null=True, related_name='subjects')
     description = models.TextField(blank=True)
     is_common = models.BooleanField(default=False)  # True for subjects like Aptitude, Coding
     created_at = models.DateTimeField(auto_now_add=True)
@@ -81,11 +84,20 @@ class Post(models.Model):
     focus_points = models.TextField(blank=True)
     upvotes = models.IntegerField(default=0)
     downvotes = models.IntegerField(default=0)
+    hot_score = models.FloatField(default=0)  # Maintained by api.ranking
+    view_count = models.PositiveIntegerField(default=0)  # Flushed in batches by api.viewcounts
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, blank=True, null=True,
+                                     related_name='duplicates')  # Flagged by api.duplicates
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-hot_score'], name='post_hot_score_idx'),
+            models.Index(fields=['subject', '-hot_score'], name='post_subject_hot_score_idx'),
+            models.Index(fields=['-view_count'], name='post_view_count_idx'),
+        ]
 
     def __str__(self):
         return f"{self.topic} by {self.posted_by.full_name}"
@@ -111,6 +123,42 @@ class PostVote(models.Model):
         unique_together = ['user', 'post']
 
 
+class RelatedPost(models.Model):
+    """Precomputed similar posts, best first, maintained by api.related"""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()  # Cosine similarity of the TF-IDF vectors
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ['post', 'related']
+        indexes = [
+            models.Index(fields=['post', 'rank'], name='related_post_rank_idx'),
+        ]
+
+
+class PostTerm(models.Model):
+    """Weight of a term in a post's stored TF-IDF vector, maintained by api.related"""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()  # L2-normalized, with the IDF at the time the post was indexed
+
+    class Meta:
+        unique_together = ['post', 'term']
+        indexes = [
+            models.Index(fields=['term', '-weight'], name='post_term_weight_idx'),
+        ]
+
+
+class TermFrequency(models.Model):
+    """Number of posts containing a term (its document frequency), maintained by api.related"""
+    term = models.CharField(max_length=64, primary_key=True)
+    documents = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Term frequencies"
+
+
 class Company(models.Model):
     """Companies for placement preparation"""
     name = models.CharField(max_length=100, unique=True)
@@ -138,7 +186,7 @@ class InterviewExperience(models.Model):
     posted_by = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='interview_experiences')
     position = models.CharField(max_length=100)
     interview_date = models.DateField()
-    rounds = models.TextField()  # JSON or structured text describing rounds
+    rounds = models.JSONField(default=list, blank=True, validators=[validate_rounds])  # See api.rounds
     questions = models.TextField()
     tips = models.TextField(blank=True)
     difficulty_level = models.IntegerField(choices=[(1, 'Easy'), (2, 'Medium'), (3, 'Hard')])
@@ -148,16 +196,117 @@ class InterviewExperience(models.Model):
         ('pending', 'Pending'),
     ])
     upvotes = models.IntegerField(default=0)
+    hot_score = models.FloatField(default=0)  # Maintained by api.ranking
+    view_count = models.PositiveIntegerField(default=0)  # Flushed in batches by api.viewcounts
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, blank=True, null=True,
+                                     related_name='duplicates')  # Flagged by api.duplicates
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-hot_score'], name='experience_hot_score_idx'),
+            models.Index(fields=['company', '-hot_score'], name='experience_company_hot_idx'),
+            models.Index(fields=['-view_count'], name='experience_view_count_idx'),
+        ]
 
     def __str__(self):
         return f"{self.company.name} - {self.position} by {self.posted_by.full_name}"
 
 
+class CompanyStats(models.Model):
+    """Precomputed per-company experience aggregates, maintained by api.stats"""
+    company = models.OneToOneField(Company, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    experience_count = models.IntegerField(default=0)
+    selected_count = models.IntegerField(default=0)
+    rejected_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    difficulty_total = models.IntegerField(default=0)  # Sum of difficulty_level, for the average
+    recent_positions = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Company stats"
+
+    def __str__(self):
+        return f"Stats for {self.company_id}"
+
+    @property
+    def average_difficulty(self):
+        if not self.experience_count:
+            return None
+        return round(self.difficulty_total / self.experience_count, 2)
+
+    @property
+    def selection_rate(self):
+        # Share of decided (selected or rejected) outcomes that were selections
+        decided = self.selected_count + self.rejected_count
+        if not decided:
+            return None
+        return round(self.selected_count / decided, 4)
+
+
+class Question(models.Model):
+    """A distinct interview question, deduplicated by its normalized text (see api.questions)"""
+    text = models.TextField()  # As first written
+    normalized_hash = models.CharField(max_length=40, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.text[:80]
+
+
+class ExperienceQuestion(models.Model):
+    """Link between an interview experience and a question it mentions"""
+    experience = models.ForeignKey(InterviewExperience, on_delete=models.CASCADE, related_name='question_links')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='experience_links')
+    position = models.PositiveSmallIntegerField(default=0)  # Order within the experience
+
+    class Meta:
+        unique_together = ['experience', 'question']
+
+
+class CompanyQuestion(models.Model):
+    """How often a question was asked at a company, maintained by api.questions"""
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='question_frequencies')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='company_frequencies')
+    times_asked = models.IntegerField(default=0)  # Number of experiences mentioning it
+    last_asked = models.DateField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['company', 'question']
+        indexes = [
+            models.Index(fields=['company', '-times_asked'], name='company_question_freq_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.question} at {self.company_id} ({self.times_asked})"
+
+
+class ContentFingerprint(models.Model):
+    """MinHash signature of a post or interview experience, maintained by api.duplicates"""
+    kind = models.CharField(max_length=20, choices=[('post', 'Post'), ('experience', 'Interview experience')])
+    object_id = models.IntegerField()
+    signature = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+
+
+class FingerprintKey(models.Model):
+    """Link hash or LSH band key of a fingerprint, looked up to find duplicate candidates"""
+    kind = models.CharField(max_length=20)
+    object_id = models.IntegerField()
+    key = models.CharField(max_length=40)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'key'], name='fingerprint_key_idx'),
+            models.Index(fields=['kind', 'object_id'], name='fingerprint_object_idx'),
+        ]
+
+
 class ExperienceVote(models.Model):
     """Track user votes on interview experiences"""
     user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
@@ -167,3 +316,52 @@ class ExperienceVote(models.Model):
 
     class Meta:
         unique_together = ['user', 'experience']
+
+
+class FeedEntry(models.Model):
+    """A post or experience in one precomputed home feed, maintained by api.feed"""
+    feed = models.CharField(max_length=32)  # "branch:<id>", "common" or "senior", see api.feed
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    experience = models.ForeignKey(InterviewExperience, on_delete=models.CASCADE, null=True, blank=True,
+                                   related_name='+')
+    created_at = models.DateTimeField()  # Copied from the item, the feed's sort key
+
+    class Meta:
+        verbose_name_plural = "Feed entries"
+        indexes = [
+            models.Index(fields=['feed', '-created_at', '-id'], name='feed_entry_page_idx'),
+        ]
+
+
+class Task(models.Model):
+    """Deferred background work processed by the `run_tasks` worker"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    dedupe_key = models.CharField(max_length=255, blank=True, null=True)  # Coalesces pending duplicates
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedupe_key'], condition=models.Q(status='pending'),
+                                    name='unique_pending_task_dedupe_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
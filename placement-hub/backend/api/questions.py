@@ -0,0 +1,179 @@
+"""
+Company question bank.
+
+InterviewExperience.questions is free text. It is split into individual
+questions, each normalized (case, punctuation, numbering and whitespace
+removed) and hashed so the same question written slightly differently by
+different students maps to one Question row. ExperienceQuestion links an
+experience to the questions it mentions and CompanyQuestion counts, per
+company, how many experiences mention each question, so "most asked
+questions at X" is one indexed read.
+
+Links and counts are updated for the affected experience whenever one is
+saved or deleted (see api.signals), and `manage.py rebuild_question_bank`
+rebuilds all three tables.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import InterviewExperience, Question, ExperienceQuestion, CompanyQuestion
+
+
+# Normalized questions shorter than this are noise ("ok", "1.")
+MIN_QUESTION_LENGTH = 4
+MAX_QUESTION_LENGTH = 1000
+MAX_QUESTIONS_PER_EXPERIENCE = 100
+
+# Experience fields the question bank depends on
+TRACKED_FIELDS = {'questions', 'company', 'company_id', 'interview_date'}
+
+_BULLET = re.compile(r'^\s*(?:[-*•]+|q(?:uestion)?\s*\d*\s*[:.)\-]|\(?\d+[.):](?=\s)|\(?[a-z]\))\s*', re.I)
+_AFTER_QUESTION_MARK = re.compile(r'(?<=\?)\s+(?=\S)')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_question(text):
+    """Canonical form used for deduplication: lowercase words separated by single spaces"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = _BULLET.sub('', text)
+    return _NON_WORD.sub(' ', text).replace('_', ' ').strip()
+
+
+def question_hash(normalized):
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def split_questions(text):
+    """Split free text into individual questions: one per line, bullet or question mark"""
+    questions = []
+    for line in (text or '').splitlines():
+        for part in _AFTER_QUESTION_MARK.split(line):
+            part = _BULLET.sub('', part).strip()
+            # "Coding round:" style headings introduce questions rather than being one
+            if not part or (part.endswith(':') and '?' not in part):
+                continue
+            questions.append(part[:MAX_QUESTION_LENGTH])
+    return questions
+
+
+def extract_questions(text):
+    """Return {hash: display text} for the distinct questions in the text, in order"""
+    entries = {}
+    for question in split_questions(text):
+        normalized = normalize_question(question)
+        if len(normalized) < MIN_QUESTION_LENGTH:
+            continue
+        entries.setdefault(question_hash(normalized), question)
+        if len(entries) >= MAX_QUESTIONS_PER_EXPERIENCE:
+            break
+    return entries
+
+
+def _question_ids(entries):
+    """Map every hash in `entries` ({hash: text}) to a Question id, creating missing rows"""
+    if not entries:
+        return {}
+    Question.objects.bulk_create(
+        [Question(normalized_hash=digest, text=text) for digest, text in entries.items()],
+        ignore_conflicts=True,
+    )
+    return dict(Question.objects.filter(normalized_hash__in=list(entries)).values_list('normalized_hash', 'id'))
+
+
+def index_experiences(experiences):
+    """
+    Replace the question links of the given experiences (which need id and
+    questions loaded). Returns the ids of the questions now linked.
+    """
+    parsed = {experience.id: extract_questions(experience.questions) for experience in experiences}
+    all_entries = {}
+    for entries in parsed.values():
+        for digest, text in entries.items():
+            all_entries.setdefault(digest, text)
+    ids = _question_ids(all_entries)
+    links = [
+        ExperienceQuestion(experience_id=experience_id, question_id=ids[digest], position=position)
+        for experience_id, entries in parsed.items()
+        for position, digest in enumerate(entries)
+    ]
+    ExperienceQuestion.objects.filter(experience_id__in=list(parsed)).delete()
+    ExperienceQuestion.objects.bulk_create(links)
+    return {link.question_id for link in links}
+
+
+def _frequencies(links):
+    rows = links.values('experience__company_id', 'question_id').annotate(
+        times_asked=Count('experience_id'),
+        last_asked=Max('experience__interview_date'),
+    ).order_by()
+    return [
+        CompanyQuestion(company_id=row['experience__company_id'], question_id=row['question_id'],
+                        times_asked=row['times_asked'], last_asked=row['last_asked'])
+        for row in rows
+    ]
+
+
+def refresh_company_questions(company_ids, question_ids):
+    """Recompute the frequency rows of the given questions at the given companies"""
+    company_ids = {company_id for company_id in company_ids if company_id is not None}
+    if not company_ids or not question_ids:
+        return
+    rows = _frequencies(ExperienceQuestion.objects.filter(experience__company_id__in=company_ids,
+                                                          question_id__in=question_ids))
+    with transaction.atomic():
+        if rows:
+            CompanyQuestion.objects.bulk_create(rows, update_conflicts=True,
+                                                unique_fields=['company', 'question'],
+                                                update_fields=['times_asked', 'last_asked'])
+        # Questions no experience at the company mentions any more
+        kept = {(row.company_id, row.question_id) for row in rows}
+        existing = CompanyQuestion.objects.filter(company_id__in=company_ids, question_id__in=question_ids)
+        stale = [pk for pk, company_id, question_id in existing.values_list('id', 'company_id', 'question_id')
+                 if (company_id, question_id) not in kept]
+        if stale:
+            CompanyQuestion.objects.filter(id__in=stale).delete()
+
+
+def index_experience(experience, previous_company_id=None):
+    """Update the links and company counts after an experience was created or edited"""
+    with transaction.atomic():
+        previous = set(ExperienceQuestion.objects.filter(experience_id=experience.id)
+                       .values_list('question_id', flat=True))
+        current = index_experiences([experience])
+        refresh_company_questions({experience.company_id, previous_company_id}, previous | current)
+
+
+def rebuild_question_bank(batch_size=500):
+    """
+    Rebuild links and frequencies for every experience. Returns
+    (questions, links, frequency rows).
+    """
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(InterviewExperience.objects.filter(id__gt=last_id).order_by('id')
+                         .only('id', 'questions')[:batch_size])
+            if not batch:
+                break
+            index_experiences(batch)
+            last_id = batch[-1].id
+
+    rows = _frequencies(ExperienceQuestion.objects.all())
+    with transaction.atomic():
+        CompanyQuestion.objects.all().delete()
+        CompanyQuestion.objects.bulk_create(rows, batch_size=1000)
+        Question.objects.filter(experience_links__isnull=True).delete()
+    return Question.objects.count(), ExperienceQuestion.objects.count(), len(rows)
+
+
+def top_questions(company_id, limit):
+    """The most frequently asked questions at a company, one indexed query"""
+    return list(
+        CompanyQuestion.objects.filter(company_id=company_id).select_related('question')
+        .order_by('-times_asked', '-last_asked', 'question_id')[:limit]
+    )
@@ -0,0 +1,89 @@
+"""
+Ranking of posts and interview experiences.
+
+`hot_score` is a time-decayed score stored in an indexed column so "hot"
+lists can be ordered in SQL. It uses the log-scaled votes plus creation time
+formula: every 10x more net votes is worth HOT_SCORE_WINDOW seconds of
+recency. Because the time term only depends on created_at, a row's score
+only changes when its votes do. It is refreshed on every vote and by
+`manage.py refresh_hot_scores`, which also backfills bulk-created rows.
+"""
+
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Post, InterviewExperience
+
+
+HOT_SCORE_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+HOT_SCORE_WINDOW = 45000  # seconds, 12.5 hours
+
+ORDERINGS = ('hot', 'top', 'new', 'views')
+DEFAULT_ORDERING = 'new'
+
+
+def hot_score(net_score, created_at):
+    """Time-decayed score for a row with `net_score` net votes created at `created_at`"""
+    order = math.log10(max(abs(net_score), 1))
+    sign = 1 if net_score > 0 else -1 if net_score < 0 else 0
+    seconds = ((created_at or timezone.now()) - HOT_SCORE_EPOCH).total_seconds()
+    return round(sign * order + seconds / HOT_SCORE_WINDOW, 7)
+
+
+def net_votes(instance):
+    """Net votes of a post or experience (experiences only have upvotes)"""
+    return instance.upvotes - getattr(instance, 'downvotes', 0)
+
+
+def parse_ordering(request):
+    """Return the requested ?ordering= value, falling back to DEFAULT_ORDERING"""
+    query_params = getattr(request, 'query_params', request.GET)
+    ordering = query_params.get('ordering', DEFAULT_ORDERING)
+    return ordering if ordering in ORDERINGS else DEFAULT_ORDERING
+
+
+def order_queryset(queryset, ordering):
+    """Apply a hot/top/new/views ordering to a Post or InterviewExperience queryset"""
+    if ordering == 'hot':
+        return queryset.order_by('-hot_score', '-id')
+    if ordering == 'views':
+        # Flushed counts; views still buffered in the cache (api.viewcounts) don't move items yet
+        return queryset.order_by('-view_count', '-id')
+    if ordering == 'top':
+        if queryset.model is Post:
+            return queryset.alias(ranked_net_score=F('upvotes') - F('downvotes')).order_by(
+                '-ranked_net_score', '-created_at')
+        return queryset.order_by('-upvotes', '-created_at')
+    return queryset.order_by('-created_at')
+
+
+def refresh_hot_scores(model, ids=None, batch_size=1000):
+    """Recompute stored hot scores for `ids` (or every row), returning the number changed"""
+    fields = ['id', 'upvotes', 'created_at', 'hot_score']
+    if model is Post:
+        fields.append('downvotes')
+    queryset = model.objects.only(*fields).order_by('id')
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+
+    changed = []
+    updated = 0
+    for instance in queryset.iterator(chunk_size=batch_size):
+        score = hot_score(net_votes(instance), instance.created_at)
+        if score != instance.hot_score:
+            instance.hot_score = score
+            changed.append(instance)
+        if len(changed) >= batch_size:
+            model.objects.bulk_update(changed, ['hot_score'])
+            updated += len(changed)
+            changed = []
+    if changed:
+        model.objects.bulk_update(changed, ['hot_score'])
+        updated += len(changed)
+    return updated
+
+
+RANKED_MODELS = {'posts': Post, 'experiences': InterviewExperience}
@@ -0,0 +1,296 @@
+"""
+Related posts.
+
+Every post is represented by a TF-IDF vector over the words of its topic
+(counted twice) and focus points. Neighbours are the posts with the highest
+cosine similarity, found through an inverted index so a post is only
+compared with posts sharing at least one term (the sparse equivalent of a
+matrix product), and the top RELATED_POSTS_PER_POST of them are stored in
+RelatedPost so `/api/posts/{id}/related/` is one indexed read.
+
+Vectors are stored in PostTerm and document frequencies in TermFrequency.
+`manage.py rebuild_related_posts` recomputes vectors, frequencies and the
+whole RelatedPost table. New and edited posts are handled incrementally by
+the `refresh_related_posts` task, which only touches the affected posts:
+their document frequencies are adjusted and their vectors recomputed from
+the stored frequencies, their neighbours are found by reading the stored
+postings of their terms, and they are merged into the stored lists of the
+posts they are similar to. Other posts keep the vectors (and IDF weights)
+they were indexed with, so weights drift slowly as posts are added and an
+edited post can linger in lists it no longer belongs to; the periodic
+rebuild corrects both.
+
+The task never falls back to a full rebuild, which doesn't fit in a cron
+invocation: posts that existed before the first rebuild (or before the
+vectors were stored) are only found once the command has run.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Post, PostTerm, RelatedPost, TermFrequency
+from .tasks import task, enqueue
+
+
+RELATED_POSTS_PER_POST = 10
+TOPIC_WEIGHT = 2
+# Pairs less similar than this aren't worth showing
+MIN_SIMILARITY = 0.05
+# Terms present in more than this share of a large corpus carry almost no
+# signal but dominate the comparison cost, so they are left out of the index
+MAX_DOCUMENT_FREQUENCY = 0.5
+MIN_CORPUS_FOR_PRUNING = 100
+# Only the documents a term weighs most in are scanned for it, which bounds
+# the cost of a query on a large corpus at a small loss of recall
+MAX_POSTINGS_PER_TERM = 500
+# Longer tokens are cut to fit PostTerm.term
+MAX_TERM_LENGTH = 64
+# Post fields the vectors are built from
+TRACKED_FIELDS = {'topic', 'focus_points'}
+# Seconds new posts wait so a burst of them is indexed together
+REFRESH_DELAY = 60
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in', 'is', 'it', 'of',
+    'on', 'or', 'that', 'the', 'this', 'to', 'what', 'with', 'notes', 'note',
+}
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize(text):
+    # Bare numbers ("#12", years) say nothing about what a post covers
+    return [token[:MAX_TERM_LENGTH] for token in _TOKEN.findall((text or '').lower())
+            if token not in STOP_WORDS and not token.isdigit()]
+
+
+def document_terms(topic, focus_points):
+    """Term counts of a post, with topic words weighted up"""
+    counts = Counter(tokenize(focus_points))
+    for token in tokenize(topic):
+        counts[token] += TOPIC_WEIGHT
+    return counts
+
+
+def document_frequencies(documents):
+    """Number of documents each term appears in, for {id: term counts}"""
+    frequencies = Counter()
+    for counts in documents.values():
+        frequencies.update(counts.keys())
+    return frequencies
+
+
+def build_vectors(documents, frequencies=None, total=None):
+    """
+    L2-normalized TF-IDF vectors ({term: weight}) for {id: term counts}. The
+    document frequencies and corpus size default to those of `documents`.
+    """
+    if frequencies is None:
+        frequencies, total = document_frequencies(documents), len(documents)
+    vectors = {}
+    for doc_id, counts in documents.items():
+        weights = {term: (1 + math.log(count)) * idf(total, frequencies.get(term, 1))
+                   for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if norm:
+            vectors[doc_id] = {term: weight / norm for term, weight in weights.items()}
+    return vectors
+
+
+def idf(total, document_frequency):
+    return math.log((1 + total) / (1 + document_frequency)) + 1
+
+
+def prunable(document_frequency, total):
+    """Whether a term is too common to be worth indexing"""
+    return total >= MIN_CORPUS_FOR_PRUNING and document_frequency > total * MAX_DOCUMENT_FREQUENCY
+
+
+def top_matches(doc_id, vector, postings, k):
+    """[(other_id, similarity)] of the k best matches of `vector` in {term: [(id, weight)]}, best first"""
+    scores = defaultdict(float)
+    for term, weight in vector.items():
+        for other_id, other_weight in postings.get(term, ()):
+            scores[other_id] += weight * other_weight
+    scores.pop(doc_id, None)
+    best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [(other_id, score) for other_id, score in best if score >= MIN_SIMILARITY]
+
+
+class SimilarityIndex:
+    """Inverted index over TF-IDF vectors answering top-k cosine queries"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        postings = defaultdict(list)
+        for doc_id, vector in vectors.items():
+            for term, weight in vector.items():
+                postings[term].append((doc_id, weight))
+        self.postings = {
+            term: heapq.nlargest(MAX_POSTINGS_PER_TERM, docs, key=lambda doc: doc[1])
+            for term, docs in postings.items() if not prunable(len(docs), len(vectors))
+        }
+
+    def neighbours(self, doc_id, k=RELATED_POSTS_PER_POST):
+        """[(other_id, similarity)] of the k most similar documents, best first"""
+        return top_matches(doc_id, self.vectors.get(doc_id, {}), self.postings, k)
+
+
+def load_documents(queryset=None):
+    """{post_id: term counts} of the given posts (all by default), read in one streaming query"""
+    rows = (Post.objects.all() if queryset is None else queryset).values_list('id', 'topic', 'focus_points')
+    return {post_id: document_terms(topic, focus_points)
+            for post_id, topic, focus_points in rows.order_by().iterator(chunk_size=2000)}
+
+
+def _term_rows(vectors):
+    return [PostTerm(post_id=post_id, term=term, weight=weight)
+            for post_id, vector in vectors.items() for term, weight in vector.items()]
+
+
+def _adjust_frequencies(changes):
+    """Apply {term: change in document count} to the stored document frequencies"""
+    by_change = defaultdict(list)
+    for term, change in changes.items():
+        if change:
+            by_change[change].append(term)
+    TermFrequency.objects.bulk_create(
+        [TermFrequency(term=term) for term, change in changes.items() if change > 0], ignore_conflicts=True
+    )
+    for change, terms in by_change.items():
+        TermFrequency.objects.filter(term__in=terms).update(documents=F('documents') + change)
+    TermFrequency.objects.filter(term__in=list(changes), documents__lte=0).delete()
+
+
+def index_posts(post_ids):
+    """
+    Recompute and store the vectors of the given posts, keeping the document
+    frequencies in step. Returns ({post_id: vector}, {term: frequency}, corpus size).
+    """
+    documents = load_documents(Post.objects.filter(id__in=post_ids))
+    previous = defaultdict(set)
+    for post_id, term in PostTerm.objects.filter(post_id__in=post_ids).values_list('post_id', 'term'):
+        previous[post_id].add(term)
+    changes = Counter()
+    for post_id in set(documents) | set(previous):
+        current = set(documents.get(post_id, ()))
+        changes.update(current - previous[post_id])
+        changes.subtract(previous[post_id] - current)
+
+    with transaction.atomic():
+        _adjust_frequencies(changes)
+        terms = {term for counts in documents.values() for term in counts}
+        frequencies = dict(TermFrequency.objects.filter(term__in=terms).values_list('term', 'documents'))
+        total = Post.objects.count()
+        vectors = build_vectors(documents, frequencies, total)
+        PostTerm.objects.filter(post_id__in=list(previous)).delete()
+        PostTerm.objects.bulk_create(_term_rows(vectors))
+    return vectors, frequencies, total
+
+
+def forget_post_terms(terms):
+    """Take a deleted post's terms (its stored vector is cascade-deleted) out of the document frequencies"""
+    if terms:
+        _adjust_frequencies({term: -1 for term in terms})
+
+
+def load_postings(terms):
+    """The stored postings ({term: [(post_id, weight)]}) of the given terms, heaviest first"""
+    ranked = PostTerm.objects.filter(term__in=terms).annotate(
+        position=Window(RowNumber(), partition_by=F('term'), order_by=F('weight').desc())
+    )
+    postings = defaultdict(list)
+    for term, post_id, weight in (ranked.filter(position__lte=MAX_POSTINGS_PER_TERM)
+                                  .values_list('term', 'post_id', 'weight')):
+        postings[term].append((post_id, weight))
+    return postings
+
+
+def _rows(post_id, neighbours):
+    return [RelatedPost(post_id=post_id, related_id=other_id, score=round(score, 6), rank=rank)
+            for rank, (other_id, score) in enumerate(neighbours)]
+
+
+def _replace(lists):
+    """Store the given {post_id: [(related_id, score)]} lists"""
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=list(lists)).delete()
+        RelatedPost.objects.bulk_create(
+            [row for post_id, neighbours in lists.items() for row in _rows(post_id, neighbours)]
+        )
+
+
+def rebuild_related_posts(k=RELATED_POSTS_PER_POST, batch_size=500):
+    """Recompute every post's vector and neighbours, returning the number of related rows written"""
+    documents = load_documents()
+    frequencies = document_frequencies(documents)
+    vectors = build_vectors(documents, frequencies, len(documents))
+    with transaction.atomic():
+        TermFrequency.objects.all().delete()
+        TermFrequency.objects.bulk_create([TermFrequency(term=term, documents=count)
+                                           for term, count in frequencies.items()], batch_size=1000)
+        PostTerm.objects.all().delete()
+        PostTerm.objects.bulk_create(_term_rows(vectors), batch_size=1000)
+
+    index, post_ids = SimilarityIndex(vectors), list(documents)
+    written = 0
+    for start in range(0, len(post_ids), batch_size):
+        lists = {post_id: index.neighbours(post_id, k) for post_id in post_ids[start:start + batch_size]}
+        _replace(lists)
+        written += sum(len(neighbours) for neighbours in lists.values())
+    return written
+
+
+def refresh_related_posts(post_ids, k=RELATED_POSTS_PER_POST):
+    """Compute neighbours for new or edited posts and merge them into their neighbours' lists"""
+    post_ids = set(post_ids)
+    vectors, frequencies, total = index_posts(post_ids)
+    postings = load_postings([term for term, count in frequencies.items() if not prunable(count, total)])
+    lists = {post_id: top_matches(post_id, vectors.get(post_id, {}), postings, k) for post_id in post_ids}
+
+    # Similarity is symmetric: a new post may belong in its neighbours' lists too
+    candidates = defaultdict(list)
+    for post_id, neighbours in lists.items():
+        for other_id, score in neighbours:
+            if other_id not in post_ids:
+                candidates[other_id].append((post_id, score))
+    stored = defaultdict(list)
+    rows = RelatedPost.objects.filter(post_id__in=list(candidates)).order_by('post_id', 'rank')
+    for post_id, related_id, score in rows.values_list('post_id', 'related_id', 'score'):
+        # Edited posts are re-ranked from their fresh scores
+        if related_id not in post_ids:
+            stored[post_id].append((related_id, score))
+    for other_id, additions in candidates.items():
+        merged = heapq.nlargest(k, stored[other_id] + additions, key=lambda item: (item[1], -item[0]))
+        if merged != stored[other_id][:k]:
+            lists[other_id] = merged
+
+    _replace(lists)
+
+
+@task('refresh_related_posts', batch=True)
+def refresh_related_posts_task(payloads):
+    post_ids = {p['post_id'] for p in payloads}
+    # Posts deleted since they were queued have nothing to index
+    refresh_related_posts(Post.objects.filter(id__in=post_ids).values_list('id', flat=True))
+
+
+def schedule_related_refresh(post_id):
+    """Queue a (coalesced) related posts refresh for a new or edited post"""
+    return enqueue('refresh_related_posts', {'post_id': post_id}, dedupe_key=f'related:post:{post_id}',
+                   delay=REFRESH_DELAY)
+
+
+def related_posts(post_id):
+    """Stored neighbours of a post with the related posts loaded, one indexed query"""
+    return list(
+        RelatedPost.objects.filter(post_id=post_id)
+        .select_related('related__subject', 'related__posted_by')
+        .order_by('rank')
+    )
@@ -0,0 +1,149 @@
+"""
+Structured interview rounds.
+
+InterviewExperience.rounds is a JSON list of rounds, each
+``{"type": <ROUND_TYPES key or "other">, "title": str, "description": str}``.
+Free text (the format the API always accepted) is parsed into that shape:
+one round per line, "Round N:" marker or semicolon, with the type guessed
+from keywords.
+
+Experiences are filtered by round type inside the database with the
+``has_round_type`` lookup: JSON containment on PostgreSQL (served by a GIN
+index) and JSON1's json_each on SQLite.
+"""
+
+import json
+import re
+
+from django.core.exceptions import ValidationError
+from django.db.models import JSONField, Lookup
+
+
+ROUND_TYPES = {
+    'coding': ['coding', 'programming', 'dsa', 'hackerrank', 'hackerearth', 'leetcode', 'codility'],
+    'aptitude': ['aptitude', 'online test', 'online assessment', 'oa', 'quant', 'quantitative',
+                 'reasoning', 'written test', 'mcq'],
+    'group_discussion': ['group discussion', 'gd'],
+    'technical': ['technical', 'tech', 'system design', 'core'],
+    'managerial': ['managerial', 'manager', 'director'],
+    'hr': ['hr', 'human resource', 'human resources'],
+}
+OTHER = 'other'
+
+MAX_ROUNDS = 20
+MAX_TITLE_LENGTH = 200
+MAX_DESCRIPTION_LENGTH = 2000
+
+_KEYWORDS = [(round_type, re.compile(r'\b(' + '|'.join(re.escape(k) for k in keywords) + r')\b', re.I))
+             for round_type, keywords in ROUND_TYPES.items()]
+_ROUND_MARKER = re.compile(r'(?=\bround\s*\d+\s*[:\-.)])', re.I)
+_BULLET = re.compile(r'^\s*(?:[-*•]+|\d+[.)])\s*')
+
+
+def classify_round(text):
+    """Best guess of a round's type from its title or description"""
+    for round_type, pattern in _KEYWORDS:
+        if pattern.search(text):
+            return round_type
+    return OTHER
+
+
+def _split(text):
+    parts = []
+    for line in text.splitlines():
+        for chunk in line.split(';'):
+            parts.extend(_ROUND_MARKER.split(chunk))
+    cleaned = []
+    for part in parts:
+        part = _BULLET.sub('', part).strip(' ,')
+        if part:
+            cleaned.append(part)
+    return cleaned
+
+
+def _round(title, description=''):
+    title = title.strip()[:MAX_TITLE_LENGTH]
+    return {
+        'type': classify_round(f'{title} {description}'),
+        'title': title,
+        'description': description.strip()[:MAX_DESCRIPTION_LENGTH],
+    }
+
+
+def parse_rounds(value):
+    """Turn free text, a JSON string or a list into the structured rounds list"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                return normalize_rounds(json.loads(text))
+            except (ValueError, ValidationError):
+                pass
+        return [_round(part) for part in _split(text)][:MAX_ROUNDS]
+    return normalize_rounds(value)
+
+
+def normalize_rounds(rounds):
+    """Validate a list of rounds (dicts or plain titles) and fill in missing types"""
+    if not isinstance(rounds, list):
+        raise ValidationError('Rounds must be a list.')
+    if len(rounds) > MAX_ROUNDS:
+        raise ValidationError(f'At most {MAX_ROUNDS} rounds are allowed.')
+
+    normalized = []
+    for item in rounds:
+        if isinstance(item, str):
+            item = {'title': item}
+        if not isinstance(item, dict) or not str(item.get('title') or '').strip():
+            raise ValidationError('Every round needs a title.')
+        round_type = item.get('type') or classify_round(f"{item['title']} {item.get('description', '')}")
+        if round_type not in ROUND_TYPES and round_type != OTHER:
+            raise ValidationError(f'Unknown round type: {round_type}.')
+        normalized.append({
+            'type': round_type,
+            'title': str(item['title']).strip()[:MAX_TITLE_LENGTH],
+            'description': str(item.get('description') or '').strip()[:MAX_DESCRIPTION_LENGTH],
+        })
+    return normalized
+
+
+def validate_rounds(value):
+    """Model field validator: rounds must already be in the structured form"""
+    if normalize_rounds(value) != value:
+        raise ValidationError('Rounds must be a list of {"type", "title", "description"} objects.')
+
+
+def rounds_as_text(rounds):
+    """Plain text rendering, one round per line (the API's original format)"""
+    if isinstance(rounds, str):
+        return rounds
+    lines = []
+    for item in rounds or []:
+        line = item.get('title', '')
+        if item.get('description'):
+            line = f"{line}: {item['description']}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+@JSONField.register_lookup
+class HasRoundType(Lookup):
+    """rounds__has_round_type='coding': some round in the list has that type"""
+    lookup_name = 'has_round_type'
+    prepare_rhs = False
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f'{lhs} @> %s::jsonb', [*lhs_params, json.dumps([{'type': self.rhs}])]
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        sql = f"EXISTS (SELECT 1 FROM json_each({lhs}) WHERE json_extract(json_each.value, '$.type') = %s)"
+        return sql, [*lhs_params, self.rhs]
+
+    def as_sql(self, compiler, connection):
+        # Other backends: match the serialized {"type": "..."} pair
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f'{lhs} LIKE %s', [*lhs_params, f'%"type": {json.dumps(self.rhs)}%']
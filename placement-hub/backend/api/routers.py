@@ -0,0 +1,91 @@
+"""
+Read replica routing.
+
+Replicas are configured with DATABASE_REPLICA_URLS (see hub.settings) and
+listed in settings.DATABASE_REPLICAS. ReplicaRoutingMiddleware picks one
+replica for each safe (GET/HEAD/OPTIONS) API request and ReplicaRouter
+sends that request's reads to it; everything else (writes, unsafe
+requests, management commands, tasks) uses the primary.
+
+Replicas lag behind the primary, so a client that just wrote could read
+its own write back as missing (a vote that seems to roll back). After a
+successful unsafe request the client is pinned to the primary for
+REPLICA_PIN_SECONDS; clients are told apart by their Authorization header,
+or their address when anonymous. Pins are kept in the default cache, which
+hub.settings requires to be shared (Redis) when replicas are configured, so
+the process serving the next read sees the pin. A write made during a safe
+request also moves the rest of that request to the primary.
+
+With no replicas configured the router and middleware change nothing.
+"""
+
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Only the API's read endpoints are spread over replicas
+REPLICA_READ_PREFIX = '/api/'
+
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def pin_key(request):
+    client = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+    return 'dbpin:' + hashlib.sha1(client.encode('utf-8')).hexdigest()[:32]
+
+
+def pin_to_primary(request):
+    cache.set(pin_key(request), 1, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+
+
+def is_pinned(request):
+    return cache.get(pin_key(request)) is not None
+
+
+def choose_read_alias(request):
+    """Replica this request may read from, or None for the primary"""
+    replicas = replica_aliases()
+    if not replicas or request.method not in SAFE_METHODS or not request.path.startswith(REPLICA_READ_PREFIX):
+        return None
+    if is_pinned(request):
+        return None
+    return random.choice(replicas)
+
+
+def use_read_alias(alias):
+    """Route this context's reads to `alias` (None for the primary)"""
+    _read_alias.set(alias)
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the current request, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Reads after a write in the same request must see it
+        if _read_alias.get() is not None:
+            _read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        pool = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary
+        return db == DEFAULT_DB_ALIAS
@@ -1,8 +1,118 @@
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models.manager import BaseManager
 from rest_framework import serializers
 from .models import (
     Branch, UserProfile, Subject, Post, Company,
-    InterviewExperience
+    InterviewExperience, CompanyStats, CompanyQuestion, RelatedPost
 )
+from .rounds import parse_rounds, rounds_as_text
+from .votes import post_votes_for, experience_votes_for, pending_post_deltas
+from .viewcounts import KIND_POST, KIND_EXPERIENCE, pending_views
+
+
+def current_user_profile(context):
+    """Return the authenticated UserProfile from a serializer context, if any"""
+    request = context.get('request')
+    user = getattr(request, 'user', None)
+    if hasattr(user, 'supabase_uid'):
+        return user
+    return None
+
+
+class PrimingListSerializer(serializers.ListSerializer):
+    """
+    List serializer that lets the child batch per-object lookups (such as the
+    current user's votes) into a single query before rendering the items.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, BaseManager) else data
+        items = list(iterable)
+        self.child.prime(items)
+        return super().to_representation(items)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that restricts the representation to a subset of fields.
+
+    Pass ``fields`` to keep only those fields and/or ``omit`` to drop some.
+    ``Meta.summary_fields`` lists the lightweight representation used by list
+    views, ``Meta.personal_fields`` the per-user fields dropped from shared
+    public payloads, and ``Meta.field_dependencies`` maps computed fields to
+    the model columns they read, so querysets can defer everything else.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, omit=None):
+        """Load only the columns (and joins) needed to render the selected fields"""
+        serializer = cls(fields=fields, omit=omit)
+        model = cls.Meta.model
+        dependencies = getattr(cls.Meta, 'field_dependencies', {})
+
+        only = {'id'}
+        related = set()
+        for name, field in serializer.fields.items():
+            if name in dependencies:
+                only.update(dependencies[name])
+                continue
+            source = field.source
+            if '.' in source:
+                relation = source.split('.')[0]
+                related.add(relation)
+                only.add(relation)
+                only.add(source.replace('.', '__'))
+                continue
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete:
+                only.add(source)
+
+        for dependency in list(only):
+            if '__' in dependency:
+                relation = dependency.split('__')[0]
+                related.add(relation)
+                only.add(relation)
+
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        return queryset.only(*sorted(only))
+
+class BranchNameField(serializers.SlugRelatedField):
+    """
+    Branch foreign key read and written as the branch name, the format the
+    API used when branch was a free-text column. Blank means no branch.
+    Querysets should select_related('branch') to avoid a query per row.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'name')
+        kwargs.setdefault('queryset', Branch.objects.all())
+        kwargs.setdefault('allow_null', True)
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if data in ('', None):
+            return None
+        try:
+            return self.get_queryset().get(name__iexact=str(data).strip())
+        except Branch.DoesNotExist:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+
 
 class BranchSerializer(serializers.ModelSerializer):
     """Serializer for branches"""
@@ -15,6 +125,7 @@ class BranchSerializer(serializers.ModelSerializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for user profiles"""
+    branch = BranchNameField()
     
     class Meta:
         model = UserProfile
@@ -26,6 +137,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
 class SubjectSerializer(serializers.ModelSerializer):
     """Serializer for subjects"""
+    branch = BranchNameField()
     posts_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -35,10 +147,21 @@ class SubjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_posts_count(self, obj):
+        # Use the count annotated by the queryset when available
+        if hasattr(obj, 'annotated_posts_count'):
+            return obj.annotated_posts_count
         return obj.posts.count()
 
 
-class PostSerializer(serializers.ModelSerializer):
+class CatalogSubjectSerializer(SubjectSerializer):
+    """Subjects for the static catalog (api.catalog), without the posts count that changes with every post"""
+    posts_count = None
+
+    class Meta(SubjectSerializer.Meta):
+        fields = [field for field in SubjectSerializer.Meta.fields if field != 'posts_count']
+
+
+class PostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for posts"""
     posted_by_name = serializers.CharField(source='posted_by.full_name', read_only=True)
     posted_by_uid = serializers.CharField(source='posted_by.supabase_uid', read_only=True)
@@ -50,33 +173,78 @@ class PostSerializer(serializers.ModelSerializer):
         model = Post
         fields = ['id', 'subject', 'subject_name', 'posted_by', 'posted_by_name', 'posted_by_uid',
                  'post_type', 'topic', 'notes_link', 'video_link', 'focus_points',
-                 'upvotes', 'downvotes', 'net_score', 'user_vote', 
+                 'upvotes', 'downvotes', 'net_score', 'user_vote', 'view_count', 'duplicate_of',
                  'created_at', 'updated_at']
-        read_only_fields = ['id', 'posted_by', 'upvotes', 'downvotes', 
+        read_only_fields = ['id', 'posted_by', 'upvotes', 'downvotes', 'view_count', 'duplicate_of',
                            'created_at', 'updated_at']
+        summary_fields = ['id', 'subject', 'subject_name', 'posted_by', 'posted_by_name',
+                          'posted_by_uid', 'post_type', 'topic', 'upvotes', 'downvotes',
+                          'net_score', 'user_vote', 'view_count', 'created_at']
+        field_dependencies = {
+            'net_score': ['upvotes', 'downvotes'],
+            'user_vote': [],
+        }
+        personal_fields = ['user_vote']
+        list_serializer_class = PrimingListSerializer
     
     def get_user_vote(self, obj):
         """Get current user's vote on this post"""
-        request = self.context.get('request')
-        print(f"DEBUG: get_user_vote called for post {obj.id}")
-        print(f"DEBUG: request exists: {request is not None}")
-        if request:
-            print(f"DEBUG: request.user: {request.user}")
-            print(f"DEBUG: request.user type: {type(request.user)}")
-            print(f"DEBUG: hasattr supabase_uid: {hasattr(request.user, 'supabase_uid')}")
-        
-        if request and hasattr(request, 'user') and hasattr(request.user, 'supabase_uid'):
-            try:
-                from .models import PostVote
-                vote = PostVote.objects.filter(user=request.user, post=obj).first()
-                vote_value = vote.vote if vote else None
-                print(f"DEBUG: Found vote: {vote_value}")
-                return vote_value
-            except Exception as e:
-                print(f"DEBUG: Exception in get_user_vote: {e}")
-                return None
-        print(f"DEBUG: No authenticated user, returning None")
-        return None
+        user_profile = current_user_profile(self.context)
+        if user_profile is None:
+            return None
+        # Lists prime the votes for every post in one query
+        votes = self.context.get('post_votes')
+        if votes is not None:
+            return votes.get(obj.id)
+        return post_votes_for(user_profile, [obj.id]).get(obj.id)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Overlay vote counts that are buffered but not yet flushed (VOTE_WRITE_BEHIND)
+        deltas = self.context.get('pending_post_deltas')
+        if deltas is None:
+            deltas = pending_post_deltas([instance.id])
+        up, down = deltas.get(instance.id, (0, 0))
+        if up or down:
+            if 'upvotes' in data:
+                data['upvotes'] += up
+            if 'downvotes' in data:
+                data['downvotes'] += down
+            if 'net_score' in data:
+                data['net_score'] += up - down
+        # ...and views buffered by api.viewcounts
+        if 'view_count' in data:
+            views = self.context.get('pending_post_views')
+            if views is None:
+                views = pending_views(KIND_POST, [instance.id])
+            data['view_count'] += views.get(instance.id, 0)
+        return data
+
+    def prime(self, instances):
+        ids = [obj.id for obj in instances]
+        self.context['pending_post_deltas'] = pending_post_deltas(ids)
+        if 'view_count' in self.fields:
+            self.context['pending_post_views'] = pending_views(KIND_POST, ids)
+        if 'user_vote' in self.fields:
+            user_profile = current_user_profile(self.context)
+            if user_profile is not None:
+                self.context['post_votes'] = post_votes_for(user_profile, ids)
+
+
+class RelatedPostSerializer(serializers.ModelSerializer):
+    """Serializer for a post's precomputed related posts"""
+    id = serializers.IntegerField(source='related_id', read_only=True)
+    topic = serializers.CharField(source='related.topic', read_only=True)
+    post_type = serializers.CharField(source='related.post_type', read_only=True)
+    subject = serializers.IntegerField(source='related.subject_id', read_only=True)
+    subject_name = serializers.CharField(source='related.subject.name', read_only=True)
+    posted_by_name = serializers.CharField(source='related.posted_by.full_name', read_only=True)
+    net_score = serializers.IntegerField(source='related.net_score', read_only=True)
+
+    class Meta:
+        model = RelatedPost
+        fields = ['id', 'topic', 'post_type', 'subject', 'subject_name', 'posted_by_name', 'net_score', 'score']
+        read_only_fields = fields
 
 
 class CompanySerializer(serializers.ModelSerializer):
@@ -88,31 +256,112 @@ class CompanySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class InterviewExperienceSerializer(serializers.ModelSerializer):
+class RoundsField(serializers.Field):
+    """
+    Interview rounds, read as the plain text the API always returned and
+    written as free text or a structured list (see api.rounds).
+    """
+
+    def to_representation(self, value):
+        return rounds_as_text(value)
+
+    def to_internal_value(self, data):
+        try:
+            rounds = parse_rounds(data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        if not rounds:
+            raise serializers.ValidationError('Describe at least one round.')
+        return rounds
+
+
+class CompanyStatsSerializer(serializers.ModelSerializer):
+    """Serializer for precomputed company statistics"""
+    company_name = serializers.CharField(source='company.name', read_only=True)
+    result_counts = serializers.SerializerMethodField()
+    average_difficulty = serializers.ReadOnlyField()
+    selection_rate = serializers.ReadOnlyField()
+
+    class Meta:
+        model = CompanyStats
+        fields = ['company', 'company_name', 'experience_count', 'result_counts',
+                  'average_difficulty', 'selection_rate', 'recent_positions', 'updated_at']
+        read_only_fields = fields
+
+    def get_result_counts(self, obj):
+        return {
+            'selected': obj.selected_count,
+            'rejected': obj.rejected_count,
+            'pending': obj.pending_count,
+        }
+
+
+class CompanyQuestionSerializer(serializers.ModelSerializer):
+    """Serializer for a company's question bank entries"""
+    id = serializers.IntegerField(source='question_id', read_only=True)
+    text = serializers.CharField(source='question.text', read_only=True)
+
+    class Meta:
+        model = CompanyQuestion
+        fields = ['id', 'text', 'times_asked', 'last_asked']
+        read_only_fields = fields
+
+
+class InterviewExperienceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for interview experiences"""
     posted_by_name = serializers.CharField(source='posted_by.full_name', read_only=True)
     company_name = serializers.CharField(source='company.name', read_only=True)
+    rounds = RoundsField()
+    round_details = serializers.JSONField(source='rounds', read_only=True)
+    round_types = serializers.SerializerMethodField()
     user_voted = serializers.SerializerMethodField()
     
     class Meta:
         model = InterviewExperience
         fields = ['id', 'company', 'company_name', 'posted_by', 'posted_by_name',
-                 'position', 'interview_date', 'rounds', 'questions', 'tips',
-                 'difficulty_level', 'result', 'upvotes', 'user_voted',
+                 'position', 'interview_date', 'rounds', 'round_details', 'round_types', 'questions', 'tips',
+                 'difficulty_level', 'result', 'upvotes', 'user_voted', 'view_count', 'duplicate_of',
                  'created_at', 'updated_at']
-        read_only_fields = ['id', 'posted_by', 'upvotes', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'posted_by', 'upvotes', 'view_count', 'duplicate_of', 'created_at', 'updated_at']
+        summary_fields = ['id', 'company', 'company_name', 'posted_by', 'posted_by_name',
+                          'position', 'interview_date', 'difficulty_level', 'result',
+                          'upvotes', 'user_voted', 'view_count', 'created_at']
+        field_dependencies = {
+            'round_types': ['rounds'],
+            'user_voted': [],
+        }
+        personal_fields = ['user_voted']
+        list_serializer_class = PrimingListSerializer
     
+    def get_round_types(self, obj):
+        """Distinct round types in interview order"""
+        return list(dict.fromkeys(item['type'] for item in obj.rounds or []))
+
     def get_user_voted(self, obj):
         """Check if current user has voted on this experience"""
-        request = self.context.get('request')
-        if request and hasattr(request, 'user') and hasattr(request.user, 'supabase_uid'):
-            try:
-                user_profile = UserProfile.objects.get(supabase_uid=request.user.supabase_uid)
-                vote = obj.experiencevote_set.filter(user=user_profile).first()
-                return vote.is_upvote if vote else None
-            except UserProfile.DoesNotExist:
-                return None
-        return None
-
+        user_profile = current_user_profile(self.context)
+        if user_profile is None:
+            return None
+        votes = self.context.get('experience_votes')
+        if votes is not None:
+            return votes.get(obj.id)
+        return experience_votes_for(user_profile, [obj.id]).get(obj.id)
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Overlay views buffered by api.viewcounts but not yet flushed
+        if 'view_count' in data:
+            views = self.context.get('pending_experience_views')
+            if views is None:
+                views = pending_views(KIND_EXPERIENCE, [instance.id])
+            data['view_count'] += views.get(instance.id, 0)
+        return data
 
+    def prime(self, instances):
+        ids = [obj.id for obj in instances]
+        if 'view_count' in self.fields:
+            self.context['pending_experience_views'] = pending_views(KIND_EXPERIENCE, ids)
+        if 'user_voted' in self.fields:
+            user_profile = current_user_profile(self.context)
+            if user_profile is not None:
+                self.context['experience_votes'] = experience_votes_for(user_profile, ids)
@@ -0,0 +1,151 @@
+"""
+Signal handlers keeping derived data in sync with the models
+"""
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import autocomplete, feed
+from .catalog import schedule_catalog_publish
+from .cache import bump_generation
+from .duplicates import (
+    KIND_POST, KIND_EXPERIENCE, TRACKED_FIELDS as FINGERPRINT_FIELDS, fingerprint_of, forget_content,
+    index_content
+)
+from .identity import forget
+from .models import (
+    Branch, Company, Post, PostTerm, InterviewExperience, ExperienceQuestion, Subject, UserProfile
+)
+from .questions import TRACKED_FIELDS as QUESTION_FIELDS, index_experience, refresh_company_questions
+from .ranking import hot_score, net_votes
+from .related import TRACKED_FIELDS as RELATED_FIELDS, forget_post_terms, schedule_related_refresh
+from .rounds import parse_rounds
+from .stats import TRACKED_FIELDS, refresh_company_stats
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=InterviewExperience)
+def refresh_hot_score(sender, instance, update_fields=None, **kwargs):
+    # Keep the stored ranking in step with vote counts on every full save
+    if update_fields is None or 'hot_score' in update_fields:
+        instance.hot_score = hot_score(net_votes(instance), instance.created_at)
+
+
+# Public list caches are invalidated when rows appear or disappear; vote count
+# changes are allowed to be stale for PUBLIC_LIST_CACHE_TIMEOUT seconds (plus
+# PUBLIC_LIST_STALE_TIMEOUT while a refresh is in progress).
+
+@receiver(pre_save, sender=Post)
+def remember_post_placement(sender, instance, update_fields=None, **kwargs):
+    # The feed entry only moves when the subject or the duplicate flag changes
+    instance._previous_placement = None
+    if instance.pk and (update_fields is None or {'subject', 'duplicate_of'}.intersection(update_fields)):
+        instance._previous_placement = (
+            Post.objects.filter(pk=instance.pk).values_list('subject_id', 'duplicate_of_id').first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        bump_generation('posts')
+    if update_fields is None or RELATED_FIELDS.intersection(update_fields):
+        schedule_related_refresh(instance.id)
+    if update_fields is None or FINGERPRINT_FIELDS[KIND_POST].intersection(update_fields):
+        index_content(KIND_POST, instance.id, fingerprint_of(KIND_POST, instance))
+    previous = getattr(instance, '_previous_placement', None)
+    if created or (previous is not None and previous != (instance.subject_id, instance.duplicate_of_id)):
+        feed.add_post(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_post_terms(sender, instance, **kwargs):
+    # The stored vector is cascade-deleted before post_delete runs
+    instance._terms = list(PostTerm.objects.filter(post_id=instance.pk).values_list('term', flat=True))
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    bump_generation('posts')
+    forget_content(KIND_POST, instance.id)
+    forget_post_terms(getattr(instance, '_terms', []))
+
+
+@receiver(pre_save, sender=InterviewExperience)
+def structure_rounds(sender, instance, **kwargs):
+    # Accept free text rounds from older callers and store them structured
+    if isinstance(instance.rounds, str):
+        instance.rounds = parse_rounds(instance.rounds)
+
+
+@receiver(pre_save, sender=InterviewExperience)
+def remember_experience_company(sender, instance, update_fields=None, **kwargs):
+    # An edit can move an experience to another company; both need new stats
+    instance._previous_company_id = None
+    if instance.pk and (update_fields is None or 'company' in update_fields):
+        instance._previous_company_id = (
+            InterviewExperience.objects.filter(pk=instance.pk).values_list('company_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=InterviewExperience)
+def experience_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        bump_generation('experiences')
+        feed.add_experience(instance)
+    if created or update_fields is None or 'position' in update_fields:
+        autocomplete.bump_generation(autocomplete.POSITION)
+    if update_fields is None or TRACKED_FIELDS.intersection(update_fields):
+        refresh_company_stats({instance.company_id, getattr(instance, '_previous_company_id', None)})
+    if update_fields is None or QUESTION_FIELDS.intersection(update_fields):
+        index_experience(instance, getattr(instance, '_previous_company_id', None))
+    if update_fields is None or FINGERPRINT_FIELDS[KIND_EXPERIENCE].intersection(update_fields):
+        index_content(KIND_EXPERIENCE, instance.id, fingerprint_of(KIND_EXPERIENCE, instance))
+
+
+@receiver(pre_delete, sender=InterviewExperience)
+def remember_experience_questions(sender, instance, **kwargs):
+    # The links are cascade-deleted before post_delete runs
+    instance._question_ids = set(
+        ExperienceQuestion.objects.filter(experience_id=instance.pk).values_list('question_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=InterviewExperience)
+def experience_deleted(sender, instance, **kwargs):
+    bump_generation('experiences')
+    autocomplete.bump_generation(autocomplete.POSITION)
+    refresh_company_stats({instance.company_id})
+    refresh_company_questions({instance.company_id}, getattr(instance, '_question_ids', set()))
+    forget_content(KIND_EXPERIENCE, instance.id)
+
+
+# Typeahead indexes are rebuilt when names appear, change or go away; popularity
+# changes wait for AUTOCOMPLETE_MAX_AGE
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def company_changed(sender, instance, **kwargs):
+    autocomplete.bump_generation(autocomplete.COMPANY)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def subject_changed(sender, instance, **kwargs):
+    autocomplete.bump_generation(autocomplete.SUBJECT)
+
+
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def catalog_changed(sender, instance, **kwargs):
+    # Republish the static catalog snapshot
+    schedule_catalog_publish()
+
+
+@receiver(post_delete, sender=UserProfile)
+def profile_deleted(sender, instance, **kwargs):
+    forget(instance.supabase_uid)
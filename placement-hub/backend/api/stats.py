@@ -0,0 +1,83 @@
+"""
+Per-company interview statistics.
+
+CompanyStats rows summarize a company's interview experiences (counts by
+result, difficulty, recent positions) so company cards are served from one
+indexed read instead of aggregating every experience per request. Rows are
+recomputed for the affected company whenever an experience is created,
+edited or deleted (see api.signals), and `manage.py rebuild_company_stats`
+rebuilds the whole table.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from .models import CompanyStats, InterviewExperience
+
+
+RECENT_POSITIONS = 5
+
+STATS_FIELDS = ['experience_count', 'selected_count', 'rejected_count', 'pending_count',
+                'difficulty_total', 'recent_positions']
+
+# Experience fields the statistics depend on
+TRACKED_FIELDS = {'company', 'company_id', 'result', 'difficulty_level', 'position', 'created_at'}
+
+
+def _aggregate(experiences):
+    rows = experiences.values('company_id').annotate(
+        experience_count=Count('id'),
+        selected_count=Count('id', filter=Q(result='selected')),
+        rejected_count=Count('id', filter=Q(result='rejected')),
+        pending_count=Count('id', filter=Q(result='pending')),
+        difficulty_total=Sum('difficulty_level'),
+    ).order_by()
+    return {row.pop('company_id'): row for row in rows}
+
+
+def _recent_positions(experiences):
+    """Latest distinct positions per company, newest first"""
+    positions = {}
+    rows = experiences.order_by('company_id', '-created_at', '-id').values_list('company_id', 'position')
+    for company_id, position in rows.iterator(chunk_size=2000):
+        seen = positions.setdefault(company_id, [])
+        if len(seen) < RECENT_POSITIONS and position not in seen:
+            seen.append(position)
+    return positions
+
+
+def _build(experiences):
+    totals = _aggregate(experiences)
+    positions = _recent_positions(experiences)
+    return [
+        CompanyStats(company_id=company_id, recent_positions=positions.get(company_id, []), **values)
+        for company_id, values in totals.items()
+    ]
+
+
+def refresh_company_stats(company_ids):
+    """Recompute the stats rows of the given companies"""
+    company_ids = {company_id for company_id in company_ids if company_id is not None}
+    if not company_ids:
+        return
+    rows = _build(InterviewExperience.objects.filter(company_id__in=company_ids))
+    with transaction.atomic():
+        if rows:
+            CompanyStats.objects.bulk_create(rows, update_conflicts=True, unique_fields=['company'],
+                                             update_fields=STATS_FIELDS)
+        # Companies whose last experience went away
+        CompanyStats.objects.filter(company_id__in=company_ids - {row.company_id for row in rows}).delete()
+
+
+def rebuild_company_stats(batch_size=1000):
+    """Rebuild the whole table from scratch, returning the number of rows written"""
+    rows = _build(InterviewExperience.objects.all())
+    with transaction.atomic():
+        CompanyStats.objects.all().delete()
+        CompanyStats.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def empty_stats(company):
+    """Unsaved stats for a company without experiences"""
+    return CompanyStats(company=company)
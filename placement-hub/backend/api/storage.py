@@ -0,0 +1,86 @@
+"""
+File storage in a public Supabase Storage bucket.
+
+Serverless instances (Vercel) have read-only, per-instance disks, so files
+the app writes at runtime for every instance and client to read, like the
+catalog snapshot (api.catalog), go to a bucket instead. Files are uploaded
+and managed through the Storage REST API with the service role key and
+served from the bucket's public URL through Supabase's CDN.
+
+Names matching `immutable_names` (content-hashed files, by default the same
+pattern as WHITENOISE_IMMUTABLE_FILE_TEST) are uploaded with a far-future
+immutable Cache-Control; everything else must be revalidated. Saving an
+existing name replaces the object.
+"""
+
+import re
+from urllib.parse import quote
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+
+
+# Ten years, as WhiteNoise uses for immutable files
+IMMUTABLE_MAX_AGE = 10 * 365 * 24 * 60 * 60
+
+
+@deconstructible
+class SupabaseStorage(Storage):
+    def __init__(self, bucket, url=None, key=None, immutable_names=None, timeout=10):
+        self.bucket = bucket
+        self.base_url = (url or settings.SUPABASE_URL).rstrip('/')
+        self.key = key or settings.SUPABASE_SERVICE_ROLE_KEY
+        pattern = immutable_names or getattr(settings, 'WHITENOISE_IMMUTABLE_FILE_TEST', None)
+        self.immutable_names = re.compile(pattern) if pattern else None
+        self.timeout = timeout
+
+    def _object_url(self, name):
+        return f'{self.base_url}/storage/v1/object/{self.bucket}/{quote(name)}'
+
+    def _headers(self, **extra):
+        return {'Authorization': f'Bearer {self.key}', 'apikey': self.key, **extra}
+
+    def cache_control(self, name):
+        if self.immutable_names and self.immutable_names.search(name):
+            return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        return 'no-cache'
+
+    def _open(self, name, mode='rb'):
+        response = requests.get(self._object_url(name), headers=self._headers(), timeout=self.timeout)
+        # Storage answers 400 rather than 404 for some missing objects
+        if response.status_code in (400, 404):
+            raise FileNotFoundError(name)
+        response.raise_for_status()
+        return ContentFile(response.content, name=name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        headers = self._headers(**{
+            'Content-Type': getattr(content, 'content_type', None) or 'application/octet-stream',
+            'Cache-Control': self.cache_control(name),
+            'x-upsert': 'true',
+        })
+        response = requests.post(self._object_url(name), data=content.read(), headers=headers,
+                                 timeout=self.timeout)
+        response.raise_for_status()
+        return name
+
+    def get_available_name(self, name, max_length=None):
+        # Uploads replace existing objects
+        return name
+
+    def exists(self, name):
+        response = requests.head(self._object_url(name), headers=self._headers(), timeout=self.timeout)
+        return response.status_code == 200
+
+    def delete(self, name):
+        response = requests.delete(f'{self.base_url}/storage/v1/object/{self.bucket}', json={'prefixes': [name]},
+                                   headers=self._headers(), timeout=self.timeout)
+        response.raise_for_status()
+
+    def url(self, name):
+        return f'{self.base_url}/storage/v1/object/public/{self.bucket}/{quote(name)}'
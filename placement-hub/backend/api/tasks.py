@@ -0,0 +1,214 @@
+"""
+Lightweight database-backed task queue.
+
+Side effects that don't need to finish inside the request (points
+awards, derived data refreshes) are enqueued here and processed by
+`python manage.py run_tasks`, or on deployments that can't keep a worker
+running (Vercel) by a scheduled request to /api/tasks/run/, which drains
+due tasks for up to TASK_CRON_TIME_LIMIT seconds. No external broker is
+needed: tasks are rows in the api_task table. Pending tasks with the same
+dedupe key are coalesced into one, and handlers registered with
+``batch=True`` receive every due payload of their kind in a single call.
+
+A claimed task is marked running; if its worker dies it would stay that
+way, so tasks running for longer than TASK_LEASE_SECONDS are queued again
+(counted as a failed attempt) the next time tasks are claimed.
+
+Set TASK_QUEUE_EAGER = True to run tasks inline (useful for local
+development without a worker).
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task, UserProfile
+
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+# Done tasks are kept this long for inspection, then purged
+FINISHED_TASK_RETENTION_DAYS = 7
+
+# Points awarded to an experience author for every upvote received
+POINTS_PER_EXPERIENCE_UPVOTE = 2
+
+
+def task(name, batch=False):
+    """Register a task handler. Batch handlers are called with a list of payloads."""
+    def decorator(func):
+        _registry[name] = (func, batch)
+        return func
+    return decorator
+
+
+def _run_handler(name, payloads):
+    func, batch = _registry[name]
+    if batch:
+        func(payloads)
+    else:
+        for payload in payloads:
+            func(payload)
+
+
+def enqueue(name, payload=None, dedupe_key=None, delay=0):
+    """
+    Queue a task. If a pending task with the same dedupe key exists it is
+    reused, so repeated side effects collapse into one unit of work.
+    """
+    if name not in _registry:
+        raise ValueError(f'Unknown task: {name}')
+    payload = payload or {}
+
+    if getattr(settings, 'TASK_QUEUE_EAGER', False):
+        _run_handler(name, [payload])
+        return None
+
+    run_after = timezone.now() + timedelta(seconds=delay)
+    if dedupe_key:
+        existing = Task.objects.filter(dedupe_key=dedupe_key, status='pending').first()
+        if existing is not None:
+            return existing
+        try:
+            with transaction.atomic():
+                return Task.objects.create(name=name, payload=payload, dedupe_key=dedupe_key,
+                                           run_after=run_after)
+        except IntegrityError:
+            # Another request queued the same work in the meantime
+            return Task.objects.filter(dedupe_key=dedupe_key, status='pending').first()
+
+    return Task.objects.create(name=name, payload=payload, run_after=run_after)
+
+
+def task_lease_seconds():
+    return getattr(settings, 'TASK_LEASE_SECONDS', 600)
+
+
+def reclaim_expired(lease_seconds):
+    """
+    Put tasks that have been running for longer than `lease_seconds` (their
+    worker died) back in the queue, or fail them once out of attempts.
+    Returns how many were reclaimed.
+    """
+    now = timezone.now()
+    expired = list(Task.objects.filter(status='running', updated_at__lt=now - timedelta(seconds=lease_seconds)))
+    for t in expired:
+        t.attempts += 1
+        t.last_error = f'Not finished within {lease_seconds}s; the worker probably stopped'
+        if t.attempts >= t.max_attempts:
+            t.status = 'failed'
+        elif t.dedupe_key and Task.objects.filter(dedupe_key=t.dedupe_key, status='pending').exists():
+            # A newer pending duplicate will redo this work
+            t.status = 'done'
+        else:
+            t.status, t.run_after = 'pending', now
+        fields = dict(status=t.status, attempts=t.attempts, last_error=t.last_error, run_after=t.run_after,
+                      updated_at=now)
+        try:
+            with transaction.atomic():
+                Task.objects.filter(id=t.id, status='running').update(**fields)
+        except IntegrityError:
+            # A duplicate was queued in the meantime
+            Task.objects.filter(id=t.id, status='running').update(**{**fields, 'status': 'done'})
+    if expired:
+        logger.warning(f"Reclaimed {len(expired)} task(s) whose worker stopped")
+    return len(expired)
+
+
+def claim_due_tasks(limit):
+    """Mark up to `limit` due tasks as running and return them"""
+    with transaction.atomic():
+        due = Task.objects.filter(status='pending', run_after__lte=timezone.now()).order_by('run_after', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        tasks = list(due[:limit])
+        Task.objects.filter(id__in=[t.id for t in tasks]).update(status='running', updated_at=timezone.now())
+    return tasks
+
+
+def retry_delay(attempts):
+    """Exponential backoff between attempts, capped at one hour"""
+    return timedelta(seconds=min(2 ** attempts, 3600))
+
+
+def run_pending(limit=100):
+    """Process due tasks, grouped by name so batch handlers see them together. Returns the number run."""
+    reclaim_expired(task_lease_seconds())
+    tasks = claim_due_tasks(limit)
+    groups = {}
+    for t in tasks:
+        groups.setdefault(t.name, []).append(t)
+
+    for name, group in groups.items():
+        ids = [t.id for t in group]
+        try:
+            if name not in _registry:
+                raise ValueError(f'Unknown task: {name}')
+            _run_handler(name, [t.payload for t in group])
+        except Exception as e:
+            logger.exception(f"Task {name} failed for {len(group)} item(s)")
+            now = timezone.now()
+            for t in group:
+                t.attempts += 1
+                t.last_error = str(e)
+                if t.attempts >= t.max_attempts:
+                    t.status = 'failed'
+                else:
+                    t.status = 'pending'
+                    t.run_after = now + retry_delay(t.attempts)
+                    # A newer pending duplicate will redo this work; retire this one as superseded
+                    if t.dedupe_key and Task.objects.filter(dedupe_key=t.dedupe_key, status='pending').exists():
+                        t.status = 'done'
+                Task.objects.filter(id=t.id).update(status=t.status, attempts=t.attempts,
+                                                     last_error=t.last_error, run_after=t.run_after,
+                                                     updated_at=now)
+        else:
+            Task.objects.filter(id__in=ids).update(status='done', attempts=F('attempts') + 1,
+                                                   updated_at=timezone.now())
+
+    return len(tasks)
+
+
+def run_for(seconds, batch_size=100):
+    """Run due tasks in batches until none are left or `seconds` have passed. Returns the number run."""
+    deadline = time.monotonic() + seconds
+    processed = 0
+    while True:
+        count = run_pending(limit=batch_size)
+        processed += count
+        if count < batch_size or time.monotonic() >= deadline:
+            return processed
+
+
+def purge_finished(older_than):
+    """Delete done tasks last updated before `older_than`"""
+    deleted, _ = Task.objects.filter(status='done', updated_at__lt=older_than).delete()
+    return deleted
+
+
+@task('award_user_points', batch=True)
+def award_user_points(payloads):
+    """Add awarded points to their users, one UPDATE per distinct total"""
+    totals = defaultdict(int)
+    for p in payloads:
+        totals[p['user_id']] += p['points']
+    users_by_total = defaultdict(list)
+    for user_id, total in totals.items():
+        users_by_total[total].append(user_id)
+    # Applied as deltas, so points from other sources (and admin edits) are kept
+    with transaction.atomic():
+        for total, user_ids in users_by_total.items():
+            UserProfile.objects.filter(id__in=user_ids).update(points=F('points') + total)
+
+
+def award_points(user_id, points):
+    """Queue points for a user; a batch of awards is applied together"""
+    return enqueue('award_user_points', {'user_id': user_id, 'points': points})
@@ -1,8 +1,38 @@
-from django.test import TestCase
+import io
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import UserProfile, Subject, Post, Company, InterviewExperience
+from .models import Branch, UserProfile, Subject, Post, Company, InterviewExperience
+
+
+def cse_branch():
+    return Branch.objects.get_or_create(name='CSE')[0]
+
+
+def default_author():
+    return UserProfile.objects.get_or_create(
+        supabase_uid='test-uid-123', defaults={'email': 'test@cet.ac.in', 'full_name': 'Test User', 'year': 3}
+    )[0]
+
+
+def acme():
+    return Company.objects.get_or_create(name='Acme')[0]
+
+
+def add_experience(company=None, posted_by=None, **fields):
+    """Create an interview experience at Acme by the default author unless told otherwise"""
+    values = {'position': 'SDE', 'interview_date': '2025-08-01', 'rounds': 'Coding', 'questions': 'Two sum',
+              'difficulty_level': 2, 'result': 'selected', **fields}
+    return InterviewExperience.objects.create(company=company or acme(), posted_by=posted_by or default_author(),
+                                              **values)
+
+
+def clear_caches():
+    """Empty the default cache and the counters cache"""
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
 
 
 class UserProfileModelTest(TestCase):
@@ -13,7 +43,7 @@ class UserProfileModelTest(TestCase):
             supabase_uid='test-uid-123',
             email='test@cet.ac.in',
             full_name='Test User',
-            branch='CSE',
+            branch=cse_branch(),
             year=3
         )
     
@@ -29,7 +59,7 @@ class SubjectModelTest(TestCase):
     def test_subject_creation(self):
         subject = Subject.objects.create(
             name='Data Structures',
-            branch='CSE',
+            branch=cse_branch(),
             description='Basic data structures course'
         )
         self.assertEqual(str(subject), 'Data Structures (CSE)')
@@ -51,12 +81,12 @@ class PostModelTest(TestCase):
             supabase_uid='test-uid-123',
             email='test@cet.ac.in',
             full_name='Test User',
-            branch='CSE',
+            branch=cse_branch(),
             year=3
         )
         self.subject = Subject.objects.create(
             name='Data Structures',
-            branch='CSE'
+            branch=cse_branch()
         )
     
     def test_post_creation(self):
@@ -79,12 +109,12 @@ class APIEndpointTest(APITestCase):
             supabase_uid='test-uid-123',
             email='test@cet.ac.in',
             full_name='Test User',
-            branch='CSE',
+            branch=cse_branch(),
             year=3
         )
         self.subject = Subject.objects.create(
             name='Data Structures',
-            branch='CSE'
+            branch=cse_branch()
         )
     
     def test_subjects_list_endpoint(self):
@@ -100,3 +130,1812 @@ class APIEndpointTest(APITestCase):
         response = self.client.get(url)
         # Note: This will fail authentication, but tests the URL routing
         self.assertIn(response.status_code, [200, 401, 403])
+
+
+class CompressionMiddlewareTest(TestCase):
+    """Test cases for the response compression middleware"""
+
+    def setUp(self):
+        from django.test import RequestFactory
+        from .middleware import CompressionMiddleware, compressed_body_cache
+        compressed_body_cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = CompressionMiddleware(lambda request: None)
+
+    def _response(self, body, **headers):
+        from django.http import HttpResponse
+        response = HttpResponse(body, content_type='application/json')
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    def test_large_json_is_gzipped(self):
+        import gzip
+        body = b'{"topic": "Binary Trees"}' * 200
+        request = self.factory.get('/api/posts/', HTTP_ACCEPT_ENCODING='gzip')
+        response = self.middleware.process_response(request, self._response(body))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_response_is_not_compressed(self):
+        request = self.factory.get('/api/posts/', HTTP_ACCEPT_ENCODING='gzip')
+        response = self.middleware.process_response(request, self._response(b'{}'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_response_is_skipped(self):
+        from django.http import StreamingHttpResponse
+        request = self.factory.get('/api/posts/', HTTP_ACCEPT_ENCODING='gzip')
+        response = StreamingHttpResponse(iter([b'x' * 5000]), content_type='application/json')
+        response = self.middleware.process_response(request, response)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_gzip_refused_by_client(self):
+        body = b'{"topic": "Binary Trees"}' * 200
+        request = self.factory.get('/api/posts/', HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        response = self.middleware.process_response(request, self._response(body))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_cacheable_response_reuses_compressed_body(self):
+        from .middleware import compressed_body_cache
+        body = b'{"topic": "Binary Trees"}' * 200
+        request = self.factory.get('/api/posts/', HTTP_ACCEPT_ENCODING='gzip')
+        self.middleware.process_response(request, self._response(body, **{'Cache-Control': 'public, max-age=60'}))
+        self.assertEqual(len(compressed_body_cache._entries), 1)
+        self.middleware.process_response(request, self._response(body, **{'Cache-Control': 'public, max-age=60'}))
+        self.assertEqual(len(compressed_body_cache._entries), 1)
+
+
+class SparseFieldsetTest(APITestCase):
+    """Test cases for ?fields=/?omit= and summary list representations"""
+
+    def setUp(self):
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123',
+            email='test@cet.ac.in',
+            full_name='Test User',
+            branch=cse_branch(),
+            year=3
+        )
+        self.subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.post = Post.objects.create(
+            subject=self.subject,
+            posted_by=self.user_profile,
+            topic='Binary Trees',
+            focus_points='Tree traversal, height calculation'
+        )
+
+    def test_list_returns_summary_without_loading_bodies(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .serializers import PostSerializer
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), set(PostSerializer.Meta.summary_fields))
+        self.assertNotIn('focus_points', ' '.join(q['sql'] for q in queries.captured_queries))
+
+    def test_list_full_view(self):
+        response = self.client.get(reverse('post-list'), {'view': 'full'})
+        self.assertEqual(response.data[0]['focus_points'], 'Tree traversal, height calculation')
+
+    def test_retrieve_returns_full_representation(self):
+        response = self.client.get(reverse('post-detail', args=[self.post.id]))
+        self.assertIn('focus_points', response.data)
+
+    def test_fields_and_omit(self):
+        response = self.client.get(reverse('post-list'), {'fields': 'id,topic,net_score'})
+        self.assertEqual(set(response.data[0]), {'id', 'topic', 'net_score'})
+        response = self.client.get(reverse('post-detail', args=[self.post.id]), {'omit': 'focus_points'})
+        self.assertNotIn('focus_points', response.data)
+        self.assertIn('topic', response.data)
+
+
+class DashboardEndpointTest(APITestCase):
+    """Test cases for the aggregated user dashboard endpoint"""
+
+    def setUp(self):
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123',
+            email='test@cet.ac.in',
+            full_name='Test User',
+            branch=cse_branch(),
+            year=3
+        )
+        self.subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.company = Company.objects.create(name='Acme')
+
+    def _add_content(self, count):
+        for i in range(count):
+            Post.objects.create(subject=self.subject, posted_by=self.user_profile,
+                                topic=f'Topic {i}', upvotes=2, downvotes=1)
+            InterviewExperience.objects.create(
+                company=self.company, posted_by=self.user_profile, position='SDE',
+                interview_date='2025-08-01', rounds='Coding', questions='Two sum',
+                difficulty_level=2, result='selected', upvotes=1
+            )
+
+    def _dashboard(self, identifier):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('userprofile-dashboard', args=[identifier]))
+        return response, len(queries.captured_queries)
+
+    def test_dashboard_payload(self):
+        self._add_content(3)
+        response, _ = self._dashboard('test-uid-123')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['profile']['email'], 'test@cet.ac.in')
+        self.assertEqual(len(response.data['posts']), 3)
+        self.assertEqual(response.data['stats']['post_upvotes'], 6)
+        self.assertEqual(response.data['stats']['experiences_count'], 3)
+        self.assertEqual(response.data['subjects'][0]['posts_count'], 3)
+
+    def test_dashboard_by_database_id(self):
+        response, _ = self._dashboard(str(self.user_profile.id))
+        self.assertEqual(response.data['profile']['supabase_uid'], 'test-uid-123')
+
+    def test_dashboard_unknown_user(self):
+        response, _ = self._dashboard('missing')
+        self.assertEqual(response.status_code, 404)
+
+    def test_dashboard_limit_is_clamped(self):
+        self._add_content(2)
+        response = self.client.get(reverse('userprofile-dashboard', args=['test-uid-123']), {'limit': '-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['posts']), 1)
+
+    def test_query_count_does_not_grow_with_content(self):
+        self._add_content(1)
+        _, few = self._dashboard('test-uid-123')
+        self._add_content(10)
+        _, many = self._dashboard('test-uid-123')
+        self.assertEqual(few, many)
+
+
+class MyVotesEndpointTest(APITestCase):
+    """Test cases for the batch "my votes" lookup"""
+
+    def setUp(self):
+        from .models import PostVote, ExperienceVote
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123',
+            email='test@cet.ac.in',
+            full_name='Test User',
+            branch=cse_branch(),
+            year=3
+        )
+        subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        company = Company.objects.create(name='Acme')
+        self.posts = [Post.objects.create(subject=subject, posted_by=self.user_profile, topic=f'Topic {i}')
+                      for i in range(3)]
+        self.experience = InterviewExperience.objects.create(
+            company=company, posted_by=self.user_profile, position='SDE',
+            interview_date='2025-08-01', rounds='Coding', questions='Two sum',
+            difficulty_level=2, result='selected'
+        )
+        PostVote.objects.create(user=self.user_profile, post=self.posts[0], vote=1)
+        PostVote.objects.create(user=self.user_profile, post=self.posts[1], vote=-1)
+        ExperienceVote.objects.create(user=self.user_profile, experience=self.experience, is_upvote=True)
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse('my_votes'), {'posts': '1'})
+        self.assertIn(response.status_code, [401, 403])
+
+    def test_batch_lookup_uses_two_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.client.force_authenticate(user=self.user_profile)
+        ids = ','.join(str(p.id) for p in self.posts)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('my_votes'),
+                                       {'posts': ids, 'experiences': str(self.experience.id)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries.captured_queries), 2)
+        self.assertEqual(response.data['posts'], {
+            str(self.posts[0].id): 1, str(self.posts[1].id): -1, str(self.posts[2].id): None,
+        })
+        self.assertEqual(response.data['experiences'], {str(self.experience.id): True})
+
+    def test_post_body(self):
+        self.client.force_authenticate(user=self.user_profile)
+        response = self.client.post(reverse('my_votes'), {'posts': [self.posts[0].id]}, format='json')
+        self.assertEqual(response.data['posts'], {str(self.posts[0].id): 1})
+
+    def test_malformed_body(self):
+        self.client.force_authenticate(user=self.user_profile)
+        response = self.client.post(reverse('my_votes'), [1, 2], format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('my_votes'), {'posts': 5, 'experiences': {'a': 1}}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'posts': {}, 'experiences': {}})
+
+
+class PublicListCacheTest(APITestCase):
+    """Test cases for the shared public list cache"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123',
+            email='test@cet.ac.in',
+            full_name='Test User',
+            branch=cse_branch(),
+            year=3
+        )
+        self.subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Binary Trees')
+
+    def test_public_list_is_cached_and_shareable(self):
+        url = reverse('post-list')
+        first = self.client.get(url, {'public': '1'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertIn('public', first['Cache-Control'])
+        self.assertIn('Accept-Encoding', first['Vary'])
+        self.assertIn('Accept', [value.strip() for value in first['Vary'].split(',')])
+        self.assertNotIn('user_vote', first.data[0])
+
+        # Personal requests with the same query share the cached payload
+        self.client.force_authenticate(user=self.user_profile)
+        second = self.client.get(url, {'public': '1'})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_new_post_invalidates_public_lists(self):
+        url = reverse('post-list')
+        self.client.get(url, {'public': '1'})
+        Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Graphs')
+        response = self.client.get(url, {'public': '1'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data), 2)
+
+    def test_personal_list_is_not_cached(self):
+        response = self.client.get(reverse('post-list'))
+        self.assertFalse(response.has_header('X-Cache'))
+        self.assertIn('user_vote', response.data[0])
+
+    def test_company_experiences_public_mode(self):
+        company = Company.objects.create(name='Acme')
+        url = reverse('company-experiences', args=[company.id])
+        self.assertEqual(self.client.get(url, {'public': '1'})['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url, {'public': '1'})['X-Cache'], 'HIT')
+
+    @override_settings(PUBLIC_LIST_CACHE_TIMEOUT=0)
+    def test_expired_entry_served_stale_while_refreshing(self):
+        from django.core.cache import cache
+        from django.test import RequestFactory
+        from .cache import payload_key
+        url = reverse('post-list')
+        first = self.client.get(url, {'public': '1'})
+        self.assertIn('stale-while-revalidate=300', first['Cache-Control'])
+        Post.objects.filter(topic='Binary Trees').update(topic='Heaps')
+
+        # While another request holds the refresh lock the expired page is served as is
+        key = payload_key('posts', RequestFactory().get(url, {'public': '1'}))
+        cache.add(f'{key}:refresh', 1)
+        stale = self.client.get(url, {'public': '1'})
+        self.assertEqual(stale['X-Cache'], 'STALE')
+        self.assertEqual(stale.data[0]['topic'], 'Binary Trees')
+
+        # Once the lock is free the next request rebuilds it
+        cache.delete(f'{key}:refresh')
+        fresh = self.client.get(url, {'public': '1'})
+        self.assertEqual(fresh['X-Cache'], 'MISS')
+        self.assertEqual(fresh.data[0]['topic'], 'Heaps')
+
+    def test_single_flight_coalesces_concurrent_calls(self):
+        import threading
+        import time
+        from .cache import SingleFlight
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def build():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return ['payload']
+
+        def request():
+            results.append(flight.do('key', build))
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.2)  # let the followers start waiting on the leader
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertTrue(all(result == ['payload'] for result, _ in results))
+
+
+class SeedDataCommandTest(TestCase):
+    """Test cases for the synthetic data generator"""
+
+    def test_seed_data_counts_match_votes(self):
+        from django.core.management import call_command
+        from django.db.models import Sum
+        from .models import PostVote
+        call_command('seed_data', users=20, companies=3, posts=50, experiences=10,
+                     batch_size=7, stdout=io.StringIO())
+        self.assertEqual(UserProfile.objects.count(), 20)
+        self.assertEqual(Post.objects.count(), 50)
+        totals = Post.objects.aggregate(up=Sum('upvotes'), down=Sum('downvotes'))
+        self.assertEqual(totals['up'], PostVote.objects.filter(vote=1).count())
+        self.assertEqual(totals['down'], PostVote.objects.filter(vote=-1).count())
+
+
+# Maximum queries and database time (ms) per endpoint/action. Counts must hold
+# for any number of rows, so every budget is checked with 1 and 100 rows.
+QUERY_BUDGETS = {
+    'branch-list': (1, 50),
+    'branch-detail': (1, 50),
+    'userprofile-list': (1, 50),
+    'userprofile-detail': (2, 50),
+    'userprofile-dashboard': (7, 100),
+    'subject-list': (1, 50),
+    'subject-detail': (1, 50),
+    'subject-posts': (3, 50),
+    'post-list': (2, 50),
+    'post-detail': (3, 50),  # + queuing the view counter flush on the first view since the last one
+    'post-vote': (4, 50),
+    'post-related': (1, 50),
+    'company-list': (1, 50),
+    'company-detail': (1, 50),
+    'company-experiences': (3, 50),
+    'company-stats': (1, 50),
+    'company-all-stats': (1, 50),
+    'company-questions': (1, 50),
+    'experience-list': (2, 50),
+    'experience-detail': (3, 50),  # + queuing the view counter flush, as for posts
+    'experience-vote': (5, 50),
+    'home-feed': (5, 50),  # One range scan per feed: common, branch and senior
+    'autocomplete': (3, 50),  # cold: one query per kind to build its index, then none
+}
+
+
+class QueryBudgetMixin:
+    """Assert that a request stays within its declared query count and DB time budget"""
+
+    def assertWithinBudget(self, name, make_request):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        max_queries, max_db_ms = QUERY_BUDGETS[name]
+        with CaptureQueriesContext(connection) as context:
+            response = make_request()
+        queries = context.captured_queries
+        db_ms = sum(float(query['time']) for query in queries) * 1000
+        self.assertLess(response.status_code, 400, f'{name} returned {response.status_code}')
+        self.assertLessEqual(
+            len(queries), max_queries,
+            f'{name} ran {len(queries)} queries (budget {max_queries}):\n'
+            + '\n'.join(query['sql'] for query in queries)
+        )
+        self.assertLessEqual(db_ms, max_db_ms, f'{name} spent {db_ms:.1f}ms in the database')
+        return len(queries)
+
+
+@override_settings(VIEW_COUNTING=True)
+class QueryBudgetTest(QueryBudgetMixin, APITestCase):
+    """Query budgets for every viewset endpoint, with 1 and 100 rows"""
+
+    def setUp(self):
+        from .models import PostVote, ExperienceVote
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123',
+            email='test@cet.ac.in',
+            full_name='Test User',
+            branch=cse_branch(),
+            year=3
+        )
+        self.branch = cse_branch()
+        self.subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.company = Company.objects.create(name='Acme')
+        self.post = Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Trees')
+        Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Binary trees')
+        from .related import rebuild_related_posts
+        rebuild_related_posts()
+        self.experience = InterviewExperience.objects.create(
+            company=self.company, posted_by=self.user_profile, position='SDE', interview_date='2025-08-01',
+            rounds='Coding', questions='Two sum', difficulty_level=2, result='selected'
+        )
+        # Existing votes keep both runs of the vote actions on the same (update) path
+        PostVote.objects.create(user=self.user_profile, post=self.post, vote=1)
+        ExperienceVote.objects.create(user=self.user_profile, experience=self.experience, is_upvote=True)
+        self.client.force_authenticate(user=self.user_profile)
+
+    def _populate(self, rows):
+        from .models import PostVote, ExperienceVote
+        for i in range(rows):
+            author = UserProfile.objects.create(supabase_uid=f'uid-{rows}-{i}', email=f'{rows}-{i}@cet.ac.in',
+                                                full_name=f'Student {i}', branch=cse_branch(), year=2)
+            Branch.objects.create(name=f'Branch {rows}-{i}')
+            Subject.objects.create(name=f'Subject {rows}-{i}', branch=cse_branch())
+            Company.objects.create(name=f'Company {rows}-{i}')
+            post = Post.objects.create(subject=self.subject, posted_by=author, topic=f'Topic {i}')
+            experience = InterviewExperience.objects.create(
+                company=self.company, posted_by=author, position='SDE', interview_date='2025-08-01',
+                rounds='Coding', questions='Two sum', difficulty_level=2, result='selected'
+            )
+            PostVote.objects.create(user=self.user_profile, post=post, vote=1)
+            ExperienceVote.objects.create(user=self.user_profile, experience=experience, is_upvote=True)
+
+    def _check_scaling(self, requests):
+        """Run each named request with 1 and then 100 rows; counts must not change"""
+        counts = {}
+        for rows in (1, 99):
+            self._populate(rows)
+            # Start each round cold so cache dependent work (like queuing a view counter flush) is the same
+            clear_caches()
+            for name, make_request in requests.items():
+                with self.subTest(endpoint=name, rows=rows):
+                    count = self.assertWithinBudget(name, make_request)
+                    counts.setdefault(name, set()).add(count)
+        for name, seen in counts.items():
+            self.assertEqual(len(seen), 1, f'{name} query count grows with rows: {sorted(seen)}')
+
+    def test_branch_endpoints(self):
+        self._check_scaling({
+            'branch-list': lambda: self.client.get(reverse('branch-list')),
+            'branch-detail': lambda: self.client.get(reverse('branch-detail', args=[self.branch.id])),
+        })
+
+    def test_user_profile_endpoints(self):
+        self._check_scaling({
+            'userprofile-list': lambda: self.client.get(reverse('userprofile-list')),
+            'userprofile-detail': lambda: self.client.get(reverse('userprofile-detail', args=['test-uid-123'])),
+            'userprofile-dashboard': lambda: self.client.get(
+                reverse('userprofile-dashboard', args=['test-uid-123'])),
+        })
+
+    def test_subject_endpoints(self):
+        self._check_scaling({
+            'subject-list': lambda: self.client.get(reverse('subject-list')),
+            'subject-detail': lambda: self.client.get(reverse('subject-detail', args=[self.subject.id])),
+            'subject-posts': lambda: self.client.get(reverse('subject-posts', args=[self.subject.id]),
+                                                     {'view': 'full'}),
+        })
+
+    def test_post_endpoints(self):
+        import itertools
+        # Alternate so every measured vote changes the stored vote and the counters
+        votes = itertools.cycle([-1, 1])
+        self._check_scaling({
+            'post-list': lambda: self.client.get(reverse('post-list'), {'view': 'full'}),
+            'post-detail': lambda: self.client.get(reverse('post-detail', args=[self.post.id])),
+            'post-vote': lambda: self.client.post(reverse('post-vote', args=[self.post.id]),
+                                                  {'vote': next(votes)}, format='json'),
+            'post-related': lambda: self.client.get(reverse('post-related', args=[self.post.id])),
+        })
+
+    def test_company_endpoints(self):
+        self._check_scaling({
+            'company-list': lambda: self.client.get(reverse('company-list')),
+            'company-detail': lambda: self.client.get(reverse('company-detail', args=[self.company.id])),
+            'company-experiences': lambda: self.client.get(
+                reverse('company-experiences', args=[self.company.id]), {'view': 'full'}),
+            'company-stats': lambda: self.client.get(reverse('company-stats', args=[self.company.id])),
+            'company-all-stats': lambda: self.client.get(reverse('company-all-stats')),
+            'company-questions': lambda: self.client.get(reverse('company-questions', args=[self.company.id])),
+        })
+
+    def test_feed_endpoint(self):
+        self._check_scaling({
+            'home-feed': lambda: self.client.get(reverse('home_feed')),
+        })
+
+    def test_autocomplete_endpoint(self):
+        self._check_scaling({
+            'autocomplete': lambda: self.client.get(reverse('autocomplete'), {'q': 'co'}),
+        })
+
+    def test_experience_endpoints(self):
+        self._check_scaling({
+            'experience-list': lambda: self.client.get(reverse('interviewexperience-list'), {'view': 'full'}),
+            'experience-detail': lambda: self.client.get(
+                reverse('interviewexperience-detail', args=[self.experience.id])),
+            'experience-vote': lambda: self.client.post(
+                reverse('interviewexperience-vote', args=[self.experience.id]),
+                {'is_upvote': False}, format='json'),
+        })
+
+
+class AsyncViewsTest(TestCase):
+    """Test cases for the async read endpoints"""
+
+    def setUp(self):
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123',
+            email='test@cet.ac.in',
+            full_name='Test User',
+            branch=cse_branch(),
+            year=3
+        )
+        self.subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.company = Company.objects.create(name='Acme')
+        Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Binary Trees',
+                            upvotes=3, downvotes=1)
+        InterviewExperience.objects.create(
+            company=self.company, posted_by=self.user_profile, position='SDE',
+            interview_date='2025-08-01', rounds='Coding', questions='Two sum',
+            difficulty_level=2, result='selected'
+        )
+
+    async def test_async_post_list(self):
+        response = await self.async_client.get(reverse('async_post_list'), {'user': 'test-uid-123'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data[0]['topic'], 'Binary Trees')
+        self.assertEqual(data[0]['net_score'], 2)
+        self.assertEqual(data[0]['posted_by_name'], 'Test User')
+
+    async def test_async_company_experiences(self):
+        response = await self.async_client.get(reverse('async_company_experiences', args=[self.company.id]))
+        self.assertEqual(response.json()[0]['company_name'], 'Acme')
+        missing = await self.async_client.get(reverse('async_company_experiences', args=[self.company.id + 1]))
+        self.assertEqual(missing.status_code, 404)
+
+    @override_settings(VOTE_WRITE_BEHIND=True)
+    async def test_summaries_match_the_public_list(self):
+        from asgiref.sync import sync_to_async
+        from .votes import apply_post_vote_delta
+        await sync_to_async(clear_caches)()
+        post = await Post.objects.aget(topic='Binary Trees')
+        await sync_to_async(apply_post_vote_delta)(post, 1, 0)
+        expected = await sync_to_async(lambda: self.client.get(reverse('post-list'), {'public': '1'}).json())()
+        response = await self.async_client.get(reverse('async_post_list'))
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(response.json()[0]['upvotes'], 4)
+        self.assertIn('view_count', response.json()[0])
+
+    async def test_served_from_the_public_cache_and_throttled(self):
+        from asgiref.sync import sync_to_async
+        from django.conf import settings
+        await sync_to_async(clear_caches)()
+        url = reverse('async_post_list')
+        rates = {'read': '100/min', 'anon_read': '1/min'}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            first = await self.async_client.get(url)
+            again = await self.async_client.get(url)
+            other = await self.async_client.get(url, {'offset': 1})
+        self.assertEqual([first['X-Cache'], again['X-Cache']], ['MISS', 'HIT'])
+        self.assertIn('max-age', first['Cache-Control'])
+        self.assertEqual(other.status_code, 429)
+        self.assertIn('Retry-After', other)
+
+    async def test_async_health(self):
+        response = await self.async_client.get(reverse('async_health_check'))
+        self.assertEqual(response.json()['companies'], 1)
+
+
+class TaskQueueTest(TestCase):
+    """Test cases for the database-backed task queue"""
+
+    def setUp(self):
+        self.author = UserProfile.objects.create(
+            supabase_uid='author-uid', email='author@cet.ac.in', full_name='Author', year=4
+        )
+        self.voters = [UserProfile.objects.create(supabase_uid=f'voter-{i}', email=f'voter{i}@cet.ac.in',
+                                                  full_name=f'Voter {i}', year=2) for i in range(3)]
+        self.experience = InterviewExperience.objects.create(
+            company=Company.objects.create(name='Acme'), posted_by=self.author, position='SDE',
+            interview_date='2025-08-01', rounds='Coding', questions='Two sum',
+            difficulty_level=2, result='selected'
+        )
+
+    def test_votes_defer_and_batch_points(self):
+        from rest_framework.test import APIClient
+        from .models import Task
+        from .tasks import run_pending
+        # Points from elsewhere (e.g. set by an admin) are kept
+        UserProfile.objects.filter(pk=self.author.pk).update(points=5)
+        client = APIClient()
+        for voter in self.voters:
+            client.force_authenticate(user=voter)
+            client.post(reverse('interviewexperience-vote', args=[self.experience.id]),
+                        {'is_upvote': True}, format='json')
+        client.post(reverse('interviewexperience-vote', args=[self.experience.id]),
+                    {'is_upvote': False}, format='json')
+
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.points, 5)
+        points_tasks = Task.objects.filter(name='award_user_points')
+        self.assertEqual(points_tasks.filter(status='pending').count(), 3)
+
+        self.assertEqual(run_pending(), 3)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.points, 11)
+        self.assertFalse(points_tasks.exclude(status='done').exists())
+
+    def test_failed_task_is_retried_with_backoff(self):
+        from django.utils import timezone
+        from .models import Task
+        from .tasks import task, enqueue, run_pending
+
+        @task('always_fails')
+        def always_fails(payload):
+            raise RuntimeError('boom')
+
+        queued = enqueue('always_fails', {'n': 1})
+        run_pending()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'pending')
+        self.assertEqual(queued.attempts, 1)
+        self.assertGreater(queued.run_after, timezone.now())
+        self.assertEqual(queued.last_error, 'boom')
+
+        Task.objects.filter(id=queued.id).update(attempts=4, run_after=timezone.now())
+        run_pending()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'failed')
+
+    def test_stranded_running_tasks_are_reclaimed(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import Task
+        from .tasks import award_points, claim_due_tasks, run_pending
+        award_points(self.author.id, 2)
+        stranded = claim_due_tasks(10)[0]
+        # The worker died: nothing finishes the task until its lease runs out
+        self.assertEqual(run_pending(), 0)
+        Task.objects.filter(id=stranded.id).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_pending(), 1)
+        stranded.refresh_from_db()
+        self.assertEqual((stranded.status, stranded.attempts), ('done', 2))
+
+    @override_settings(CRON_SECRET='s3cret')
+    def test_cron_endpoint_runs_due_tasks(self):
+        from .tasks import award_points
+        award_points(self.author.id, 2)
+        url = reverse('run_due_tasks')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.json()['processed'], 1)
+
+    def test_eager_mode_runs_inline(self):
+        from django.test import override_settings
+        from .tasks import award_points
+        with override_settings(TASK_QUEUE_EAGER=True):
+            award_points(self.author.id, 2)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.points, 2)
+
+
+@override_settings(VOTE_WRITE_BEHIND=True)
+class VoteWriteBehindTest(APITestCase):
+    """Test cases for buffered post vote counters"""
+
+    def setUp(self):
+        clear_caches()
+        author = UserProfile.objects.create(
+            supabase_uid='author-uid', email='author@cet.ac.in', full_name='Author', year=4
+        )
+        self.voters = [UserProfile.objects.create(supabase_uid=f'voter-{i}', email=f'voter{i}@cet.ac.in',
+                                                  full_name=f'Voter {i}', year=2) for i in range(3)]
+        subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.post = Post.objects.create(subject=subject, posted_by=author, topic='Trees')
+
+    def vote(self, voter, value):
+        self.client.force_authenticate(user=voter)
+        return self.client.post(reverse('post-vote', args=[self.post.id]), {'vote': value}, format='json')
+
+    def test_votes_are_buffered_and_visible(self):
+        from .models import Task
+        self.vote(self.voters[0], 1)
+        self.vote(self.voters[1], 1)
+        response = self.vote(self.voters[2], -1)
+
+        # The voter sees their own vote even though the row isn't updated yet
+        self.assertEqual((response.data['upvotes'], response.data['downvotes']), (2, 1))
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.upvotes, self.post.downvotes), (0, 0))
+        self.assertEqual(Task.objects.filter(name='flush_post_votes', status='pending').count(), 1)
+
+        detail = self.client.get(reverse('post-detail', args=[self.post.id]))
+        self.assertEqual((detail.data['upvotes'], detail.data['downvotes'], detail.data['net_score']), (2, 1, 1))
+        listed = self.client.get(reverse('post-list'))
+        self.assertEqual(listed.data[0]['net_score'], 1)
+
+    def test_flush_writes_counters_once(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from django.utils import timezone
+        from .models import Task
+        from .tasks import run_pending
+        self.vote(self.voters[0], 1)
+        self.vote(self.voters[1], -1)
+        self.vote(self.voters[1], 1)   # switch from down to up
+        self.vote(self.voters[2], 1)
+        self.vote(self.voters[2], 0)   # and remove again
+
+        Task.objects.filter(name='flush_post_votes').update(run_after=timezone.now())
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(run_pending(), 1)
+        updates = [q for q in queries.captured_queries
+                   if q['sql'].startswith('UPDATE') and '"upvotes"' in q['sql']]
+        self.assertEqual(len(updates), 1)
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.upvotes, self.post.downvotes), (2, 0))
+        detail = self.client.get(reverse('post-detail', args=[self.post.id]))
+        self.assertEqual((detail.data['upvotes'], detail.data['downvotes']), (2, 0))
+
+    def test_deltas_survive_a_busy_default_cache(self):
+        from django.core.cache import cache
+        self.vote(self.voters[0], 1)
+        cache.clear()
+        self.assertEqual(self.vote(self.voters[1], 1).data['upvotes'], 2)
+
+    def test_counter_lost_between_calls(self):
+        from unittest import mock
+        from .counters import counter_cache
+        from .votes import flush_post_votes
+        self.vote(self.voters[0], 1)
+        counter_cache().clear()
+        # Gone before the increment: the vote recreates it instead of failing
+        with mock.patch.object(counter_cache(), 'add', return_value=True):
+            self.assertEqual(self.vote(self.voters[1], 1).status_code, 200)
+        # ...and before the flush's decrement: nothing left to reschedule
+        with mock.patch('api.votes.counters.counter_cache') as counters:
+            counters.return_value.get_many.return_value = {'votebuf:post:%d:up' % self.post.id: 1}
+            counters.return_value.decr.side_effect = ValueError
+            flush_post_votes([{'post_id': self.post.id}])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.upvotes, 1)
+
+
+class RankingTest(APITestCase):
+    """Test cases for hot/top/new ordering"""
+
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123', email='test@cet.ac.in', full_name='Test User', year=3
+        )
+        self.voters = [UserProfile.objects.create(supabase_uid=f'voter-{i}', email=f'voter{i}@cet.ac.in',
+                                                  full_name=f'Voter {i}', year=2) for i in range(2)]
+        subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        now = timezone.now()
+        # An old, popular post and a fresh one with a single vote
+        self.old = Post.objects.create(subject=subject, posted_by=self.user_profile, topic='Old', upvotes=50)
+        self.new = Post.objects.create(subject=subject, posted_by=self.user_profile, topic='New', upvotes=1)
+        Post.objects.filter(pk=self.old.pk).update(created_at=now - timedelta(days=3))
+        Post.objects.filter(pk=self.new.pk).update(created_at=now - timedelta(hours=1))
+
+    def topics(self, ordering):
+        response = self.client.get(reverse('post-list'), {'ordering': ordering})
+        return [post['topic'] for post in response.data]
+
+    def test_orderings(self):
+        from django.core.management import call_command
+        call_command('refresh_hot_scores', stdout=io.StringIO())
+        self.assertEqual(self.topics('hot'), ['New', 'Old'])
+        self.assertEqual(self.topics('top'), ['Old', 'New'])
+        self.assertEqual(self.topics('new'), ['New', 'Old'])
+        self.assertEqual(self.topics('bogus'), ['New', 'Old'])
+
+    def test_votes_update_hot_score(self):
+        from .ranking import hot_score
+        self.new.refresh_from_db()
+        for voter in self.voters:
+            self.client.force_authenticate(user=voter)
+            self.client.post(reverse('post-vote', args=[self.new.id]), {'vote': 1}, format='json')
+        self.new.refresh_from_db()
+        self.assertEqual(self.new.upvotes, 3)
+        self.assertAlmostEqual(self.new.hot_score, hot_score(3, self.new.created_at))
+
+    def test_refresh_command_backfills(self):
+        from django.core.management import call_command
+        from .ranking import hot_score
+        Post.objects.update(hot_score=0)
+        out = io.StringIO()
+        call_command('refresh_hot_scores', '--only', 'posts', stdout=out)
+        self.assertIn('posts: 2 score(s) updated', out.getvalue())
+        self.old.refresh_from_db()
+        self.assertAlmostEqual(self.old.hot_score, hot_score(50, self.old.created_at))
+
+
+class CompanyStatsTest(APITestCase):
+    """Test cases for the precomputed company statistics"""
+
+    def setUp(self):
+        self.company = acme()
+        self.other = Company.objects.create(name='Globex')
+
+    def stats(self, company=None):
+        response = self.client.get(reverse('company-stats', args=[(company or self.company).id]))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_stats_follow_experience_changes(self):
+        self.assertEqual(self.stats()['experience_count'], 0)
+        add_experience(position='SDE', result='selected', difficulty_level=3)
+        add_experience(position='Analyst', result='rejected', difficulty_level=1)
+        moved = add_experience(position='SDE Intern', result='pending', difficulty_level=2)
+
+        data = self.stats()
+        self.assertEqual(data['experience_count'], 3)
+        self.assertEqual(data['result_counts'], {'selected': 1, 'rejected': 1, 'pending': 1})
+        self.assertEqual(data['average_difficulty'], 2.0)
+        self.assertEqual(data['selection_rate'], 0.5)
+        self.assertEqual(data['recent_positions'], ['SDE Intern', 'Analyst', 'SDE'])
+
+        moved.company = self.other
+        moved.save()
+        self.assertEqual(self.stats()['experience_count'], 2)
+        self.assertEqual(self.stats(self.other)['experience_count'], 1)
+
+        moved.delete()
+        self.assertEqual(self.stats(self.other)['experience_count'], 0)
+
+    def test_rebuild_and_list(self):
+        from django.core.management import call_command
+        from .models import CompanyStats
+        add_experience(position='SDE', result='selected', difficulty_level=3)
+        add_experience(position='SDE', result='selected', difficulty_level=2, company=self.other)
+        CompanyStats.objects.all().delete()
+
+        out = io.StringIO()
+        call_command('rebuild_company_stats', stdout=out)
+        self.assertIn('2 row(s) rebuilt', out.getvalue())
+        response = self.client.get(reverse('company-all-stats'))
+        self.assertEqual([row['company_name'] for row in response.data], ['Acme', 'Globex'])
+        self.assertEqual(response.data[0]['recent_positions'], ['SDE'])
+
+
+class ThrottlingTest(APITestCase):
+    """Test cases for the sliding-window throttle"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.voters = [UserProfile.objects.create(supabase_uid=f'voter-{i}', email=f'voter{i}@cet.ac.in',
+                                                  full_name=f'Voter {i}', year=2) for i in range(2)]
+        subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.post = Post.objects.create(subject=subject, posted_by=self.voters[0], topic='Trees')
+
+    def rates(self, **rates):
+        from django.conf import settings
+        return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+    def test_sliding_window(self):
+        from .throttling import SlidingWindow
+        window = SlidingWindow(limit=2, period=60)
+        self.assertTrue(window.allows(0, 2, 1))
+        self.assertFalse(window.allows(0, 3, 1))
+        # Both requests slide out of the next window's estimate half way through it
+        self.assertAlmostEqual(window.wait(0, 2, 1), 89)
+        self.assertFalse(window.allows(2, 1, 29))
+        self.assertTrue(window.allows(2, 1, 30))
+        self.assertAlmostEqual(window.wait(2, 0, 0), 30)
+
+    def test_votes_throttled_per_user(self):
+        url = reverse('post-vote', args=[self.post.id])
+        with self.rates(vote='2/min', read='100/min'):
+            self.client.force_authenticate(user=self.voters[0])
+            codes = [self.client.post(url, {'vote': v}, format='json').status_code for v in (1, -1, 1)]
+            self.assertEqual(codes, [200, 200, 429])
+            response = self.client.post(url, {'vote': 1}, format='json')
+            self.assertIn('Retry-After', response)
+            # Reads and other users have their own buckets
+            self.assertEqual(self.client.get(reverse('post-list')).status_code, 200)
+            self.client.force_authenticate(user=self.voters[1])
+            self.assertEqual(self.client.post(url, {'vote': 1}, format='json').status_code, 200)
+
+    def test_anonymous_clients_throttled_per_ip(self):
+        url = reverse('post-list')
+        with self.rates(read='100/min', anon_read='2/min'):
+            codes = [self.client.get(url, REMOTE_ADDR='10.0.0.1').status_code for _ in range(3)]
+            self.assertEqual(codes, [200, 200, 429])
+            self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_unverified_identities_throttled_per_ip(self):
+        url = reverse('post-vote', args=[self.post.id])
+        with self.rates(vote='100/min', anon_vote='1/min'):
+            for voter in self.voters:
+                voter.identity_verified = False
+            self.client.force_authenticate(user=self.voters[0])
+            self.assertEqual(self.client.post(url, {'vote': 1}, format='json').status_code, 200)
+            # A different token subject from the same address shares the budget
+            self.client.force_authenticate(user=self.voters[1])
+            self.assertEqual(self.client.post(url, {'vote': 1}, format='json').status_code, 429)
+
+    def test_client_ip_behind_trusted_proxies(self):
+        from django.conf import settings
+        url = reverse('post-list')
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1,
+                                               'DEFAULT_THROTTLE_RATES': {'read': '100/min', 'anon_read': '1/min'}}):
+            first = self.client.get(url, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.1.1.1, 10.0.0.9')
+            spoofed = self.client.get(url, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='2.2.2.2, 10.0.0.9')
+            other = self.client.get(url, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='3.3.3.3')
+        self.assertEqual([first.status_code, spoofed.status_code, other.status_code], [200, 429, 200])
+
+    def test_cached_public_reads_not_counted(self):
+        from django.conf import settings
+        subject_posts = reverse('subject-posts', args=[self.post.subject_id])
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1,
+                                               'DEFAULT_THROTTLE_RATES': {'read': '100/min', 'anon_read': '2/min'}}):
+            # A campus behind one NAT address: the first public read of each list fills the cache
+            for url in (reverse('post-list'), subject_posts):
+                codes = [self.client.get(url, {'public': 1}, REMOTE_ADDR='10.0.0.1',
+                                         HTTP_X_FORWARDED_FOR='203.0.113.7').status_code
+                         for _ in range(20)]
+                self.assertEqual(codes, [200] * 20)
+            # Uncached reads still share the address's budget
+            codes = [self.client.get(reverse('post-list'), {'page': 1, 'public': 1}, REMOTE_ADDR='10.0.0.1',
+                                     HTTP_X_FORWARDED_FOR='203.0.113.7').status_code,
+                     self.client.get(reverse('post-list'), REMOTE_ADDR='10.0.0.1',
+                                     HTTP_X_FORWARDED_FOR='203.0.113.7').status_code]
+        self.assertEqual(codes, [429, 429])
+
+
+class IdentityResolverTest(APITestCase):
+    """Test cases for resolving users by Supabase UID or database id"""
+
+    def setUp(self):
+        from .identity import profile_ids
+        profile_ids.clear()
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123', email='test@cet.ac.in', full_name='Test User', year=3
+        )
+        subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        Post.objects.create(subject=subject, posted_by=self.user_profile, topic='Trees')
+
+    def test_retrieve_by_uid_or_id_in_one_query(self):
+        for identifier in ('test-uid-123', str(self.user_profile.id)):
+            with self.assertNumQueries(1):
+                response = self.client.get(reverse('userprofile-detail', args=[identifier]))
+            self.assertEqual(response.data['supabase_uid'], 'test-uid-123')
+        self.assertEqual(self.client.get(reverse('userprofile-detail', args=['nobody'])).status_code, 404)
+
+    def test_posts_filtered_by_uid_without_profile_lookup(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post-list'), {'user': 'test-uid-123'})
+        self.assertEqual([post['topic'] for post in response.data], ['Trees'])
+        self.assertFalse(any(q['sql'].startswith('SELECT') and 'FROM "api_userprofile"' in q['sql']
+                             for q in queries.captured_queries))
+        self.assertEqual(self.client.get(reverse('post-list'), {'user': 'nobody'}).data, [])
+
+    def test_ttl_cache(self):
+        from .identity import TTLCache, resolve_profile, posted_by_filter
+        cache = TTLCache(ttl=0, max_size=2)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+        cache = TTLCache(ttl=60, max_size=2)
+        for key in 'abc':
+            cache.set(key, key)
+        self.assertEqual([cache.get(key) for key in 'abc'], [None, 'b', 'c'])
+
+        # Once resolved, filters and lookups use the primary key
+        resolve_profile('test-uid-123')
+        self.assertEqual(str(posted_by_filter('test-uid-123')), f"(AND: ('posted_by_id', {self.user_profile.id}))")
+        self.user_profile.delete()
+        self.assertIsNone(resolve_profile('test-uid-123'))
+
+
+class BranchForeignKeyTest(APITestCase):
+    """Branches are foreign keys but keep their string representation in the API"""
+
+    def setUp(self):
+        self.cse = cse_branch()
+        self.ece = Branch.objects.create(name='ECE')
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123', email='test@cet.ac.in', full_name='Test User',
+            branch=self.cse, year=3
+        )
+        Subject.objects.create(name='Data Structures', branch=self.cse)
+        Subject.objects.create(name='Signals', branch=self.ece)
+        Subject.objects.create(name='Aptitude', is_common=True)
+
+    def test_branch_serialized_as_name(self):
+        response = self.client.get(reverse('userprofile-detail', args=['test-uid-123']))
+        self.assertEqual(response.data['branch'], 'CSE')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('subject-list'))
+        self.assertEqual({s['name']: s['branch'] for s in response.data},
+                         {'Data Structures': 'CSE', 'Signals': 'ECE', 'Aptitude': None})
+
+    def test_filter_subjects_by_branch_name(self):
+        response = self.client.get(reverse('subject-list'), {'branch': 'CSE'})
+        self.assertEqual(sorted(s['name'] for s in response.data), ['Aptitude', 'Data Structures'])
+        response = self.client.get(reverse('subject-list'), {'branch': 'ece', 'name': 'signals'})
+        self.assertEqual([s['name'] for s in response.data], ['Signals'])
+        Subject.objects.create(name='Signals')
+        response = self.client.get(reverse('subject-list'), {'branch': 'Astrology', 'name': 'signals'})
+        self.assertEqual(response.data, [])
+
+    def test_branch_written_as_name(self):
+        url = reverse('userprofile-detail', args=['test-uid-123'])
+        response = self.client.patch(url, {'branch': 'ece'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['branch'], 'ECE')
+        self.assertEqual(self.client.patch(url, {'branch': ''}, format='json').data['branch'], None)
+        self.assertEqual(self.client.patch(url, {'branch': 'Astrology'}, format='json').status_code, 400)
+
+
+class InterviewRoundsTest(APITestCase):
+    """Test cases for structured interview rounds"""
+
+    def setUp(self):
+        self.user_profile = default_author()
+        self.company = acme()
+
+    def test_parse_free_text(self):
+        from .rounds import parse_rounds
+        rounds = parse_rounds('Round 1: Online Test, Round 2: Technical Interview; HR round')
+        self.assertEqual([r['type'] for r in rounds], ['aptitude', 'technical', 'hr'])
+        self.assertEqual(rounds[1]['title'], 'Round 2: Technical Interview')
+        self.assertEqual([r['type'] for r in parse_rounds('- GD\n- DSA on HackerRank\n- Chat with director')],
+                         ['group_discussion', 'coding', 'managerial'])
+        self.assertEqual(parse_rounds('[{"title": "Coding"}]'),
+                         [{'type': 'coding', 'title': 'Coding', 'description': ''}])
+
+    def test_filter_by_round_type_in_database(self):
+        coding = add_experience(rounds='Aptitude test\nCoding round')
+        add_experience(rounds='Technical interview\nHR interview')
+        response = self.client.get(reverse('interviewexperience-list'), {'round_type': 'coding'})
+        self.assertEqual([e['id'] for e in response.data], [coding.id])
+        response = self.client.get(reverse('company-experiences', args=[self.company.id]),
+                                   {'round_type': 'hr', 'view': 'full'})
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['round_types'], ['technical', 'hr'])
+
+    def test_api_keeps_text_format(self):
+        self.client.force_authenticate(user=self.user_profile)
+        response = self.client.post(reverse('interviewexperience-list'), {
+            'company': self.company.id, 'position': 'SDE', 'interview_date': '2025-08-01',
+            'rounds': 'Round 1: Coding\nRound 2: HR', 'questions': 'Two sum',
+            'difficulty_level': 2, 'result': 'selected',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['rounds'], 'Round 1: Coding\nRound 2: HR')
+        self.assertEqual(response.data['round_details'][0],
+                         {'type': 'coding', 'title': 'Round 1: Coding', 'description': ''})
+
+        response = self.client.post(reverse('interviewexperience-list'), {
+            'company': self.company.id, 'position': 'SDE', 'interview_date': '2025-08-01',
+            'rounds': [{'title': 'Puzzle', 'type': 'astrology'}], 'questions': 'Two sum',
+            'difficulty_level': 2, 'result': 'selected',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rounds', response.data)
+
+
+class QuestionBankTest(APITestCase):
+    """Test cases for the deduplicated company question bank"""
+
+    def setUp(self):
+        self.company = acme()
+        self.other = Company.objects.create(name='Globex')
+
+    def frequencies(self, company=None):
+        from .models import CompanyQuestion
+        return dict(CompanyQuestion.objects.filter(company=company or self.company)
+                    .values_list('question__text', 'times_asked'))
+
+    def test_split_and_normalize(self):
+        from .questions import extract_questions, split_questions
+        self.assertEqual(split_questions('Coding round:\n1. Two sum\nQ2: What is a deadlock? How to avoid it?'),
+                         ['Two sum', 'What is a deadlock?', 'How to avoid it?'])
+        entries = extract_questions('- What is a Deadlock?\n3) what is a deadlock??\nok')
+        self.assertEqual(list(entries.values()), ['What is a Deadlock?'])
+
+    def test_incremental_updates(self):
+        first = add_experience(questions='1. Two sum\n2. What is a deadlock?')
+        second = add_experience(questions='- two SUM\n- Explain paging', interview_date='2025-09-01')
+        self.assertEqual(self.frequencies(), {'Two sum': 2, 'What is a deadlock?': 1, 'Explain paging': 1})
+
+        first.questions = 'Explain paging'
+        first.save()
+        self.assertEqual(self.frequencies(), {'Two sum': 1, 'Explain paging': 2})
+
+        second.company = self.other
+        second.save()
+        self.assertEqual(self.frequencies(), {'Explain paging': 1})
+        self.assertEqual(self.frequencies(self.other), {'Two sum': 1, 'Explain paging': 1})
+
+        second.delete()
+        self.assertEqual(self.frequencies(self.other), {})
+
+    def test_rebuild_matches_incremental(self):
+        from .models import Question
+        from .questions import rebuild_question_bank
+        add_experience(questions='Two sum\nWhat is a deadlock?')
+        add_experience(questions='Two sum', company=self.other)
+        before = (self.frequencies(), self.frequencies(self.other))
+        Question.objects.create(text='Orphan', normalized_hash='0' * 40)
+        self.assertEqual(rebuild_question_bank(batch_size=1), (2, 3, 3))
+        self.assertEqual((self.frequencies(), self.frequencies(self.other)), before)
+
+    def test_questions_endpoint(self):
+        add_experience(questions='Two sum\nExplain paging', interview_date='2025-07-01')
+        add_experience(questions='Two sum\nWhat is a deadlock?', interview_date='2025-08-01')
+        response = self.client.get(reverse('company-questions', args=[self.company.id]), {'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(q['text'], q['times_asked']) for q in response.data],
+                         [('Two sum', 2), ('What is a deadlock?', 1)])
+        self.assertEqual(response.data[0]['last_asked'], '2025-08-01')
+
+        response = self.client.get(reverse('company-questions', args=[self.other.id]))
+        self.assertEqual(response.data, [])
+        response = self.client.get(reverse('company-questions', args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class RelatedPostsTest(APITestCase):
+    """Test cases for precomputed related posts"""
+
+    def setUp(self):
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123', email='test@cet.ac.in', full_name='Test User', year=3
+        )
+        self.dsa = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.os = Subject.objects.create(name='Operating Systems', branch=cse_branch())
+        self.trees = self.add_post(self.dsa, 'Binary search trees', 'insertion, deletion, tree traversal')
+        self.balanced = self.add_post(self.dsa, 'Balanced trees', 'AVL rotations, red black tree insertion')
+        self.paging = self.add_post(self.os, 'Paging', 'page tables, TLB, page replacement')
+
+    def add_post(self, subject, topic, focus_points):
+        return Post.objects.create(subject=subject, posted_by=self.user_profile, topic=topic,
+                                   focus_points=focus_points)
+
+    def related_ids(self, post):
+        return [entry['id'] for entry in self.client.get(reverse('post-related', args=[post.id])).data]
+
+    def test_tfidf_cosine(self):
+        from .related import SimilarityIndex, build_vectors, document_terms
+        vectors = build_vectors({1: document_terms('B-trees', 'disk pages'), 2: document_terms('Trees', ''),
+                                 3: document_terms('Paging #3', 'pages')})
+        self.assertAlmostEqual(sum(w * w for w in vectors[1].values()), 1.0)
+        self.assertNotIn('3', vectors[3])
+        index = SimilarityIndex(vectors)
+        neighbours = dict(index.neighbours(1))
+        self.assertEqual(set(neighbours), {2, 3})
+        # Cosine similarity is symmetric
+        self.assertEqual(index.neighbours(2), [(1, neighbours[2])])
+
+    def test_rebuild_and_endpoint(self):
+        from .related import rebuild_related_posts
+        self.assertEqual(self.related_ids(self.trees), [])
+        rebuild_related_posts()
+        response = self.client.get(reverse('post-related', args=[self.trees.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['id'], self.balanced.id)
+        self.assertEqual(response.data[0]['subject_name'], 'Data Structures')
+        self.assertNotIn(self.paging.id, self.related_ids(self.trees))
+        self.assertEqual(self.client.get(reverse('post-related', args=[9999])).status_code, 404)
+
+    def test_new_posts_are_merged_incrementally(self):
+        from django.utils import timezone
+        from .models import Task
+        from .related import rebuild_related_posts
+        from .tasks import run_pending
+        rebuild_related_posts()
+        virtual_memory = self.add_post(self.os, 'Virtual memory', 'page faults, page replacement')
+        self.assertTrue(Task.objects.filter(name='refresh_related_posts', status='pending').exists())
+        Task.objects.filter(name='refresh_related_posts').update(run_after=timezone.now())
+        run_pending()
+        self.assertEqual(self.related_ids(virtual_memory), [self.paging.id])
+        self.assertEqual(self.related_ids(self.paging), [virtual_memory.id])
+        self.assertEqual(self.related_ids(self.trees), [self.balanced.id])
+
+    def test_refresh_reads_only_the_affected_posts(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import TermFrequency
+        from .related import document_frequencies, load_documents, refresh_related_posts, rebuild_related_posts
+
+        def stored_frequencies():
+            return dict(TermFrequency.objects.values_list('term', 'documents'))
+
+        rebuild_related_posts()
+        virtual_memory = self.add_post(self.os, 'Virtual memory', 'page faults, page replacement')
+        with CaptureQueriesContext(connection) as queries:
+            refresh_related_posts([virtual_memory.id])
+        post_reads = [q['sql'] for q in queries.captured_queries if '"api_post"."focus_points"' in q['sql']]
+        self.assertEqual(len(post_reads), 1)
+        self.assertIn(' IN (', post_reads[0])
+        self.assertEqual(self.related_ids(virtual_memory), [self.paging.id])
+        self.assertEqual(stored_frequencies(), document_frequencies(load_documents()))
+
+        self.paging.delete()
+        self.assertEqual(stored_frequencies(), document_frequencies(load_documents()))
+
+    def test_refresh_before_the_first_rebuild_only_indexes_its_posts(self):
+        from .models import PostTerm
+        from .related import refresh_related_posts
+        PostTerm.objects.all().delete()
+        refresh_related_posts([self.paging.id])
+        self.assertEqual(set(PostTerm.objects.values_list('post_id', flat=True)), {self.paging.id})
+
+
+class DuplicateDetectionTest(APITestCase):
+    """Test cases for link and MinHash near-duplicate detection"""
+
+    TEXT = ('Covers inorder preorder and postorder traversal of binary trees, level order with a queue, '
+            'height and diameter, lowest common ancestor and serialization')
+
+    def setUp(self):
+        self.user_profile = UserProfile.objects.create(
+            supabase_uid='test-uid-123', email='test@cet.ac.in', full_name='Test User', year=3
+        )
+        self.subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.company = Company.objects.create(name='Acme')
+        self.client.force_authenticate(user=self.user_profile)
+
+    def create_post(self, **data):
+        payload = {'subject': self.subject.id, 'posted_by': self.user_profile.id, 'topic': 'Trees',
+                   'focus_points': '', **data}
+        return self.client.post(reverse('post-list'), payload, format='json')
+
+    def test_normalize_url(self):
+        from .duplicates import normalize_url
+        self.assertEqual(normalize_url('https://www.youtube.com/watch?v=abc123&t=30s'),
+                         normalize_url('https://youtu.be/abc123?si=xyz'))
+        self.assertEqual(normalize_url('https://drive.google.com/file/d/FILE1/view?usp=sharing'),
+                         normalize_url('https://drive.google.com/open?id=FILE1'))
+        self.assertEqual(normalize_url('http://Example.com/notes/?b=2&a=1&utm_source=x#top'),
+                         normalize_url('https://example.com/notes?a=1&b=2'))
+        self.assertNotEqual(normalize_url('https://example.com/notes?id=1'),
+                            normalize_url('https://example.com/notes?id=2'))
+
+    def test_minhash_similarity(self):
+        from .duplicates import post_fingerprint, similarity
+        original = post_fingerprint('Binary trees', self.TEXT)
+        edited = post_fingerprint('Binary trees', self.TEXT + ' explained')
+        other = post_fingerprint('Paging', 'Page tables, the TLB, page faults and the replacement policies '
+                                           'FIFO, LRU and the clock algorithm with examples')
+        self.assertGreater(similarity(original.signature, edited.signature), 0.85)
+        self.assertLess(similarity(original.signature, other.signature), 0.3)
+        self.assertEqual(post_fingerprint('Trees', 'short').band_keys, [])
+
+    def test_duplicate_link_is_rejected(self):
+        first = self.create_post(topic='Binary trees', focus_points=self.TEXT,
+                                 notes_link='https://drive.google.com/file/d/FILE1/view')
+        self.assertEqual(first.status_code, 201)
+        # Sharing the link, moderately similar text is enough
+        again = self.create_post(topic='Tree notes', focus_points=self.TEXT.split(', lowest')[0],
+                                 notes_link='https://drive.google.com/open?id=FILE1')
+        self.assertEqual(again.status_code, 409)
+        self.assertEqual(again.data['duplicate_of'], first.data['id'])
+        self.assertEqual(self.create_post(topic='Binary trees again', focus_points=self.TEXT.split(', lowest')[0],
+                                          notes_link='https://drive.google.com/file/d/FILE2/view').status_code, 201)
+
+    def test_shared_link_alone_is_not_a_duplicate(self):
+        link = 'https://youtu.be/standard-lecture'
+        self.assertEqual(self.create_post(topic='Binary trees', focus_points=self.TEXT, video_link=link).status_code,
+                         201)
+        other = self.create_post(topic='Graphs', video_link=link,
+                                 focus_points='Breadth first and depth first search, topological sort and '
+                                              'shortest paths with Dijkstra and Bellman Ford')
+        self.assertEqual(other.status_code, 201)
+        self.assertEqual(self.create_post(topic='Trees', video_link=link).status_code, 201)
+
+    def test_near_duplicate_text_is_rejected(self):
+        first = self.create_post(topic='Binary trees', focus_points=self.TEXT)
+        self.assertEqual(first.status_code, 201)
+        again = self.create_post(topic='Binary Trees!', focus_points=self.TEXT + '.')
+        self.assertEqual(again.status_code, 409)
+        # Editing a post doesn't make it a duplicate of itself
+        response = self.client.patch(reverse('post-detail', args=[first.data['id']]),
+                                     {'focus_points': self.TEXT + ' and more'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_experiences_are_compared_within_a_company(self):
+        other = Company.objects.create(name='Globex')
+        payload = {'position': 'SDE', 'interview_date': '2025-08-01', 'rounds': 'Coding', 'questions': self.TEXT,
+                   'difficulty_level': 2, 'result': 'selected'}
+        url = reverse('interviewexperience-list')
+        self.assertEqual(self.client.post(url, {'company': self.company.id, **payload}, format='json').status_code, 201)
+        self.assertEqual(self.client.post(url, {'company': self.company.id, **payload}, format='json').status_code, 409)
+        self.assertEqual(self.client.post(url, {'company': other.id, **payload}, format='json').status_code, 201)
+
+    def test_flag_historical_duplicates(self):
+        from .duplicates import KIND_POST, flag_duplicates
+        from .models import FeedEntry
+        original = Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Trees',
+                                       focus_points=self.TEXT, video_link='https://youtu.be/abc123')
+        copy = Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Trees again',
+                                   focus_points=self.TEXT.split(', lowest')[0],
+                                   video_link='https://www.youtube.com/watch?v=abc123')
+        same_video = Post.objects.create(subject=self.subject, posted_by=self.user_profile, topic='Graphs',
+                                         video_link='https://youtu.be/abc123')
+        public = [p['id'] for p in self.client.get(reverse('post-list'), {'public': 1}).data]
+        self.assertIn(copy.id, public)
+        self.assertEqual(flag_duplicates(KIND_POST), (3, 1))
+        copy.refresh_from_db()
+        self.assertEqual(copy.duplicate_of_id, original.id)
+        listed = [p['id'] for p in self.client.get(reverse('post-list')).data]
+        self.assertNotIn(copy.id, listed)
+        self.assertIn(original.id, listed)
+        self.assertIn(same_video.id, listed)
+        # Cached public lists are invalidated too
+        public = [p['id'] for p in self.client.get(reverse('post-list'), {'public': 1}).data]
+        self.assertNotIn(copy.id, public)
+        self.assertFalse(FeedEntry.objects.filter(post=copy).exists())
+        self.assertEqual(self.client.get(reverse('post-detail', args=[copy.id])).status_code, 200)
+
+        # Once it no longer duplicates anything, the post returns to the lists and its feed
+        Post.objects.filter(pk=copy.pk).update(focus_points='Tries, segment trees and Fenwick trees')
+        self.assertEqual(flag_duplicates(KIND_POST), (3, 0))
+        self.assertTrue(FeedEntry.objects.filter(post=copy).exists())
+        self.assertIn(copy.id, [p['id'] for p in self.client.get(reverse('post-list'), {'public': 1}).data])
+
+
+class HomeFeedTest(APITestCase):
+    """Test cases for the precomputed, keyset-paginated home feed"""
+
+    def setUp(self):
+        self.cse = cse_branch()
+        self.ece = Branch.objects.create(name='ECE')
+        self.senior = UserProfile.objects.create(
+            supabase_uid='senior-uid', email='senior@cet.ac.in', full_name='Senior', branch=self.cse, year=4
+        )
+        self.junior = UserProfile.objects.create(
+            supabase_uid='junior-uid', email='junior@cet.ac.in', full_name='Junior', branch=self.cse, year=1
+        )
+        self.dsa = Subject.objects.create(name='Data Structures', branch=self.cse)
+        self.circuits = Subject.objects.create(name='Circuits', branch=self.ece)
+        self.aptitude = Subject.objects.create(name='Aptitude', is_common=True)
+        self.company = Company.objects.create(name='Acme')
+
+    def add_post(self, subject, topic):
+        return Post.objects.create(subject=subject, posted_by=self.senior, topic=topic)
+
+    def add_experience(self):
+        return InterviewExperience.objects.create(
+            company=self.company, posted_by=self.senior, position='SDE', interview_date='2025-08-01',
+            rounds='Coding', questions='Two sum', difficulty_level=2, result='selected'
+        )
+
+    def feed(self, user, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('home_feed'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def ids(self, data):
+        return [(entry['type'], entry['item']['id']) for entry in data['results']]
+
+    def test_feed_contents_by_branch_and_year(self):
+        trees = self.add_post(self.dsa, 'Trees')
+        self.add_post(self.circuits, 'Op-amps')
+        puzzles = self.add_post(self.aptitude, 'Puzzles')
+        experience = self.add_experience()
+        self.assertEqual(self.ids(self.feed(self.senior)),
+                         [('experience', experience.id), ('post', puzzles.id), ('post', trees.id)])
+        self.assertEqual(self.ids(self.feed(self.junior)), [('post', puzzles.id), ('post', trees.id)])
+        data = self.feed(self.senior)
+        self.assertEqual(data['results'][1]['item']['subject_name'], 'Aptitude')
+        self.assertNotIn('focus_points', data['results'][1]['item'])
+
+    def test_keyset_pagination(self):
+        posts = [self.add_post(self.dsa, f'Topic {i}') for i in range(5)]
+        first = self.feed(self.junior, limit=2)
+        self.assertEqual(self.ids(first), [('post', posts[4].id), ('post', posts[3].id)])
+        # Content created meanwhile doesn't shift the next page
+        self.add_post(self.dsa, 'Newer')
+        second = self.feed(self.junior, limit=2, cursor=first['next_cursor'])
+        self.assertEqual(self.ids(second), [('post', posts[2].id), ('post', posts[1].id)])
+        last = self.feed(self.junior, limit=2, cursor=second['next_cursor'])
+        self.assertEqual(self.ids(last), [('post', posts[0].id)])
+        self.assertIsNone(last['next_cursor'])
+        response = self.client.get(reverse('home_feed'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_subject_change_new_branch_and_rebuild(self):
+        from .feed import rebuild_feeds
+        from .models import FeedEntry
+        trees = self.add_post(self.dsa, 'Trees')
+        puzzles = self.add_post(self.aptitude, 'Puzzles')
+        trees.subject = self.circuits
+        trees.save()
+        self.assertEqual(self.ids(self.feed(self.junior)), [('post', puzzles.id)])
+
+        mech = Branch.objects.create(name='MECH')
+        student = UserProfile.objects.create(supabase_uid='mech-uid', email='mech@cet.ac.in',
+                                             full_name='Mech', branch=mech, year=2)
+        self.assertEqual(self.ids(self.feed(student)), [('post', puzzles.id)])
+        # Every item is stored once, whichever feeds read it
+        self.add_experience()
+        self.assertEqual(FeedEntry.objects.count(), 3)
+
+        before = sorted(FeedEntry.objects.values_list('feed', 'post_id', 'experience_id'))
+        rebuild_feeds(batch_size=1)
+        self.assertEqual(sorted(FeedEntry.objects.values_list('feed', 'post_id', 'experience_id')), before)
+
+    def test_entries_only_rewritten_when_the_subject_changes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        trees = self.add_post(self.dsa, 'Trees')
+        trees.topic = 'Binary trees'
+        with CaptureQueriesContext(connection) as queries:
+            trees.save()
+        self.assertFalse(any('api_feedentry' in q['sql'] for q in queries.captured_queries))
+        trees.subject = self.aptitude
+        trees.save()
+        self.assertEqual(self.ids(self.feed(self.junior)), [('post', trees.id)])
+        self.assertEqual(self.ids(self.feed(self.senior, limit=1)), [('post', trees.id)])
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse('home_feed'))
+        self.assertIn(response.status_code, [401, 403])
+
+
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'], REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from django.test import RequestFactory
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def read_db(self, method, path='/api/posts/', token='alice', write=False):
+        """Alias a read would use inside a request through the middleware, and the response"""
+        from django.http import HttpResponse
+        from .middleware import ReplicaRoutingMiddleware
+        from .routers import ReplicaRouter
+        router, seen = ReplicaRouter(), []
+
+        def view(request):
+            if write:
+                router.db_for_write(Post)
+            seen.append(router.db_for_read(Post))
+            return HttpResponse(status=201 if method == 'post' else 200)
+
+        request = getattr(self.factory, method)(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+        ReplicaRoutingMiddleware(view)(request)
+        return seen[0]
+
+    def test_safe_api_reads_use_a_replica(self):
+        self.assertIn(self.read_db('get'), ['replica1', 'replica2'])
+        self.assertEqual(self.read_db('post'), 'default')
+        self.assertEqual(self.read_db('get', path='/admin/'), 'default')
+        # Reads after a write in the same request see it
+        self.assertEqual(self.read_db('get', token='bob', write=True), 'default')
+        # Outside of a request everything stays on the primary
+        from .routers import ReplicaRouter
+        self.assertEqual(ReplicaRouter().db_for_read(Post), 'default')
+
+    def test_writer_is_pinned_to_primary(self):
+        from django.core.cache import cache
+        from .routers import pin_key
+        self.read_db('post', token='alice')
+        self.assertEqual(self.read_db('get', token='alice'), 'default')
+        self.assertIn(self.read_db('get', token='bob'), ['replica1', 'replica2'])
+        # The pin expires
+        cache.delete(pin_key(self.factory.get('/', HTTP_AUTHORIZATION='Bearer alice')))
+        self.assertIn(self.read_db('get', token='alice'), ['replica1', 'replica2'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_is_a_no_op(self):
+        from .routers import is_pinned
+        self.assertEqual(self.read_db('get'), 'default')
+        self.read_db('post')
+        self.assertFalse(is_pinned(self.factory.get('/', HTTP_AUTHORIZATION='Bearer alice')))
+
+
+@override_settings(VIEW_COUNTING=True)
+class ViewCountTest(APITestCase):
+    """Test cases for buffered, deduplicated view counters"""
+
+    def setUp(self):
+        clear_caches()
+        author = UserProfile.objects.create(
+            supabase_uid='author-uid', email='author@cet.ac.in', full_name='Author', year=4
+        )
+        subject = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.trees = Post.objects.create(subject=subject, posted_by=author, topic='Trees')
+        self.graphs = Post.objects.create(subject=subject, posted_by=author, topic='Graphs')
+        self.experience = InterviewExperience.objects.create(
+            company=Company.objects.create(name='Acme'), posted_by=author, position='SDE',
+            interview_date='2025-08-01', rounds='Coding', questions='Two sum', difficulty_level=2, result='selected'
+        )
+
+    def view(self, post, address='10.0.0.1'):
+        return self.client.get(reverse('post-detail', args=[post.id]), REMOTE_ADDR=address)
+
+    def flush(self):
+        from django.utils import timezone
+        from .models import Task
+        from .tasks import run_pending
+        Task.objects.filter(name='flush_view_counts').update(run_after=timezone.now())
+        return run_pending()
+
+    def test_views_are_buffered_and_deduplicated(self):
+        from .models import Task
+        self.assertEqual(self.view(self.trees).data['view_count'], 1)
+        # The same viewer again within the window doesn't count
+        self.assertEqual(self.view(self.trees).data['view_count'], 1)
+        self.assertEqual(self.view(self.trees, address='10.0.0.2').data['view_count'], 2)
+
+        self.trees.refresh_from_db()
+        self.assertEqual(self.trees.view_count, 0)
+        self.assertEqual(Task.objects.filter(name='flush_view_counts', status='pending').count(), 1)
+        listed = self.client.get(reverse('post-list'))
+        self.assertEqual({item['id']: item['view_count'] for item in listed.data},
+                         {self.trees.id: 2, self.graphs.id: 0})
+
+        response = self.client.get(reverse('interviewexperience-detail', args=[self.experience.id]))
+        self.assertEqual(response.data['view_count'], 1)
+
+    def test_flush_batches_updates(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.view(self.trees)
+        self.view(self.graphs)
+        self.view(self.trees, address='10.0.0.2')
+        self.view(self.graphs, address='10.0.0.2')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.flush(), 2)
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "api_post"')]
+        self.assertEqual(len(updates), 1)
+
+        self.trees.refresh_from_db()
+        self.assertEqual(self.trees.view_count, 2)
+        # Nothing is counted twice once flushed
+        self.assertEqual(self.view(self.trees, address='10.0.0.3').data['view_count'], 3)
+        self.flush()
+        self.trees.refresh_from_db()
+        self.assertEqual(self.trees.view_count, 3)
+
+    def test_views_during_flush_are_kept(self):
+        from unittest import mock
+        from .counters import counter_cache
+        from .models import Task
+        from .viewcounts import flush_view_counts, _buffer_key
+        self.view(self.trees)
+        self.view(self.trees, address='10.0.0.2')
+        Task.objects.all().delete()
+        # The flush read one view; the second landed after that
+        with mock.patch('api.viewcounts.pending_views', return_value={self.trees.id: 1}):
+            flush_view_counts([{'kind': 'post', 'id': self.trees.id}])
+        self.trees.refresh_from_db()
+        self.assertEqual(self.trees.view_count, 1)
+        self.assertEqual(counter_cache().get(_buffer_key('post', self.trees.id)), 1)
+        self.assertEqual(Task.objects.filter(name='flush_view_counts', status='pending').count(), 1)
+        self.flush()
+        self.trees.refresh_from_db()
+        self.assertEqual(self.trees.view_count, 2)
+
+    def test_counters_survive_a_busy_default_cache(self):
+        from django.core.cache import cache
+        self.view(self.trees)
+        cache.clear()
+        # The viewer is still deduplicated and the buffered view still pending
+        self.assertEqual(self.view(self.trees).data['view_count'], 1)
+        self.flush()
+        self.trees.refresh_from_db()
+        self.assertEqual(self.trees.view_count, 1)
+
+    def test_counter_lost_between_calls(self):
+        from unittest import mock
+        from .counters import counter_cache
+        cache = counter_cache()
+        # Another request created the counter after our incr, then it was flushed away
+        with mock.patch.object(cache, 'incr', side_effect=[ValueError, 1]), \
+                mock.patch.object(cache, 'add', side_effect=[True, False]):
+            self.assertEqual(self.view(self.trees).status_code, 200)
+
+    @override_settings(VIEW_COUNTING=False)
+    def test_disabled(self):
+        from .models import Task
+        self.assertEqual(self.view(self.trees).data['view_count'], 0)
+        self.assertFalse(Task.objects.filter(name='flush_view_counts').exists())
+
+    def test_ordering_by_views(self):
+        self.view(self.graphs)
+        self.flush()
+        response = self.client.get(reverse('post-list'), {'ordering': 'views'})
+        self.assertEqual([item['id'] for item in response.data], [self.graphs.id, self.trees.id])
+
+
+class AutocompleteTest(APITestCase):
+    """Test cases for the typeahead endpoint and its prefix indexes"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from .autocomplete import clear_indexes
+        cache.clear()
+        clear_indexes()
+        self.author = UserProfile.objects.create(
+            supabase_uid='author-uid', email='author@cet.ac.in', full_name='Author', year=4
+        )
+        self.google = Company.objects.create(name='Google')
+        self.goldman = Company.objects.create(name='Goldman Sachs')
+        self.amazon = Company.objects.create(name='Amazon')
+        self.dsa = Subject.objects.create(name='Data Structures', branch=cse_branch())
+        self.dbms = Subject.objects.create(name='DBMS', branch=cse_branch())
+        self.circuits = Subject.objects.create(name='Digital Circuits', branch=Branch.objects.create(name='ECE'))
+        for company, position in [(self.goldman, 'Analyst'), (self.goldman, 'analyst '),
+                                  (self.goldman, 'Software Engineer'), (self.google, 'Software Engineer'),
+                                  (self.google, 'SDE Intern')]:
+            self.add_experience(company, position)
+        for _ in range(2):
+            Post.objects.create(subject=self.dbms, posted_by=self.author, topic='Normal forms')
+
+    def add_experience(self, company, position):
+        return InterviewExperience.objects.create(
+            company=company, posted_by=self.author, position=position, interview_date='2025-08-01',
+            rounds='Coding', questions='Two sum', difficulty_level=2, result='selected'
+        )
+
+    def suggest(self, **params):
+        response = self.client.get(reverse('autocomplete'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def names(self, data, kind):
+        return [entry['name'] for entry in data[kind]]
+
+    def test_prefix_matches_ranked_by_popularity(self):
+        data = self.suggest(q='go')
+        self.assertEqual(self.names(data, 'company'), ['Goldman Sachs', 'Google'])
+        self.assertEqual(data['company'][0]['count'], 3)
+        self.assertEqual(self.names(data, 'subject'), [])
+        # Any word of a name matches, and spellings of a position are merged
+        self.assertEqual(self.names(self.suggest(q='sach', type='company'), 'company'), ['Goldman Sachs'])
+        self.assertEqual(self.names(self.suggest(q='d', type='subject'), 'subject'),
+                         ['DBMS', 'Data Structures', 'Digital Circuits'])
+        self.assertEqual(self.suggest(q='ANA', type='position')['position'], [{'name': 'Analyst', 'count': 2}])
+        self.assertEqual(self.names(self.suggest(q='engineer', type='position'), 'position'), ['Software Engineer'])
+
+    def test_filters_limits_and_errors(self):
+        data = self.suggest(q='d', type='subject', branch=cse_branch().id)
+        self.assertEqual(self.names(data, 'subject'), ['DBMS', 'Data Structures'])
+        self.assertEqual(len(self.suggest(q='', type='company', limit=2)['company']), 2)
+        self.assertEqual(set(self.suggest(type='company')), {'company'})
+        response = self.client.get(reverse('autocomplete'), {'type': 'users'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_index_follows_changes_without_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.suggest(q='a')
+        with CaptureQueriesContext(connection) as queries:
+            self.suggest(q='am')
+        self.assertEqual(len(queries.captured_queries), 0)
+
+        Company.objects.create(name='Amdocs')
+        self.assertEqual(self.names(self.suggest(q='am', type='company'), 'company'), ['Amazon', 'Amdocs'])
+        self.amazon.delete()
+        self.add_experience(self.google, 'Product Manager')
+        data = self.suggest(q='', type='company,position')
+        self.assertNotIn('Amazon', self.names(data, 'company'))
+        self.assertIn('Product Manager', self.names(data, 'position'))
+
+    @override_settings(AUTOCOMPLETE_MAX_ENTRIES=2)
+    def test_database_fallback_for_large_kinds(self):
+        data = self.suggest(q='go')
+        self.assertEqual(self.names(data, 'company'), ['Goldman Sachs', 'Google'])
+        self.assertEqual(self.names(self.suggest(q='d', type='subject'), 'subject')[0], 'DBMS')
+        self.assertEqual(self.suggest(q='ana', type='position')['position'][0]['count'], 1)
+
+
+class CatalogSnapshotTest(APITestCase):
+    """Test cases for the static catalog snapshot and its version pointer"""
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.cache import cache
+        cache.clear()
+        from django.conf import settings
+        self.catalog_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.catalog_root, ignore_errors=True)
+        settings_override = override_settings(STORAGES={**settings.STORAGES, 'catalog': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': self.catalog_root, 'base_url': '/static/catalog/'},
+        }})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.branch = cse_branch()
+        Subject.objects.create(name='Data Structures', branch=self.branch)
+        Company.objects.create(name='Acme')
+
+    def publish(self, **kwargs):
+        from .catalog import publish_catalog
+        return publish_catalog(**kwargs)
+
+    def test_publish_writes_content_hashed_file(self):
+        import json
+        import os
+        pointer, created = self.publish()
+        self.assertTrue(created)
+        name = f"catalog.{pointer['version']}.json"
+        self.assertEqual(pointer['url'], f'/static/catalog/{name}')
+        with open(os.path.join(self.catalog_root, name)) as catalog_file:
+            data = json.load(catalog_file)
+        self.assertEqual([company['name'] for company in data['companies']], ['Acme'])
+        self.assertEqual(data['subjects'][0]['branch'], self.branch.name)
+        self.assertNotIn('posts_count', data['subjects'][0])
+
+        # Same data, same version; posts don't touch the catalog
+        Post.objects.create(subject=Subject.objects.get(), topic='Trees', posted_by=UserProfile.objects.create(
+            supabase_uid='author-uid', email='author@cet.ac.in', full_name='Author', year=4))
+        self.assertEqual(self.publish(), (pointer, False))
+        Company.objects.create(name='Zeta')
+        new_pointer, created = self.publish()
+        self.assertTrue(created)
+        self.assertNotEqual(new_pointer['version'], pointer['version'])
+
+    def test_pointer_endpoint(self):
+        response = self.client.get(reverse('catalog'))
+        self.assertEqual(response.status_code, 404)
+        pointer, _ = self.publish()
+        response = self.client.get(reverse('catalog'))
+        self.assertEqual(response.data, {field: pointer[field] for field in ('version', 'url', 'published_at')})
+        self.assertIn('max-age', response['Cache-Control'])
+
+        # Other processes find the pointer in the storage
+        from django.core.cache import cache
+        cache.clear()
+        self.assertEqual(self.client.get(reverse('catalog')).data['version'], pointer['version'])
+
+    def test_without_catalog_storage(self):
+        from django.conf import settings
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from .models import Task
+        Task.objects.all().delete()
+        storages = {name: backend for name, backend in settings.STORAGES.items() if name != 'catalog'}
+        with override_settings(STORAGES=storages), self.assertLogs('api.catalog', 'WARNING'):
+            Company.objects.create(name='Zeta')
+            self.assertFalse(Task.objects.filter(name='publish_catalog').exists())
+            self.assertEqual(self.client.get(reverse('catalog')).status_code, 404)
+            with self.assertRaises(CommandError):
+                call_command('publish_catalog')
+
+    def test_changes_queue_one_publish_and_old_versions_are_pruned(self):
+        import os
+        from django.utils import timezone
+        from .models import Task
+        from .tasks import run_pending
+        tasks = Task.objects.filter(name='publish_catalog', status='pending')
+        self.assertEqual(tasks.count(), 1)
+        Company.objects.create(name='Zeta')
+        Branch.objects.create(name='MECH')
+        self.assertEqual(tasks.count(), 1)
+        tasks.update(run_after=timezone.now())
+        run_pending()
+        self.assertEqual(self.client.get(reverse('catalog')).status_code, 200)
+
+        for name in ['Beta', 'Gamma']:
+            Company.objects.create(name=name)
+            self.publish(keep=2)
+        files = [name for name in os.listdir(self.catalog_root) if name.startswith('catalog.')]
+        self.assertEqual(len(files), 2)
+
+    def test_supabase_storage(self):
+        from unittest import mock
+        from .storage import SupabaseStorage
+        storage = SupabaseStorage('catalog', url='https://project.supabase.co/', key='service-key')
+        name = 'catalog.0123456789ab.json'
+        with mock.patch('api.storage.requests') as requests:
+            storage.save(name, io.BytesIO(b'{}'))
+            url, = requests.post.call_args.args
+            headers = requests.post.call_args.kwargs['headers']
+            self.assertEqual(url, f'https://project.supabase.co/storage/v1/object/catalog/{name}')
+            self.assertEqual(headers['x-upsert'], 'true')
+            self.assertEqual(headers['Authorization'], 'Bearer service-key')
+            self.assertIn('immutable', headers['Cache-Control'])
+
+            storage.save('latest.json', io.BytesIO(b'{}'))
+            self.assertEqual(requests.post.call_args.kwargs['headers']['Cache-Control'], 'no-cache')
+
+            requests.get.return_value.status_code = 404
+            with self.assertRaises(FileNotFoundError):
+                storage.open('latest.json')
+        self.assertEqual(storage.url(name), f'https://project.supabase.co/storage/v1/object/public/catalog/{name}')
@@ -0,0 +1,155 @@
+"""
+Sliding-window request throttling.
+
+Every request is counted against a budget chosen by scope and client:
+
+- scope: ``vote`` for vote actions, ``write`` for other unsafe methods and
+  ``read`` for everything else (a view can force one with ``throttle_scope``)
+- client: the Supabase UID of a user whose token signature was verified,
+  otherwise the client IP (taken from X-Forwarded-For only as far as
+  REST_FRAMEWORK["NUM_PROXIES"] trusted proxies reach)
+
+Budgets come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] as DRF rate
+strings ("60/min"): at most that many requests in any period. Anonymous
+clients use the ``anon_<scope>`` rate when one is configured.
+
+Public reads the shared public list cache (api.cache) already holds a
+payload for are not counted: they run no queries, and a campus behind one
+NAT address would otherwise share a single anonymous read budget. Views
+name the actions served from that cache in ``public_cache_actions``.
+
+Each client keeps one counter per fixed window of the period, changed only
+with the cache's atomic add/incr/decr, so concurrent requests can't
+overwrite each other's counts. The last period's total is estimated from
+the current window plus the previous one, weighted by how much of it still
+overlaps, which smooths the burst a fixed window allows at its edges.
+Counters live in the Django cache, so they are per process with local
+memory and shared with Redis.
+"""
+
+import time
+
+from django.core.cache import cache as default_cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .cache import has_public_payload, is_public_request
+
+
+KEY_PREFIX = 'throttle'
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Parse a DRF style rate ("60/min") into (limit, period in seconds)"""
+    if rate is None:
+        return None, None
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class SlidingWindow:
+    """At most `limit` requests in any `period` seconds, estimated from two fixed windows"""
+
+    def __init__(self, limit, period):
+        self.limit = limit
+        self.period = period
+
+    def locate(self, now):
+        """Return (index of the window containing `now`, seconds elapsed in it)"""
+        index = int(now // self.period)
+        return index, now - index * self.period
+
+    def estimate(self, previous, current, elapsed):
+        """Requests in the last period, given both windows' counts"""
+        return previous * (1 - elapsed / self.period) + current
+
+    def allows(self, previous, current, elapsed):
+        """Whether the request making the current count `current` stays within the limit"""
+        return self.estimate(previous, current, elapsed) <= self.limit
+
+    def wait(self, previous, current, elapsed):
+        """Seconds until one more request would be allowed, `current` not counting it"""
+        remaining = self.period - elapsed
+        if current + 1 <= self.limit and previous:
+            # Within this window, once enough of the previous one has slid out
+            within = self.period * (1 - (self.limit - current - 1) / previous) - elapsed
+            if within <= remaining:
+                return max(within, 0)
+        # In the next window, once enough of this one has slid out in turn
+        if not current:
+            return remaining
+        return remaining + max(self.period * (1 - (self.limit - 1) / current), 0)
+
+
+class ScopedSlidingWindowThrottle(BaseThrottle):
+    """Sliding-window throttle with read/write/vote scopes, per verified user or per IP"""
+
+    cache = default_cache
+    timer = time.time
+
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        if getattr(view, 'action', None) == 'vote':
+            return 'vote'
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def get_client(self, request):
+        uid = getattr(request.user, 'supabase_uid', None)
+        # An unverified token is just a claim; anyone could rotate its subject
+        if uid and getattr(request.user, 'identity_verified', True):
+            return 'user', uid
+        return 'ip', self.get_ident(request)
+
+    def get_rate(self, scope, kind):
+        rates = api_settings.DEFAULT_THROTTLE_RATES or {}
+        if kind == 'ip' and f'anon_{scope}' in rates:
+            return rates[f'anon_{scope}']
+        return rates.get(scope)
+
+    def is_cached_read(self, request, view):
+        """Whether the request will be answered from the public list cache"""
+        scope = getattr(view, 'public_cache_actions', {}).get(getattr(view, 'action', None))
+        return (scope is not None and request.method in SAFE_METHODS and is_public_request(request)
+                and has_public_payload(request, scope))
+
+    def increment(self, key, timeout):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # First request in this window; only one concurrent caller creates the counter
+            if self.cache.add(key, 1, timeout):
+                return 1
+            return self.cache.incr(key)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = self.get_scope(request, view)
+        kind, ident = self.get_client(request)
+        limit, period = parse_rate(self.get_rate(scope, kind))
+        if limit is None or self.is_cached_read(request, view):
+            return True
+
+        window = SlidingWindow(limit, period)
+        index, elapsed = window.locate(self.timer())
+        key = f'{KEY_PREFIX}:{scope}:{kind}:{ident}'
+        # Kept for two periods: the window itself, then as the previous one
+        current = self.increment(f'{key}:{index}', 2 * period)
+        previous = self.cache.get(f'{key}:{index - 1}', 0)
+        if window.allows(previous, current, elapsed):
+            return True
+
+        # Rejected requests don't use up the budget
+        try:
+            self.cache.decr(f'{key}:{index}')
+        except ValueError:
+            pass
+        self.wait_seconds = window.wait(previous, current - 1, elapsed)
+        return False
+
+    def wait(self):
+        return self.wait_seconds
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import views, async_views
 from .minimal_views import simple_company_list
 
 # Simple view to bypass serializer
@@ -41,7 +41,17 @@ router.register(r'experiences', views.InterviewExperienceViewSet)
 # The API URLs are now determined automatically by the router
 urlpatterns = [
     path('health/', views.health_check, name='health_check'),
+    path('votes/mine/', views.my_votes, name='my_votes'),
+    path('feed/', views.home_feed, name='home_feed'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
+    path('catalog/', views.catalog_pointer, name='catalog'),
+    path('tasks/run/', views.run_due_tasks, name='run_due_tasks'),
     path('simple/companies/', simple_companies, name='simple_companies'),
     path('minimal/companies/', simple_company_list, name='minimal_companies'),
+    # Async read paths (best served through hub.asgi)
+    path('async/health/', async_views.async_health_check, name='async_health_check'),
+    path('async/posts/', async_views.async_post_list, name='async_post_list'),
+    path('async/companies/<int:pk>/experiences/', async_views.async_company_experiences,
+         name='async_company_experiences'),
     path('', include(router.urls)),
 ]
@@ -6,26 +6,50 @@
 # - CRUD on InterviewExperience (with filtering by company)
 # Each endpoint should return JSON responses.
 
+import hmac
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import BasePermission
-from django.db.models import Q
+from django.db.models import Q, Count, Sum
 from django.utils import timezone
-from datetime import date
+from datetime import date, timedelta
 from django.db import connection
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
 
 from .models import (
     Branch, UserProfile, Subject, Post, PostVote, Company,
-    InterviewExperience, ExperienceVote
+    InterviewExperience, ExperienceVote, CompanyStats
 )
 
 from .serializers import (
     BranchSerializer, UserProfileSerializer, SubjectSerializer, PostSerializer, 
-    CompanySerializer, InterviewExperienceSerializer
+    CompanySerializer, InterviewExperienceSerializer, SparseFieldsetMixin,
+    CompanyStatsSerializer, CompanyQuestionSerializer, RelatedPostSerializer
+)
+from .votes import (
+    parse_id_list, post_votes_for, experience_votes_for,
+    apply_post_vote_delta, visible_post_counts
 )
+from .cache import is_public_request, serve_public, cache_stats, patch_public_headers, public_cache_timeout
+from .ranking import order_queryset, parse_ordering
+from .identity import resolve_profile, posted_by_filter
+from .stats import empty_stats
+from .questions import top_questions
+from .related import related_posts
+from .feed import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, feeds_for, feed_page
+from .duplicates import check_duplicate, post_fingerprint, experience_fingerprint, KIND_POST, KIND_EXPERIENCE
+from .tasks import FINISHED_TASK_RETENTION_DAYS, POINTS_PER_EXPERIENCE_UPVOTE, award_points, run_for, purge_finished
+from .routers import use_read_alias
+from .viewcounts import record_view
+from . import autocomplete as typeahead
+from .catalog import public_pointer, read_pointer
+
+# Upper bound on ids accepted by the batch vote lookup
+MAX_VOTE_LOOKUP_IDS = 500
 
 
 class IsSupabaseAuthenticated(BasePermission):
@@ -38,6 +62,75 @@ class IsSupabaseAuthenticated(BasePermission):
                 not isinstance(request.user, AnonymousUser))
 
 
+def parse_field_list(value):
+    """Split a comma separated query parameter into a list of names"""
+    if not value:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsetViewMixin:
+    """
+    Support ?fields= and ?omit= on read actions.
+
+    Actions listed in ``summary_actions`` return the serializer's summary
+    representation unless ?view=full is passed, and querysets only load the
+    columns needed by the selected fields.
+    """
+    summary_actions = ['list']
+
+    def get_field_selection(self, serializer_class):
+        """Return the (fields, omit) selection for the current read request"""
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return None, None
+
+        params = self.request.query_params
+        fields = parse_field_list(params.get('fields'))
+        omit = parse_field_list(params.get('omit'))
+        if fields is None and self.action in self.summary_actions and params.get('view') != 'full':
+            fields = getattr(serializer_class.Meta, 'summary_fields', None)
+        if is_public_request(self.request):
+            # Shared payloads must not contain anything specific to the caller
+            omit = (omit or []) + list(getattr(serializer_class.Meta, 'personal_fields', []))
+        return fields, omit
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, SparseFieldsetMixin):
+            fields, omit = self.get_field_selection(serializer_class)
+            kwargs.setdefault('fields', fields)
+            kwargs.setdefault('omit', omit)
+        return super().get_serializer(*args, **kwargs)
+
+    def optimize_for_fields(self, queryset, serializer_class=None):
+        """Defer the columns the current field selection will not render"""
+        serializer_class = serializer_class or self.get_serializer_class()
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+        fields, omit = self.get_field_selection(serializer_class)
+        return serializer_class.optimize_queryset(queryset, fields, omit)
+
+
+class PublicListCacheMixin:
+    """
+    Serve ?public=1 list requests from the shared public list cache, with
+    Cache-Control headers allowing browsers and CDNs to reuse them.
+    """
+    public_cache_scope = None
+
+    @property
+    def public_cache_actions(self):
+        # Throttling doesn't count reads this cache answers (api.throttling)
+        return {'list': self.public_cache_scope}
+
+    def list(self, request, *args, **kwargs):
+        if not is_public_request(request):
+            return super().list(request, *args, **kwargs)
+        parent_list = super().list
+        return serve_public(request, self.public_cache_scope,
+                            lambda: parent_list(request, *args, **kwargs).data)
+
+
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def health_check(request):
@@ -55,7 +148,8 @@ def health_check(request):
             'status': 'healthy',
             'database': 'connected',
             'users': user_count,
-            'companies': company_count
+            'companies': company_count,
+            'public_list_cache': cache_stats(),
         })
     except Exception as e:
         return Response({
@@ -64,6 +158,134 @@ def health_check(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET', 'POST'])
+@permission_classes([IsSupabaseAuthenticated])
+def my_votes(request):
+    """
+    Return the current user's votes for a batch of posts and experiences.
+
+    Accepts ?posts=1,2&experiences=3 (or a JSON body with the same keys) and
+    answers with two indexed queries, so cached public lists can be
+    personalized on the client without per-object lookups.
+    """
+    source = request.data if request.method == 'POST' else request.query_params
+    if not isinstance(source, dict):
+        return Response({'error': 'Expected an object with "posts" and/or "experiences" ids'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    post_ids = parse_id_list(source.get('posts'))
+    experience_ids = parse_id_list(source.get('experiences'))
+
+    if len(post_ids) + len(experience_ids) > MAX_VOTE_LOOKUP_IDS:
+        return Response({'error': f'At most {MAX_VOTE_LOOKUP_IDS} ids per request'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    post_votes = post_votes_for(request.user, post_ids)
+    experience_votes = experience_votes_for(request.user, experience_ids)
+
+    return Response({
+        'posts': {str(post_id): post_votes.get(post_id) for post_id in post_ids},
+        'experiences': {str(exp_id): experience_votes.get(exp_id) for exp_id in experience_ids},
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsSupabaseAuthenticated])
+def home_feed(request):
+    """
+    The current user's home feed: posts for their branch and common subjects
+    plus, for senior years, interview experiences, newest first.
+
+    Paginated with ?cursor= (the next_cursor of the previous page) and
+    ?limit=. Each page is one range scan per feed over precomputed feed entries.
+    """
+    try:
+        limit = max(min(int(request.query_params.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE), 1)
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    cursor = None
+    if request.query_params.get('cursor'):
+        cursor = decode_cursor(request.query_params['cursor'])
+        if cursor is None:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    entries, next_cursor = feed_page(feeds_for(request.user), cursor, limit)
+    context = {'request': request}
+    posts = PostSerializer([entry.post for entry in entries if entry.post_id], many=True, context=context,
+                           fields=PostSerializer.Meta.summary_fields).data
+    experiences = InterviewExperienceSerializer(
+        [entry.experience for entry in entries if entry.experience_id], many=True, context=context,
+        fields=InterviewExperienceSerializer.Meta.summary_fields).data
+    posts = {item['id']: item for item in posts}
+    experiences = {item['id']: item for item in experiences}
+
+    results = []
+    for entry in entries:
+        if entry.post_id:
+            results.append({'type': 'post', 'item': posts[entry.post_id]})
+        else:
+            results.append({'type': 'experience', 'item': experiences[entry.experience_id]})
+    return Response({'results': results, 'next_cursor': next_cursor})
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def autocomplete(request):
+    """
+    Typeahead suggestions for the company, subject and position pickers.
+
+    ?q= is matched against the start of a name or of any word in it; ?type=
+    picks kinds (comma separated, all by default), ?branch= keeps a branch's
+    and common subjects, ?limit= caps each list. Served from in-process
+    prefix indexes (see api.autocomplete), so a warm request runs no query.
+    """
+    kinds = request.query_params.get('type', ','.join(typeahead.KINDS)).split(',')
+    if not kinds or any(kind not in typeahead.KINDS for kind in kinds):
+        return Response({'error': f"type must be one of {', '.join(typeahead.KINDS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = max(min(int(request.query_params.get('limit', typeahead.DEFAULT_LIMIT)), typeahead.MAX_LIMIT), 1)
+    except ValueError:
+        limit = typeahead.DEFAULT_LIMIT
+    branch = request.query_params.get('branch', '')
+    branch_id = int(branch) if branch.isdigit() else None
+
+    query = request.query_params.get('q', '')
+    response = Response({kind: typeahead.suggest(kind, query, limit, branch_id) for kind in dict.fromkeys(kinds)})
+    # Suggestions are the same for everyone
+    return patch_public_headers(response, public_cache_timeout())
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def catalog_pointer(request):
+    """
+    Version and URL of the current static catalog of branches, subjects and
+    companies (see api.catalog). The file itself is immutable, so only this
+    small pointer needs revalidating.
+    """
+    pointer = read_pointer()
+    if pointer is None:
+        return Response({'error': 'The catalog has not been published yet'}, status=status.HTTP_404_NOT_FOUND)
+    return patch_public_headers(Response(public_pointer(pointer)), public_cache_timeout())
+
+
+def run_due_tasks(request):
+    """
+    Process due background tasks (see api.tasks) for up to
+    TASK_CRON_TIME_LIMIT seconds. Called every minute by Vercel Cron
+    (vercel.json), which authenticates with Authorization: Bearer <CRON_SECRET>;
+    deployments that run `manage.py run_tasks` don't need it.
+    """
+    secret = getattr(settings, 'CRON_SECRET', '')
+    if not secret or not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {secret}'):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    # Tasks must see the latest writes, not a lagging replica
+    use_read_alias(None)
+    purged = purge_finished(timezone.now() - timedelta(days=FINISHED_TASK_RETENTION_DAYS))
+    processed = run_for(getattr(settings, 'TASK_CRON_TIME_LIMIT', 8))
+    return JsonResponse({'processed': processed, 'purged': purged})
+
+
 class BranchViewSet(viewsets.ModelViewSet):
     """ViewSet for branches"""
     queryset = Branch.objects.filter(is_active=True)
@@ -83,31 +305,21 @@ class UserProfileViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # No authentication - return all profiles (Supabase handles auth on frontend)
-        return UserProfile.objects.all()
+        return UserProfile.objects.select_related('branch')
 
     def retrieve(self, request, *args, **kwargs):
         lookup_value = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
 
         try:
-            # First try to get existing user profile by supabase_uid
-            user_profile = None
-            try:
-                user_profile = UserProfile.objects.get(supabase_uid=lookup_value)
-            except UserProfile.DoesNotExist:
-                # If it's a numeric value, try looking up by database ID
-                if lookup_value.isdigit():
-                    try:
-                        user_profile = UserProfile.objects.get(id=int(lookup_value))
-                    except UserProfile.DoesNotExist:
-                        pass
-                
-                # If still not found, return 404 instead of creating a new user
-                if user_profile is None:
-                    return Response({
-                        'error': 'User profile not found',
-                        'detail': f'No user found with identifier: {lookup_value}',
-                        'lookup_value': lookup_value,
-                    }, status=status.HTTP_404_NOT_FOUND)
+            # Supabase UID first, then database ID, in one query
+            user_profile = resolve_profile(lookup_value, queryset=self.get_queryset())
+            if user_profile is None:
+                # Return 404 instead of creating a new user
+                return Response({
+                    'error': 'User profile not found',
+                    'detail': f'No user found with identifier: {lookup_value}',
+                    'lookup_value': lookup_value,
+                }, status=status.HTTP_404_NOT_FOUND)
 
             serializer = self.get_serializer(user_profile)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -125,20 +337,86 @@ class UserProfileViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+    @action(detail=True, methods=['get'])
+    def dashboard(self, request, supabase_uid=None):
+        """
+        Everything the dashboard and profile pages need in one response:
+        profile, recent posts and experiences, vote totals, subjects and branches.
+        Built with a fixed number of queries regardless of how much the user posted.
+        """
+        try:
+            limit = max(min(int(request.query_params.get('limit', 10)), 50), 1)
+        except ValueError:
+            limit = 10
+
+        # Single lookup matching either the Supabase UID or the database ID
+        user_profile = resolve_profile(supabase_uid, queryset=self.get_queryset())
+        if user_profile is None:
+            return Response({
+                'error': 'User profile not found',
+                'detail': f'No user found with identifier: {supabase_uid}',
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        context = {'request': request}
+        # The viewer's own vote is irrelevant on the owner's dashboard lists
+        posts = PostSerializer.optimize_queryset(
+            Post.objects.filter(posted_by=user_profile).order_by('-created_at'),
+            PostSerializer.Meta.summary_fields, ['user_vote']
+        )[:limit]
+        experiences = InterviewExperienceSerializer.optimize_queryset(
+            InterviewExperience.objects.filter(posted_by=user_profile).order_by('-created_at'),
+            InterviewExperienceSerializer.Meta.summary_fields, ['user_voted']
+        )[:limit]
+
+        post_totals = Post.objects.filter(posted_by=user_profile).aggregate(
+            count=Count('id'), upvotes=Sum('upvotes'), downvotes=Sum('downvotes')
+        )
+        experience_totals = InterviewExperience.objects.filter(posted_by=user_profile).aggregate(
+            count=Count('id'), upvotes=Sum('upvotes')
+        )
+
+        subjects = (Subject.objects.select_related('branch')
+                    .annotate(annotated_posts_count=Count('posts')).order_by('name'))
+        if user_profile.branch_id:
+            subjects = subjects.filter(Q(branch_id=user_profile.branch_id) | Q(is_common=True))
+
+        return Response({
+            'profile': UserProfileSerializer(user_profile, context=context).data,
+            'posts': PostSerializer(posts, many=True, context=context,
+                                    fields=PostSerializer.Meta.summary_fields,
+                                    omit=['user_vote']).data,
+            'experiences': InterviewExperienceSerializer(experiences, many=True, context=context,
+                                                         fields=InterviewExperienceSerializer.Meta.summary_fields,
+                                                         omit=['user_voted']).data,
+            'stats': {
+                'posts_count': post_totals['count'],
+                'post_upvotes': post_totals['upvotes'] or 0,
+                'post_downvotes': post_totals['downvotes'] or 0,
+                'experiences_count': experience_totals['count'],
+                'experience_upvotes': experience_totals['upvotes'] or 0,
+                'points': user_profile.points,
+            },
+            'subjects': SubjectSerializer(subjects, many=True, context=context).data,
+            'branches': list(Branch.objects.filter(is_active=True).order_by('name').values_list('name', flat=True)),
+        })
+
     @action(detail=False, methods=['get'])
     def me(self, request):
         """Get current user's profile"""
         return Response({'error': 'Authentication handled by Supabase on frontend'}, status=status.HTTP_501_NOT_IMPLEMENTED)
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SubjectViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for subjects"""
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
     permission_classes = [permissions.AllowAny]  # Temporarily allow any for testing
+    summary_actions = ['posts']
+    public_cache_actions = {'posts': 'posts'}
 
     def get_queryset(self):
-        queryset = Subject.objects.all()
+        # Annotate the posts count so listing subjects doesn't count per row
+        queryset = Subject.objects.select_related('branch').annotate(annotated_posts_count=Count('posts'))
         branch = self.request.query_params.get('branch', None)
         is_common = self.request.query_params.get('is_common', None)
         name = self.request.query_params.get('name', None)
@@ -151,48 +429,60 @@ class SubjectViewSet(viewsets.ModelViewSet):
         if name == 'None' or name == '':
             name = None
         
-        # Debug logging
-        print(f"DEBUG - Query params: name='{name}', branch='{branch}', is_common='{is_common}'")
-        
+        if branch is not None:
+            # Resolve the name once so subjects are filtered on their branch_id column
+            branch_id = Branch.objects.filter(name__iexact=branch.strip()).values_list('id', flat=True).first()
+            # branch_id=None would match subjects without a branch; an unknown branch matches none
+            in_branch = Q(branch_id=branch_id) if branch_id is not None else Q(pk__in=[])
+
         if name is not None:
             # If both name and branch are provided, filter by both
             if branch is not None:
-                queryset = queryset.filter(name__iexact=name, branch=branch)
+                queryset = queryset.filter(in_branch, name__iexact=name)
             else:
                 # If only name provided, find by name (any branch or common)
                 queryset = queryset.filter(name__iexact=name)
         elif branch is not None:
             # If only branch provided, get subjects for that branch or common ones
-            queryset = queryset.filter(Q(branch=branch) | Q(is_common=True))
+            queryset = queryset.filter(in_branch | Q(is_common=True))
         elif is_common is not None:
             # If only is_common provided
             queryset = queryset.filter(is_common=is_common.lower() == 'true')
             
-        result = queryset.order_by('name')
-        print(f"DEBUG - Found {result.count()} subjects")
-        return result
+        return queryset.order_by('name')
 
     @action(detail=True, methods=['get'])
     def posts(self, request, pk=None):
         """Get all posts for a subject"""
+        if is_public_request(request):
+            return serve_public(request, self.public_cache_actions['posts'], lambda: self._subject_posts(request).data)
+        return self._subject_posts(request)
+
+    def _subject_posts(self, request):
         subject = self.get_object()
-        posts = Post.objects.filter(subject=subject).order_by('-created_at')
+        posts = order_queryset(Post.objects.filter(subject=subject, duplicate_of__isnull=True),
+                               parse_ordering(request))
+        posts = self.optimize_for_fields(posts, PostSerializer)
+        fields, omit = self.get_field_selection(PostSerializer)
         
         # Pagination
         page = self.paginate_queryset(posts)
         if page is not None:
-            serializer = PostSerializer(page, many=True, context={'request': request})
+            serializer = PostSerializer(page, many=True, context={'request': request},
+                                        fields=fields, omit=omit)
             return self.get_paginated_response(serializer.data)
         
-        serializer = PostSerializer(posts, many=True, context={'request': request})
+        serializer = PostSerializer(posts, many=True, context={'request': request},
+                                    fields=fields, omit=omit)
         return Response(serializer.data)
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(PublicListCacheMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for posts"""
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [permissions.AllowAny]  # Allow any for reading, but check auth in voting
+    public_cache_scope = 'posts'
 
     def get_permissions(self):
         """
@@ -213,29 +503,24 @@ class PostViewSet(viewsets.ModelViewSet):
         if subject_id is not None:
             queryset = queryset.filter(subject_id=subject_id)
         if user_id is not None:
-            # Check if user_id is a Supabase UID (string) or database ID (integer)
-            try:
-                # Try to convert to integer (database ID)
-                user_db_id = int(user_id)
-                queryset = queryset.filter(posted_by_id=user_db_id)
-            except ValueError:
-                # It's a Supabase UID, find the corresponding UserProfile
-                try:
-                    user_profile = UserProfile.objects.get(supabase_uid=user_id)
-                    queryset = queryset.filter(posted_by_id=user_profile.id)
-                except UserProfile.DoesNotExist:
-                    # User doesn't exist, return empty queryset
-                    queryset = queryset.none()
+            # Database ID or Supabase UID, filtered through the join rather than a separate lookup
+            queryset = queryset.filter(posted_by_filter(user_id))
         if search is not None:
             queryset = queryset.filter(
                 Q(topic__icontains=search) | 
                 Q(content__icontains=search) |
                 Q(focus_points__icontains=search)
             )
+        if self.action == 'list':
+            # Flagged duplicates stay reachable by id but don't repeat in lists
+            queryset = queryset.filter(duplicate_of__isnull=True)
             
-        return queryset.order_by('-created_at')
+        return self.optimize_for_fields(order_queryset(queryset, parse_ordering(self.request)))
 
     def perform_create(self, serializer):
+        data = serializer.validated_data
+        check_duplicate(KIND_POST, post_fingerprint(data.get('topic', ''), data.get('focus_points', ''),
+                                                    data.get('notes_link'), data.get('video_link')))
         # Since authentication is disabled, we expect posted_by to be passed in the request data
         # The frontend should send the UserProfile ID
         posted_by_id = self.request.data.get('posted_by')
@@ -265,6 +550,21 @@ class PostViewSet(viewsets.ModelViewSet):
         post.delete()
         return Response({'message': 'Post deleted successfully'}, status=status.HTTP_200_OK)
 
+    def retrieve(self, request, *args, **kwargs):
+        post = self.get_object()
+        # Buffered in the cache and flushed in batches, so reads don't become row writes
+        record_view(post, request)
+        return Response(self.get_serializer(post).data)
+
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        """Similar posts across subjects, precomputed by api.related"""
+        links = related_posts(pk) if str(pk).isdigit() else []
+        if not links:
+            # Not indexed yet, or no such post (get_object turns that into a 404)
+            self.get_object()
+        return Response(RelatedPostSerializer(links, many=True).data)
+
     @action(detail=True, methods=['post'])
     def vote(self, request, pk=None):
         """Vote on a post (upvote/downvote)"""
@@ -289,26 +589,25 @@ class PostViewSet(viewsets.ModelViewSet):
                 
                 # Update post vote counts (no points system)
                 if old_vote == 1:
-                    post.upvotes -= 1
+                    upvotes, downvotes = apply_post_vote_delta(post, -1, 0)
                 else:
-                    post.downvotes -= 1
-                    
-                post.save()
+                    upvotes, downvotes = apply_post_vote_delta(post, 0, -1)
                 
                 return Response({
                     'message': 'Vote removed successfully',
-                    'upvotes': post.upvotes,
-                    'downvotes': post.downvotes,
+                    'upvotes': upvotes,
+                    'downvotes': downvotes,
                     'user_vote': None,
-                    'net_votes': post.upvotes - post.downvotes
+                    'net_votes': upvotes - downvotes
                 })
             except PostVote.DoesNotExist:
+                upvotes, downvotes = visible_post_counts(post)
                 return Response({
                     'message': 'No vote to remove',
-                    'upvotes': post.upvotes,
-                    'downvotes': post.downvotes,
+                    'upvotes': upvotes,
+                    'downvotes': downvotes,
                     'user_vote': None,
-                    'net_votes': post.upvotes - post.downvotes
+                    'net_votes': upvotes - downvotes
                 })
         
         # Handle upvote/downvote
@@ -318,41 +617,45 @@ class PostViewSet(viewsets.ModelViewSet):
             defaults={'vote': vote_value}
         )
         
+        up_delta = down_delta = 0
         if not created:
             # Update existing vote
             old_vote = vote.vote
-            vote.vote = vote_value
-            vote.save()
+            if old_vote != vote_value:
+                vote.vote = vote_value
+                vote.save(update_fields=['vote'])
             
-            # Update post vote counts (no points system)
             if old_vote == 1:
-                post.upvotes -= 1
+                up_delta -= 1
             else:
-                post.downvotes -= 1
+                down_delta -= 1
         
-        # Update post vote counts for new vote (no points system)
+        # Count the new vote (no points system)
         if vote_value == 1:
-            post.upvotes += 1
+            up_delta += 1
         else:
-            post.downvotes += 1
-            
-        post.save()
+            down_delta += 1
+        
+        # Counters are updated in place, or buffered when VOTE_WRITE_BEHIND is on
+        upvotes, downvotes = apply_post_vote_delta(post, up_delta, down_delta)
         
         # Return updated post data
         return Response({
             'message': 'Vote recorded successfully',
-            'upvotes': post.upvotes,
-            'downvotes': post.downvotes,
+            'upvotes': upvotes,
+            'downvotes': downvotes,
             'user_vote': vote_value,
-            'net_votes': post.upvotes - post.downvotes
+            'net_votes': upvotes - downvotes
         })
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for companies"""
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [permissions.AllowAny]  # Default for read operations
+    summary_actions = ['experiences']
+    public_cache_actions = {'experiences': 'experiences'}
 
     def get_permissions(self):
         """
@@ -413,24 +716,69 @@ class CompanyViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def experiences(self, request, pk=None):
         """Get all interview experiences for a company"""
+        if is_public_request(request):
+            return serve_public(request, self.public_cache_actions['experiences'],
+                                lambda: self._company_experiences(request).data)
+        return self._company_experiences(request)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Precomputed interview statistics for a company"""
+        stats = None
+        if str(pk).isdigit():
+            stats = CompanyStats.objects.select_related('company').filter(company_id=pk).first()
+        if stats is None:
+            # No experiences yet (or no such company, which get_object turns into a 404)
+            stats = empty_stats(self.get_object())
+        return Response(CompanyStatsSerializer(stats).data)
+
+    @action(detail=False, methods=['get'], url_path='stats', url_name='all-stats')
+    def all_stats(self, request):
+        """Statistics for every company with experiences, for company cards"""
+        stats = CompanyStats.objects.select_related('company').order_by('company__name')
+        return Response(CompanyStatsSerializer(stats, many=True).data)
+
+    @action(detail=True, methods=['get'])
+    def questions(self, request, pk=None):
+        """Most frequently asked questions at a company, from the question bank"""
+        try:
+            limit = max(min(int(request.query_params.get('limit', 20)), 100), 1)
+        except ValueError:
+            limit = 20
+        entries = top_questions(pk, limit) if str(pk).isdigit() else []
+        if not entries:
+            # Nothing asked yet, or no such company (get_object turns that into a 404)
+            self.get_object()
+        return Response(CompanyQuestionSerializer(entries, many=True).data)
+
+    def _company_experiences(self, request):
         company = self.get_object()
-        experiences = InterviewExperience.objects.filter(company=company).order_by('-created_at')
+        experiences = InterviewExperience.objects.filter(company=company, duplicate_of__isnull=True)
+        round_type = request.query_params.get('round_type')
+        if round_type:
+            experiences = experiences.filter(rounds__has_round_type=round_type)
+        experiences = order_queryset(experiences, parse_ordering(request))
+        experiences = self.optimize_for_fields(experiences, InterviewExperienceSerializer)
+        fields, omit = self.get_field_selection(InterviewExperienceSerializer)
         
         # Pagination
         page = self.paginate_queryset(experiences)
         if page is not None:
-            serializer = InterviewExperienceSerializer(page, many=True, context={'request': request})
+            serializer = InterviewExperienceSerializer(page, many=True, context={'request': request},
+                                                       fields=fields, omit=omit)
             return self.get_paginated_response(serializer.data)
         
-        serializer = InterviewExperienceSerializer(experiences, many=True, context={'request': request})
+        serializer = InterviewExperienceSerializer(experiences, many=True, context={'request': request},
+                                                   fields=fields, omit=omit)
         return Response(serializer.data)
 
 
-class InterviewExperienceViewSet(viewsets.ModelViewSet):
+class InterviewExperienceViewSet(PublicListCacheMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for interview experiences"""
     queryset = InterviewExperience.objects.all()
     serializer_class = InterviewExperienceSerializer
     permission_classes = [permissions.AllowAny]  # Allow any for reading, but check auth in voting
+    public_cache_scope = 'experiences'
 
     def get_permissions(self):
         """
@@ -454,10 +802,19 @@ class InterviewExperienceViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(position__icontains=position)
         if result is not None:
             queryset = queryset.filter(result=result)
+        round_type = self.request.query_params.get('round_type', None)
+        if round_type:
+            # Evaluated in the database (GIN index on PostgreSQL, JSON1 on SQLite)
+            queryset = queryset.filter(rounds__has_round_type=round_type)
+        if self.action == 'list':
+            queryset = queryset.filter(duplicate_of__isnull=True)
             
-        return queryset.order_by('-created_at')
+        return self.optimize_for_fields(order_queryset(queryset, parse_ordering(self.request)))
 
     def perform_create(self, serializer):
+        data = serializer.validated_data
+        check_duplicate(KIND_EXPERIENCE, experience_fingerprint(data['company'].id, data.get('position', ''),
+                                                                data.get('questions', ''), data.get('tips', '')))
         # Set the posted_by to current user
         user_profile = None
         if hasattr(self.request, 'user') and hasattr(self.request.user, 'supabase_uid'):
@@ -471,6 +828,11 @@ class InterviewExperienceViewSet(viewsets.ModelViewSet):
         
         # No points awarded for sharing experience (simplified system)
 
+    def retrieve(self, request, *args, **kwargs):
+        experience = self.get_object()
+        record_view(experience, request)
+        return Response(self.get_serializer(experience).data)
+
     @action(detail=True, methods=['post'])
     def vote(self, request, pk=None):
         """Vote on an interview experience"""
@@ -500,12 +862,11 @@ class InterviewExperienceViewSet(viewsets.ModelViewSet):
         # Update experience vote count
         if is_upvote:
             experience.upvotes += 1
-        experience.save()
+        experience.save(update_fields=['upvotes', 'hot_score', 'updated_at'])
         
-        # Award points for the experience author
+        # Award points for the experience author, off the request path (batched per author)
         if is_upvote:
-            experience.posted_by.points += 2
-        experience.posted_by.save()
+            award_points(experience.posted_by_id, POINTS_PER_EXPERIENCE_UPVOTE)
         
         return Response({'message': 'Vote recorded successfully'})
 
@@ -0,0 +1,138 @@
+"""
+Helpers for reading the current user's votes in bulk and for applying vote
+counter changes to posts.
+
+With VOTE_WRITE_BEHIND enabled, PostVote rows are still written immediately
+but the Post.upvotes/downvotes counters are accumulated in the cache and
+flushed by the `flush_post_votes` task with a single UPDATE per post, so a
+viral post isn't locked and rewritten on every vote. Pending deltas are
+overlaid on reads so voters always see their own vote counted. The deltas
+live in the counters cache (api.counters), which hub.settings requires to
+be shared whenever write-behind is on.
+"""
+
+from django.conf import settings
+from django.db.models import F
+
+from . import counters
+from .models import Post, PostVote, ExperienceVote
+from .ranking import hot_score, refresh_hot_scores
+from .tasks import task, enqueue
+
+
+VOTE_BUFFER_PREFIX = 'votebuf:post'
+
+
+def parse_id_list(value):
+    """Parse ids from a comma separated string or a list, skipping anything non-numeric"""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, tuple)):
+        # Missing, or a JSON value that isn't a list of ids
+        return []
+    ids = []
+    for item in value:
+        try:
+            ids.append(int(str(item).strip()))
+        except ValueError:
+            continue
+    return ids
+
+
+def post_votes_for(user_profile, post_ids):
+    """Return {post_id: vote} for the given user, one indexed query"""
+    if not post_ids:
+        return {}
+    return dict(
+        PostVote.objects.filter(user=user_profile, post_id__in=post_ids)
+        .values_list('post_id', 'vote')
+    )
+
+
+def experience_votes_for(user_profile, experience_ids):
+    """Return {experience_id: is_upvote} for the given user, one indexed query"""
+    if not experience_ids:
+        return {}
+    return dict(
+        ExperienceVote.objects.filter(user=user_profile, experience_id__in=experience_ids)
+        .values_list('experience_id', 'is_upvote')
+    )
+
+
+def write_behind_enabled():
+    return getattr(settings, 'VOTE_WRITE_BEHIND', False)
+
+
+def _buffer_keys(post_id):
+    return f'{VOTE_BUFFER_PREFIX}:{post_id}:up', f'{VOTE_BUFFER_PREFIX}:{post_id}:down'
+
+
+def discard_buffered_votes(post_id):
+    """Drop a post's buffered, not yet flushed counter changes"""
+    counters.counter_cache().delete_many(_buffer_keys(post_id))
+
+
+def pending_post_deltas(post_ids):
+    """Return {post_id: (up, down)} of buffered, not yet flushed counter changes"""
+    if not post_ids or not write_behind_enabled():
+        return {}
+    keys = {post_id: _buffer_keys(post_id) for post_id in post_ids}
+    values = counters.counter_cache().get_many([key for pair in keys.values() for key in pair])
+    deltas = {}
+    for post_id, (up_key, down_key) in keys.items():
+        up, down = values.get(up_key, 0), values.get(down_key, 0)
+        if up or down:
+            deltas[post_id] = (up, down)
+    return deltas
+
+
+def visible_post_counts(post):
+    """Counters as the user should see them, including buffered votes"""
+    up, down = pending_post_deltas([post.id]).get(post.id, (0, 0))
+    return post.upvotes + up, post.downvotes + down
+
+
+def apply_post_vote_delta(post, up_delta, down_delta):
+    """
+    Apply a vote's effect on a post's counters and return the
+    (upvotes, downvotes) the voter should see.
+    """
+    if write_behind_enabled():
+        up_key, down_key = _buffer_keys(post.id)
+        if up_delta:
+            counters.add(up_key, up_delta)
+        if down_delta:
+            counters.add(down_key, down_delta)
+        enqueue('flush_post_votes', {'post_id': post.id}, dedupe_key=f'votes:post:{post.id}',
+                delay=getattr(settings, 'VOTE_FLUSH_INTERVAL', 5))
+        return visible_post_counts(post)
+
+    upvotes, downvotes = post.upvotes + up_delta, post.downvotes + down_delta
+    if up_delta or down_delta:
+        # The score is computed from the counts read with the post; concurrent
+        # votes can leave it slightly off until the next refresh_hot_scores run
+        Post.objects.filter(pk=post.pk).update(upvotes=F('upvotes') + up_delta,
+                                               downvotes=F('downvotes') + down_delta,
+                                               hot_score=hot_score(upvotes - downvotes, post.created_at))
+    return upvotes, downvotes
+
+
+@task('flush_post_votes', batch=True)
+def flush_post_votes(payloads):
+    """Move buffered counter deltas into the posts table, one UPDATE per post"""
+    flushed = []
+    for post_id in {p['post_id'] for p in payloads}:
+        up_key, down_key = _buffer_keys(post_id)
+        values = counters.counter_cache().get_many([up_key, down_key])
+        up, down = values.get(up_key, 0), values.get(down_key, 0)
+        if not (up or down):
+            continue
+        Post.objects.filter(pk=post_id).update(upvotes=F('upvotes') + up, downvotes=F('downvotes') + down)
+        flushed.append(post_id)
+        # Subtract only what was flushed so votes buffered meanwhile are kept
+        if up:
+            counters.subtract(up_key, up)
+        if down:
+            counters.subtract(down_key, down)
+    if flushed:
+        refresh_hot_scores(Post, flushed)
@@ -0,0 +1,19 @@
+"""
+ASGI config for hub project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with any ASGI server, e.g. ``uvicorn hub.asgi:application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hub.settings')
+
+application = get_asgi_application()
+
+app = application
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Load environment variables from .env file
 load_dotenv()
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",  # serves STATIC_ROOT
+    "api.middleware.CompressionMiddleware",  # before anything else that touches the body
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # must be high
     "django.middleware.common.CommonMiddleware",
@@ -52,6 +55,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "hub.urls"
@@ -73,6 +77,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "hub.wsgi.application"
+ASGI_APPLICATION = "hub.asgi.application"
 
 # Database configuration
 import dj_database_url
@@ -96,6 +101,109 @@ else:
         }
     }
 
+# Read replicas: DATABASE_REPLICA_URLS is a comma separated list of database URLs,
+# added as aliases replica1..N. Safe API reads are spread over them (api.routers);
+# clients are pinned to the primary for REPLICA_PIN_SECONDS after a write so they
+# don't read their own changes back stale. Pins live in the default cache, which every
+# process must share, so replicas are refused without REDIS_URL. Locally two SQLite
+# files work, e.g. DATABASE_REPLICA_URLS=sqlite:////tmp/replica.sqlite3 with
+# `manage.py sync_sqlite_replicas` and a local Redis.
+DATABASE_REPLICAS = []
+for index, url in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), 1):
+    DATABASES[f"replica{index}"] = {**dj_database_url.parse(url.strip()), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica{index}")
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+
+# Cache (local memory by default, Redis when REDIS_URL is set)
+REDIS_URL = os.environ.get("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "placement-hub",
+        }
+    }
+if DATABASE_REPLICAS and not REDIS_URL:
+    # A pin set by the process that served a write would be invisible to the others
+    raise ImproperlyConfigured("DATABASE_REPLICA_URLS needs a shared cache for replica pins: set REDIS_URL")
+
+# Buffered counters (vote deltas and view counts, api.counters) get their own cache so
+# cached pages and throttle buckets can't push them out. A buffered count exists nowhere
+# else until it is flushed, so this cache must be shared by every process and must not
+# evict keys stored without an expiry: a Redis with maxmemory-policy noeviction or
+# volatile-*. COUNTER_CACHE_URL defaults to REDIS_URL; without either, counters are per
+# process, which only suits a single-process development server.
+COUNTER_CACHE_URL = os.environ.get("COUNTER_CACHE_URL", REDIS_URL)
+if COUNTER_CACHE_URL:
+    CACHES["counters"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": COUNTER_CACHE_URL,
+        "KEY_PREFIX": "counters",
+    }
+else:
+    CACHES["counters"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "placement-hub-counters",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    }
+SHARED_COUNTERS = bool(COUNTER_CACHE_URL)
+
+# Seconds a public (?public=1) post/experience list page may be served from cache
+PUBLIC_LIST_CACHE_TIMEOUT = int(os.environ.get("PUBLIC_LIST_CACHE_TIMEOUT", "60"))
+# ...and how much longer an expired page may be served while one request rebuilds it
+PUBLIC_LIST_STALE_TIMEOUT = int(os.environ.get("PUBLIC_LIST_STALE_TIMEOUT", "300"))
+
+# Background task queue (api.tasks). Tasks are processed by `manage.py run_tasks`
+# where a worker can run. On Vercel the cron job in vercel.json requests
+# /api/tasks/run/ every minute instead; it is refused unless CRON_SECRET is set
+# (Vercel sends it as a bearer token) and works for up to TASK_CRON_TIME_LIMIT
+# seconds, below the function timeout. Tasks still running after TASK_LEASE_SECONDS
+# lost their worker and are queued again. TASK_QUEUE_EAGER=True runs tasks inline,
+# for local development only.
+TASK_QUEUE_EAGER = os.environ.get("TASK_QUEUE_EAGER", "False") == "True"
+TASK_LEASE_SECONDS = int(os.environ.get("TASK_LEASE_SECONDS", "600"))
+TASK_CRON_TIME_LIMIT = int(os.environ.get("TASK_CRON_TIME_LIMIT", "8"))
+CRON_SECRET = os.environ.get("CRON_SECRET", "")
+
+# Per-process Supabase UID -> profile id cache (api.identity)
+PROFILE_ID_CACHE_TTL = int(os.environ.get("PROFILE_ID_CACHE_TTL", "300"))  # seconds
+PROFILE_ID_CACHE_SIZE = 10000
+
+# Vote write-behind (api.votes): buffer post vote counters in the counters cache and
+# flush them every VOTE_FLUSH_INTERVAL seconds through the task queue. Refused without
+# a shared counters cache, where buffered votes would be lost.
+VOTE_WRITE_BEHIND = os.environ.get("VOTE_WRITE_BEHIND", "False") == "True"
+if VOTE_WRITE_BEHIND and not SHARED_COUNTERS:
+    raise ImproperlyConfigured("VOTE_WRITE_BEHIND needs a shared counters cache: set REDIS_URL or COUNTER_CACHE_URL")
+VOTE_FLUSH_INTERVAL = int(os.environ.get("VOTE_FLUSH_INTERVAL", "5"))
+
+# View counters (api.viewcounts): views of a post or experience are buffered in the
+# counters cache and flushed every VIEW_FLUSH_INTERVAL seconds; repeat views by the
+# same viewer within VIEW_DEDUPE_WINDOW seconds count once. On by default only with a
+# shared counters cache and a real task queue: with TASK_QUEUE_EAGER every flush would
+# run inside the read that queued it. Refused without a shared counters cache.
+VIEW_COUNTING = os.environ.get(
+    "VIEW_COUNTING", "True" if SHARED_COUNTERS and not TASK_QUEUE_EAGER else "False"
+) == "True"
+if VIEW_COUNTING and not SHARED_COUNTERS:
+    raise ImproperlyConfigured("VIEW_COUNTING needs a shared counters cache: set REDIS_URL or COUNTER_CACHE_URL")
+VIEW_FLUSH_INTERVAL = int(os.environ.get("VIEW_FLUSH_INTERVAL", "30"))
+VIEW_DEDUPE_WINDOW = int(os.environ.get("VIEW_DEDUPE_WINDOW", "1800"))
+
+# Typeahead (api.autocomplete): per-process prefix indexes are rebuilt when names
+# change and at least every AUTOCOMPLETE_MAX_AGE seconds; kinds with more names
+# than AUTOCOMPLETE_MAX_ENTRIES are searched in the database instead.
+AUTOCOMPLETE_MAX_AGE = int(os.environ.get("AUTOCOMPLETE_MAX_AGE", "300"))
+AUTOCOMPLETE_MAX_ENTRIES = int(os.environ.get("AUTOCOMPLETE_MAX_ENTRIES", "20000"))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -114,6 +222,14 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 STATIC_ROOT = BASE_DIR / "staticfiles"
+# Content-hashed names (collectstatic's and the catalog's) never change, so they are cached forever
+WHITENOISE_IMMUTABLE_FILE_TEST = r"\.[0-9a-f]{12}\.\w+$"
+
+# Static catalog snapshot (api.catalog), stored in STORAGES["catalog"]: republished
+# CATALOG_PUBLISH_DELAY seconds after a branch, subject or company changes; older
+# versions kept for clients still holding their pointer.
+CATALOG_PUBLISH_DELAY = int(os.environ.get("CATALOG_PUBLISH_DELAY", "10"))
+CATALOG_KEEP_VERSIONS = int(os.environ.get("CATALOG_KEEP_VERSIONS", "5"))
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -128,8 +244,34 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    # Sliding windows per verified user (or per IP otherwise), see api.throttling
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.throttling.ScopedSlidingWindowThrottle",
+    ],
+    # Proxies in front of the app whose X-Forwarded-For entries can be trusted. Vercel
+    # replaces the header with the client address, so one there; none when clients
+    # connect directly (the header is then ignored, as anyone can set it).
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", "1" if os.environ.get("VERCEL") else "0")),
+    "DEFAULT_THROTTLE_RATES": {
+        "read": os.environ.get("THROTTLE_READ_RATE", "600/min"),
+        "write": os.environ.get("THROTTLE_WRITE_RATE", "60/min"),
+        "vote": os.environ.get("THROTTLE_VOTE_RATE", "120/min"),
+        # Anonymous budgets are per IP address and lower than per-user ones; reads still
+        # get half the per-user budget as many students share the campus NAT address, and
+        # public reads served from the public list cache aren't counted at all
+        "anon_read": os.environ.get("THROTTLE_ANON_READ_RATE", "300/min"),
+        "anon_write": os.environ.get("THROTTLE_ANON_WRITE_RATE", "20/min"),
+    },
 }
 
+# Response compression (api.middleware.CompressionMiddleware)
+# Brotli is used when the optional `brotli` package is installed, gzip otherwise
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_SIZE = 256  # compressed bodies kept per process
+COMPRESSION_CACHE_MAX_BODY = 512 * 1024  # larger bodies are never cached
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -137,6 +279,32 @@ CORS_ALLOW_CREDENTIALS = True
 # Supabase keys
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY", "")
+# Project JWT secret (HS256). When set, access token signatures are verified; tokens
+# that weren't verified are not trusted as an identity for throttling (api.throttling)
+SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET", "")
+# Service role key, for writing to Supabase Storage (api.storage). Server side only.
+SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+
+# File storages. Files written at runtime that every instance serves, like the
+# catalog snapshot, go to a public Supabase Storage bucket: on Vercel the disk is
+# read-only and private to each instance. Locally they go to STATIC_ROOT, which
+# WhiteNoise serves as they appear while DEBUG is on. On Vercel without the key
+# there is no catalog storage: the catalog isn't published and /api/catalog/
+# answers 404, so clients keep using the list endpoints.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+if SUPABASE_SERVICE_ROLE_KEY:
+    STORAGES["catalog"] = {
+        "BACKEND": "api.storage.SupabaseStorage",
+        "OPTIONS": {"bucket": os.environ.get("CATALOG_BUCKET", "catalog")},
+    }
+elif not os.environ.get("VERCEL"):
+    STORAGES["catalog"] = {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": STATIC_ROOT / "catalog", "base_url": f"{STATIC_URL}catalog/"},
+    }
 
 # Logging (so we see errors on Vercel logs)
 LOGGING = {
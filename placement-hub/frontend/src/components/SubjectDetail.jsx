@@ -95,6 +95,7 @@ const SubjectDetail = () => {
         try {
           const postsResponse = await apiService.getPosts({
             subject: selectedSubject.id,
+            view: "full",
           });
           if (postsResponse.data) {
             const postsData = postsResponse.data.results || postsResponse.data;
@@ -17,7 +17,7 @@ const Companies = () => {
   // Fetch interview experiences and update state
   const fetchInterviewExperiences = async () => {
     try {
-      const experiencesResponse = await apiService.getInterviewExperiences();
+      const experiencesResponse = await apiService.getInterviewExperiences({ view: "full" });
       if (experiencesResponse.data) {
         const experiencesData =
           experiencesResponse.data.results || experiencesResponse.data;
@@ -64,7 +64,7 @@ const Companies = () => {
         const companiesResponse = await apiService.getCompanies();
         setCompanies(companiesResponse.data || []);
 
-        const experiencesResponse = await apiService.getInterviewExperiences();
+        const experiencesResponse = await apiService.getInterviewExperiences({ view: "full" });
         if (experiencesResponse.data) {
           // Handle both paginated and non-paginated responses
           const experiencesData =
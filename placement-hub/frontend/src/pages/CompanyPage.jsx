@@ -47,7 +47,7 @@ const CompanyPage = () => {
       }
 
       // Fetch company experiences
-      const experiencesResponse = await apiService.getCompanyExperiences(id);
+      const experiencesResponse = await apiService.getCompanyExperiences(id, { view: "full" });
       if (experiencesResponse.data) {
         // Handle both paginated and non-paginated responses
         const experiencesData =
@@ -95,7 +95,7 @@ const CompanyPage = () => {
     try {
       await apiService.voteOnExperience(experienceId, isUpvote);
       // Refresh experiences to show updated vote counts
-      const experiencesResponse = await apiService.getCompanyExperiences(id);
+      const experiencesResponse = await apiService.getCompanyExperiences(id, { view: "full" });
       if (experiencesResponse.data) {
         // Handle both paginated and non-paginated responses
         const experiencesData =
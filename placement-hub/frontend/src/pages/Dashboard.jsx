@@ -279,7 +279,7 @@ const Dashboard = () => {
     setErrors((prev) => ({ ...prev, posts: null }));
 
     const response = await safeApiCall(() =>
-      apiService.getPosts({ page_size: 4 })
+      apiService.getPosts({ page_size: 4, view: "full" })
     );
 
     console.log("Posts response:", response);
@@ -93,6 +93,7 @@ const Profile = () => {
     try {
       const response = await apiService.getInterviewExperiences({
         posted_by: userProfile.id,
+        view: "full",
       });
       if (response.data) {
         const experiences = response.data.results || response.data;
@@ -144,6 +145,7 @@ const Profile = () => {
     try {
       const response = await apiService.getPosts({
         user: userProfile.supabase_uid,
+        view: "full",
       });
       console.log("Posts API response:", response);
       if (response.data) {
@@ -50,7 +50,7 @@ const UserProfile = () => {
         setTargetUserProfile(userResponse.data);
 
         // Fetch user posts
-        const postsResponse = await apiService.getPosts({ user: userId });
+        const postsResponse = await apiService.getPosts({ user: userId, view: "full" });
         if (postsResponse.error) {
           console.error("Error fetching user posts:", postsResponse.error);
           setUserPosts([]);
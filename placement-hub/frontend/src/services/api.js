@@ -24,31 +24,36 @@ apiClient.interceptors.request.use(
       console.log("API: Making request to:", config.url);
 
       // Only add auth for specific authenticated endpoints/actions
-      const authRequiredEndpoints = ["/users/me"];
+      const authRequiredEndpoints = ["/users/me", "/feed/"];
 
       // Check if this is a writing operation (POST, PUT, PATCH, DELETE)
       const isWriteOperation = ["post", "put", "patch", "delete"].includes(
         config.method?.toLowerCase()
       );
 
-      // Check if this is a voting endpoint
-      const isVoteEndpoint = config.url?.includes("/vote/");
+      // Check if this is a voting endpoint (casting votes or reading your own)
+      const isVoteEndpoint =
+        config.url?.includes("/vote/") || config.url?.includes("/votes/mine/");
 
       // Check if this is a posts endpoint (to get user vote information)
       const isPostsEndpoint = config.url?.includes("/posts/");
 
+      // Public lists are shared by everyone and must be requested anonymously;
+      // user votes are overlaid afterwards from /votes/mine/
+      const isPublicList = Boolean(config.params?.public);
+
       // Auth is required for:
       // 1. Specific authenticated endpoints (like /users/me)
       // 2. Any voting endpoints
       // 3. Write operations (creating/updating posts, experiences, etc.)
-      // 4. Posts endpoints (to get user vote information)
+      // 4. Posts endpoints that aren't public lists (to get user vote information)
       const requiresAuth =
         authRequiredEndpoints.some((endpoint) =>
           config.url?.includes(endpoint)
         ) ||
         isVoteEndpoint ||
         isWriteOperation ||
-        isPostsEndpoint;
+        (isPostsEndpoint && !isPublicList);
 
       if (requiresAuth) {
         // Get the current session from Supabase
@@ -93,11 +98,12 @@ apiClient.interceptors.response.use(
       const method = error.config?.method?.toLowerCase() || "";
 
       // Check if this endpoint actually requires authentication
-      const authRequiredEndpoints = ["/users/me"];
+      const authRequiredEndpoints = ["/users/me", "/feed/"];
       const isWriteOperation = ["post", "put", "patch", "delete"].includes(
         method
       );
-      const isVoteEndpoint = url.includes("/vote/");
+      const isVoteEndpoint =
+        url.includes("/vote/") || url.includes("/votes/mine/");
       const isPostsEndpoint = url.includes("/posts/");
 
       const shouldRequireAuth =
@@ -151,6 +157,50 @@ const cleanParams = (params) => {
   return cleaned;
 };
 
+// Lists are requested in public mode: the server shares (and caches) one copy
+// for everyone, and the user's own votes are overlaid with overlayMyVotes
+const PUBLIC_LIST = { public: 1 };
+
+// Largest id batch /votes/mine/ accepts
+const MAX_VOTE_LOOKUP_IDS = 500;
+
+// Vote field each kind of item carries
+const VOTE_FIELDS = { posts: "user_vote", experiences: "user_voted" };
+
+// Fill in the signed-in user's votes on a public list ("posts" or "experiences")
+const overlayMyVotes = async (data, kind) => {
+  const items = Array.isArray(data) ? data : data?.results;
+  if (!items?.length) {
+    return data;
+  }
+  const field = VOTE_FIELDS[kind];
+  items.forEach((item) => {
+    item[field] = null;
+  });
+
+  const { session } = await authService.getCurrentSession();
+  if (!session?.access_token) {
+    return data;
+  }
+
+  const byId = new Map(items.map((item) => [String(item.id), item]));
+  const ids = [...byId.keys()];
+  try {
+    for (let start = 0; start < ids.length; start += MAX_VOTE_LOOKUP_IDS) {
+      const response = await apiClient.get("/votes/mine/", {
+        params: { [kind]: ids.slice(start, start + MAX_VOTE_LOOKUP_IDS).join(",") },
+      });
+      Object.entries(response.data[kind] || {}).forEach(([id, vote]) => {
+        byId.get(id)[field] = vote;
+      });
+    }
+  } catch (error) {
+    // The list is still usable without the user's votes
+    console.warn("Failed to load your votes:", error);
+  }
+  return data;
+};
+
 // API service functions
 const apiService = {
   // Branch APIs
@@ -215,6 +265,42 @@ const apiService = {
     }
   },
 
+  // Home feed API (pass the previous page's next_cursor to continue)
+  async getFeed(params = {}) {
+    try {
+      const response = await apiClient.get("/feed/", {
+        params: cleanParams(params),
+      });
+      return { data: response.data, error: null };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
+  // Typeahead for the company/subject/position pickers ({ q, type, branch, limit })
+  async autocomplete(params = {}) {
+    try {
+      const response = await apiClient.get("/autocomplete/", {
+        params: cleanParams(params),
+      });
+      return { data: response.data, error: null };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
+  // Static catalog of branches, subjects and companies. The pointer is small;
+  // the versioned file it names is cached forever by the browser and CDN.
+  async getCatalog() {
+    try {
+      const { data: pointer } = await apiClient.get("/catalog/");
+      const response = await axios.get(new URL(pointer.url, API_BASE_URL).href);
+      return { data: { ...response.data, version: pointer.version }, error: null };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
   // Subject APIs
   async getSubjects(params = {}) {
     try {
@@ -284,10 +370,11 @@ const apiService = {
 
   async getSubjectPosts(subjectId, params = {}) {
     try {
+      // Lists default to the summary representation; pass view: "full" for bodies
       const response = await apiClient.get(`/subjects/${subjectId}/posts/`, {
-        params,
+        params: { ...params, ...PUBLIC_LIST },
       });
-      return { data: response.data, error: null };
+      return { data: await overlayMyVotes(response.data, "posts"), error: null };
     } catch (error) {
       return { data: null, error };
     }
@@ -296,12 +383,13 @@ const apiService = {
   // Post APIs
   async getPosts(params = {}) {
     try {
+      // Summary representation unless the caller asks for view: "full"
       const cleanedParams = cleanParams(params);
       console.log("Cleaned params for posts:", cleanedParams);
       const response = await apiClient.get("/posts/", {
-        params: cleanedParams,
+        params: { ...cleanedParams, ...PUBLIC_LIST },
       });
-      return { data: response.data, error: null };
+      return { data: await overlayMyVotes(response.data, "posts"), error: null };
     } catch (error) {
       return { data: null, error };
     }
@@ -343,6 +431,15 @@ const apiService = {
     }
   },
 
+  async getRelatedPosts(postId) {
+    try {
+      const response = await apiClient.get(`/posts/${postId}/related/`);
+      return { data: response.data, error: null };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
   async voteOnPost(postId, vote) {
     try {
       const response = await apiClient.post(`/posts/${postId}/vote/`, { vote });
@@ -389,7 +486,31 @@ const apiService = {
     try {
       const response = await apiClient.get(
         `/companies/${companyId}/experiences/`,
-        { params }
+        { params: { ...params, ...PUBLIC_LIST } }
+      );
+      return {
+        data: await overlayMyVotes(response.data, "experiences"),
+        error: null,
+      };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
+  async getCompanyStats(companyId) {
+    try {
+      const response = await apiClient.get(`/companies/${companyId}/stats/`);
+      return { data: response.data, error: null };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
+  async getCompanyQuestions(companyId, params = {}) {
+    try {
+      const response = await apiClient.get(
+        `/companies/${companyId}/questions/`,
+        { params: cleanParams(params) }
       );
       return { data: response.data, error: null };
     } catch (error) {
@@ -397,11 +518,25 @@ const apiService = {
     }
   },
 
+  async getAllCompanyStats() {
+    try {
+      const response = await apiClient.get("/companies/stats/");
+      return { data: response.data, error: null };
+    } catch (error) {
+      return { data: null, error };
+    }
+  },
+
   // Interview Experience APIs
   async getInterviewExperiences(params = {}) {
     try {
-      const response = await apiClient.get("/experiences/", { params });
-      return { data: response.data, error: null };
+      const response = await apiClient.get("/experiences/", {
+        params: { ...params, ...PUBLIC_LIST },
+      });
+      return {
+        data: await overlayMyVotes(response.data, "experiences"),
+        error: null,
+      };
     } catch (error) {
       return { data: null, error };
     }